@@ -0,0 +1,299 @@
+# api.py
+# Asyncio HTTP API exposing the contract analysis backend as JSON
+#
+#   python api.py --port 8080
+#
+#   curl -F "file=@Sample_files/partnership.docx" http://127.0.0.1:8080/analyze
+#   curl --data-binary @contract.pdf "http://127.0.0.1:8080/analyze?filename=contract.pdf"
+#   curl -F "file=@contract.pdf" http://127.0.0.1:8080/triage     (type + critical terms only)
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from email.parser import BytesParser
+from email.policy import HTTP
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from backend.pipeline import run_api_analysis
+from backend.triage import triage_document
+
+# -------------------------------------------------
+# CONFIG
+# -------------------------------------------------
+
+MAX_CONCURRENCY = int(os.environ.get("ANALYSIS_API_MAX_CONCURRENCY", "4"))
+MAX_BODY_BYTES = int(os.environ.get("ANALYSIS_API_MAX_BODY_MB", "25")) * 1024 * 1024
+TRIAGE_THREADS = int(os.environ.get("ANALYSIS_API_TRIAGE_THREADS", "4"))
+HEADER_TIMEOUT = 10
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+logger = logging.getLogger("contract_analysis.api")
+
+
+class HttpError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# -------------------------------------------------
+# REQUEST PARSING
+# -------------------------------------------------
+
+async def read_request(reader: asyncio.StreamReader) -> Tuple[str, str, Dict, bytes]:
+    head = await asyncio.wait_for(
+        reader.readuntil(b"\r\n\r\n"), timeout=HEADER_TIMEOUT
+    )
+    lines = head.decode("latin-1").split("\r\n")
+
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding"):
+        raise HttpError(HTTPStatus.LENGTH_REQUIRED, "Chunked uploads are not supported")
+
+    try:
+        length = int(headers.get("content-length", "0") or 0)
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length < 0:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Upload too large")
+
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+def extract_upload(target: str, headers: Dict, body: bytes) -> Tuple[str, bytes]:
+    """
+    Accepts either multipart/form-data (field "file") or a raw
+    request body with ?filename=... in the query string.
+    """
+    content_type = headers.get("content-type", "")
+
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+        )
+        for part in message.iter_parts():
+            if part.get_param("name", header="content-disposition") == "file":
+                return part.get_filename() or "", part.get_payload(decode=True) or b""
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Multipart upload needs a 'file' field")
+
+    query = parse_qs(urlsplit(target).query)
+    filename = (query.get("filename") or [""])[0]
+    return filename, body
+
+
+def validate_upload(filename: str, data: bytes) -> None:
+    if not filename.lower().endswith(SUPPORTED_EXTENSIONS):
+        raise HttpError(
+            HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+            "Unsupported file format. Please upload PDF, DOCX, or TXT."
+        )
+    if not data:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "Empty upload")
+
+
+# -------------------------------------------------
+# SERVER
+# -------------------------------------------------
+
+class AnalysisServer:
+    """
+    CPU-bound analysis runs in a process pool. At most
+    max_concurrency analyses are in flight; further uploads are
+    rejected immediately with 429 instead of queueing unbounded.
+    Triage is cheap and runs on its own threads, outside that limit,
+    with its own cap of TRIAGE_THREADS requests in flight.
+    Their pdfium reads are serialised by file_reader (not thread-safe).
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY):
+        self.max_concurrency = max(1, max_concurrency)
+        # Spawned, not forked: workers start lazily inside the event loop,
+        # and a forked one would inherit (and hold open) client sockets
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.max_concurrency, mp_context=mp.get_context("spawn")
+        )
+        self.triage_threads = max(1, TRIAGE_THREADS)
+        self.triage_executor = ThreadPoolExecutor(max_workers=self.triage_threads)
+        self.triaged = 0
+        self.triage_in_flight = 0
+        self.triage_rejected = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                method, target, headers, body = await read_request(reader)
+                status, payload, extra_headers = await self.dispatch(method, target, headers, body)
+            except HttpError as e:
+                status, payload, extra_headers = e.status, {"error": e.message}, {}
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError):
+                return
+            except Exception:
+                logger.exception("Unhandled error while serving a request")
+                status, payload, extra_headers = (
+                    HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}, {}
+                )
+
+            await self.respond(writer, status, payload, extra_headers)
+        except ConnectionError:
+            pass  # client went away before the response was sent
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, target: str, headers: Dict, body: bytes):
+        path = urlsplit(target).path
+
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, self.stats(), {}
+
+        if path == "/analyze" and method == "POST":
+            return await self.analyze(target, headers, body)
+
+        if path == "/triage" and method == "POST":
+            return await self.triage(target, headers, body)
+
+        raise HttpError(HTTPStatus.NOT_FOUND, f"No route for {method} {path}")
+
+    @staticmethod
+    def at_capacity(what: str):
+        return (
+            HTTPStatus.TOO_MANY_REQUESTS,
+            {"error": f"{what} is at capacity, retry shortly"},
+            {"Retry-After": "1"},
+        )
+
+    async def analyze(self, target: str, headers: Dict, body: bytes):
+        # Backpressure: reject before doing any parsing work
+        if self.in_flight >= self.max_concurrency:
+            self.rejected += 1
+            return self.at_capacity("Analyzer")
+
+        self.in_flight += 1
+        try:
+            filename, data = extract_upload(target, headers, body)
+            validate_upload(filename, data)
+
+            loop = asyncio.get_running_loop()
+            try:
+                result = await loop.run_in_executor(
+                    self.executor, run_api_analysis, filename, data
+                )
+            except ValueError as e:
+                # file_reader raises ValueError for unreadable documents
+                raise HttpError(HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+
+            self.completed += 1
+            return HTTPStatus.OK, result, {}
+        finally:
+            self.in_flight -= 1
+
+    async def triage(self, target: str, headers: Dict, body: bytes):
+        if self.triage_in_flight >= self.triage_threads:
+            self.triage_rejected += 1
+            return self.at_capacity("Triage")
+
+        self.triage_in_flight += 1
+        try:
+            filename, data = extract_upload(target, headers, body)
+            validate_upload(filename, data)
+
+            loop = asyncio.get_running_loop()
+            try:
+                result = await loop.run_in_executor(
+                    self.triage_executor, triage_document, filename, data
+                )
+            except ValueError as e:
+                raise HttpError(HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+
+            self.triaged += 1
+            return HTTPStatus.OK, result, {}
+        finally:
+            self.triage_in_flight -= 1
+
+    def stats(self) -> Dict:
+        return {
+            "status": "ok",
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "triaged": self.triaged,
+            "triage_in_flight": self.triage_in_flight,
+            "triage_rejected": self.triage_rejected,
+        }
+
+    async def respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        payload: Dict,
+        extra_headers: Optional[Dict] = None
+    ) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=list).encode("utf-8")
+        head = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+        ]
+        for name, value in (extra_headers or {}).items():
+            head.append(f"{name}: {value}")
+
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+        self.triage_executor.shutdown(cancel_futures=True)
+
+
+async def serve(host: str, port: int, max_concurrency: int) -> None:
+    app = AnalysisServer(max_concurrency)
+    server = await asyncio.start_server(app.handle, host, port)
+
+    print(f"Contract analysis API on http://{host}:{port} "
+          f"(max {app.max_concurrency} concurrent analyses)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        app.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Contract analysis HTTP API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENCY)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_concurrency))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
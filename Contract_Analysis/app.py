@@ -1,16 +1,19 @@
+import hashlib
+import html
+import os
+import time
+
 import streamlit as st
 
-from backend.file_reader import extract_text
-from backend.language_handler import normalize_language
-from backend.contract_classifier import classify_contract
-from backend.clause_extractor import extract_clauses
-from backend.risk_analyzer import analyze_contract_clauses
-from backend.explainer import explain_contract_clauses
-from backend.summary_generator import generate_executive_summary
+from backend.job_queue import JobQueue, RUNNING, DONE, FAILED, CANCELLED
 from backend.audit_logger import log_event
-from backend.ner_extractor import extract_entities
+from backend.portfolio_stats import record_analysis
+from backend.obligation_index import index_contract
+from backend.risk_matrix import save_hit_matrix
 from backend.chatbot import answer_question
 from backend.report_generator import generate_pdf_report
+from backend.renegotiation_engine import stream_renegotiations
+from backend.memory_profiling import StageProfiler
 
 # -------------------------------------------------
 # PAGE CONFIG
@@ -109,30 +112,197 @@ st.divider()
 # FILE UPLOAD
 # -------------------------------------------------
 
-uploaded = st.file_uploader(
-    "Upload Contract (PDF / DOCX / TXT)",
-    type=["pdf", "docx", "txt"]
+uploads = st.file_uploader(
+    "Upload Contracts (PDF / DOCX / TXT) — select several to compare",
+    type=["pdf", "docx", "txt"],
+    accept_multiple_files=True
 )
 
-if not uploaded:
-    st.info("⬆️ Upload a contract to start analysis")
+if not uploads:
+    st.info("⬆️ Upload one or more contracts to start analysis")
     st.stop()
 
 # -------------------------------------------------
-# ANALYSIS PIPELINE
+# ANALYSIS PIPELINE (BACKGROUND JOBS)
+# -------------------------------------------------
+
+@st.cache_resource
+def get_job_queue() -> JobQueue:
+    # One worker pool per server process, shared by every session
+    return JobQueue()
+
+
+jobs = get_job_queue()
+tracked = st.session_state.setdefault("jobs", {})  # upload key -> job id
+logged = st.session_state.setdefault("logged_jobs", set())  # upload keys
+# Per finished document, so reruns while other uploads are still
+# analysing do not redo them: document id -> PDF path / suggestions
+reports = st.session_state.setdefault("reports", {})
+renegotiations = st.session_state.setdefault("renegotiations", {})
+
+# Upload key = content hash (= the pipeline's document_id), hashed once
+# per uploaded file rather than on every rerun
+known_hashes = st.session_state.get("upload_hashes", {})
+upload_hashes = {
+    u.file_id: known_hashes.get(u.file_id) or hashlib.sha256(u.getvalue()).hexdigest()
+    for u in uploads
+}
+st.session_state["upload_hashes"] = upload_hashes
+current = {upload_hashes[u.file_id]: u for u in uploads}
+
+# Files removed from the uploader: stop and drop their jobs
+for key in list(tracked):
+    if key not in current:
+        jobs.cancel(tracked[key])
+        jobs.forget(tracked[key])
+        del tracked[key]
+        logged.discard(key)
+        reports.pop(key, None)
+        renegotiations.pop(key, None)
+
+# New files: every upload runs concurrently in the worker pool
+for key, upload in current.items():
+    if key not in tracked:
+        tracked[key] = jobs.submit(upload.name, upload.getvalue())
+
+
+def job_status(key: str) -> dict:
+    try:
+        return jobs.status(tracked[key])
+    except KeyError:
+        # Result expired in the queue (session left idle): analyse again
+        tracked[key] = jobs.submit(current[key].name, current[key].getvalue())
+        return jobs.status(tracked[key])
+
+
+statuses = {key: job_status(key) for key in current}
+finished = {key: job for key, job in statuses.items() if job["status"] == DONE}
+# Running jobs with partial results are rendered progressively
+available = {
+    key: job for key, job in statuses.items()
+    if job["status"] in (RUNNING, DONE) and job["result"]
+}
+waiting = [job for job in statuses.values() if job["status"] not in (DONE, FAILED, CANCELLED)]
+
+# -------------------------------------------------
+# AUDIT LOG + INDEXES (ONCE PER COMPLETED ANALYSIS)
+# -------------------------------------------------
+
+for key, job in finished.items():
+    if key in logged:
+        continue
+
+    done = job["result"]
+    log_event(
+        filename=done["filename"],
+        contract_type=done["classification"]["contract_type"],
+        risk_summary=done["analysis"]["contract_risk"],
+        total_clauses=len(done["explained"])
+    )
+    record_analysis(done["classification"]["contract_type"], done["analysis"]["contract_risk"])
+    index_contract(
+        done["document_id"],
+        done["filename"],
+        done["classification"]["contract_type"],
+        done["obligations"]
+    )
+    save_hit_matrix(
+        done["document_id"],
+        done["filename"],
+        done["classification"]["contract_type"],
+        done["analysis"]["clauses"],
+        done["analysis"]["contract_risk"],
+        done["analysis"]["rule_pack"]
+    )
+    logged.add(key)
+
+# -------------------------------------------------
+# JOB STATUS
 # -------------------------------------------------
 
-with st.spinner("Analyzing contract…"):
-    raw_text = extract_text(uploaded)
-    lang_info = normalize_language(raw_text)
-    text_en = lang_info["normalized_english_text"]
+for key, job in statuses.items():
+    if job["status"] == FAILED:
+        st.error(f"{job['filename']}: analysis failed — {job['error']}")
+    elif job["status"] == CANCELLED:
+        st.warning(f"{job['filename']}: analysis cancelled. Re-upload to start again.")
+
+for job in waiting:
+    s1, s2 = st.columns([5, 1])
+    if job.get("queue_position"):
+        s1.info(f"⏳ {job['filename']}: queued (position {job['queue_position']})…")
+    else:
+        ready = f" · {job['stage']} ready" if job["stage"] else ""
+        s1.info(f"🔍 {job['filename']}: analyzing… ({time.time() - job['started_at']:.0f}s){ready}")
+
+    if s2.button("✖️ Cancel", key=f"cancel-{job['job_id']}"):
+        jobs.cancel(job["job_id"])
+        st.rerun()
 
-    classification = classify_contract(text_en)
-    clauses = extract_clauses(text_en)
-    analysis = analyze_contract_clauses(clauses)
-    explained = explain_contract_clauses(analysis["clauses"])
-    summary = generate_executive_summary(classification, analysis)
-    entities = extract_entities(text_en)
+
+def poll_until_finished() -> None:
+    # Re-run the script while any analysis is still in flight
+    if waiting:
+        time.sleep(1)
+        st.rerun()
+
+
+if not available:
+    poll_until_finished()
+    st.stop()
+
+# -------------------------------------------------
+# SIDE-BY-SIDE COMPARISON (MULTI-FILE)
+# -------------------------------------------------
+
+if len(current) > 1:
+    st.subheader("⚖️ Comparison")
+
+    results = [job["result"] for job in finished.values()]
+
+    if results:
+        st.dataframe([
+            {
+                "File": r["filename"],
+                "Type": r["classification"]["contract_type"],
+                "Overall Risk": r["analysis"]["contract_risk"]["overall_risk"],
+                "High-Risk Clauses": r["analysis"]["contract_risk"]["high_risk_clauses"],
+                "Critical Flags": r["analysis"]["contract_risk"]["critical_flags"],
+                "Average Score": r["analysis"]["contract_risk"]["average_score"],
+                "Clauses": r["analysis"]["contract_risk"]["total_clauses"],
+            }
+            for r in results
+        ])
+
+        st.markdown("**Clause types found**")
+        clause_types = sorted({
+            c["clause_type"] for r in results for c in r["explained"]
+        })
+        st.dataframe([
+            {"Clause Type": t, **{
+                r["filename"]: "✅" if any(c["clause_type"] == t for c in r["explained"]) else "—"
+                for r in results
+            }}
+            for t in clause_types
+        ])
+
+    selected = st.selectbox(
+        "Detailed view",
+        list(available),
+        format_func=lambda key: available[key]["filename"]
+    )
+    st.divider()
+else:
+    selected = next(iter(available))
+
+result = available[selected]["result"]
+complete = available[selected]["status"] == DONE
+
+# Present once their stage has finished (see backend.pipeline.iter_analysis)
+classification = result["classification"]
+analysis = result.get("analysis")
+explained = result.get("explained", [])
+summary = result.get("summary")
+entities = result.get("entities")
 
 # -------------------------------------------------
 # OVERVIEW CARDS
@@ -140,6 +310,9 @@ with st.spinner("Analyzing contract…"):
 
 st.subheader("📌 Contract Overview")
 
+if result.get("degraded"):
+    st.warning(f"⚠️ Partial analysis: {result['degraded']}")
+
 c1, c2, c3, c4 = st.columns(4)
 
 with c1:
@@ -159,12 +332,13 @@ with c2:
 with c3:
     st.markdown(
         f"<div class='metric-card'>🧩<br><b>Clauses</b><br>"
-        f"{analysis['contract_risk']['total_clauses']}</div>",
+        f"{analysis['contract_risk']['total_clauses'] if analysis else '…'}</div>",
         unsafe_allow_html=True
     )
 
-risk = analysis["contract_risk"]["overall_risk"]
+risk = analysis["contract_risk"]["overall_risk"] if analysis else "Analyzing…"
 badge = (
+    "" if not analysis else
     "badge-low" if "Low" in risk else
     "badge-medium" if "Medium" in risk else
     "badge-high"
@@ -190,16 +364,22 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs(
 # ---------------- SUMMARY ----------------
 
 with tab1:
-    st.markdown(
-        f"<div class='card'><h4>Executive Summary</h4>"
-        f"<p>{summary}</p></div>",
-        unsafe_allow_html=True
-    )
+    if summary is None:
+        st.caption("Generating summary…")
+    else:
+        st.markdown(
+            f"<div class='card'><h4>Executive Summary</h4>"
+            f"<p>{html.escape(summary)}</p></div>",
+            unsafe_allow_html=True
+        )
 
 # ---------------- ENTITIES ----------------
 
 with tab2:
-    for key, values in entities.items():
+    if entities is None:
+        st.caption("Extracting entities…")
+
+    for key, values in (entities or {}).items():
         st.markdown(f"**{key}**")
         if values:
             st.markdown(", ".join(f"`{v}`" for v in values))
@@ -209,15 +389,25 @@ with tab2:
 
 # ---------------- CLAUSES ----------------
 
+renegotiation_slots = {}
+
 with tab3:
+    if analysis is None:
+        st.caption("Extracting and scoring clauses…")
+
     for i, clause in enumerate(explained, start=1):
         icon = "🔴" if clause["risk_level"] == "High" else "🟡" if clause["risk_level"] == "Medium" else "🟢"
-        with st.expander(f"{icon} Clause {i}: {clause['title']}"):
+        with st.expander(f"{icon} Clause {i}: {clause['title']} · {clause['clause_type']}"):
             st.markdown("<div class='card'>", unsafe_allow_html=True)
 
             st.markdown("**Clause Text**")
             st.write(clause["text"])
 
+            if clause.get("entities"):
+                st.caption(" • ".join(
+                    f"{e['label']}: {e['text']}" for e in clause["entities"]
+                ))
+
             st.markdown("**What this means**")
             st.write(clause["plain_english_explanation"])
 
@@ -228,23 +418,33 @@ with tab3:
             for s in clause["suggested_alternatives"]:
                 st.write("✅", s)
 
+            if clause["risk_level"] == "High":
+                st.markdown("**Renegotiation Suggestion**")
+                renegotiation_slots[i - 1] = st.empty()
+                renegotiation_slots[i - 1].caption("Drafting suggestion…")
+
             st.markdown("</div>", unsafe_allow_html=True)
 
 # ---------------- RISKS ----------------
 
 with tab4:
-    r = analysis["contract_risk"]
+    if analysis is None:
+        st.caption("Scoring risks…")
+    else:
+        r = analysis["contract_risk"]
 
-    st.metric("High-Risk Clauses", r["high_risk_clauses"])
-    st.metric("Critical Flags", r["critical_flags"])
-    st.metric("Average Risk Score", r["average_score"])
+        st.metric("High-Risk Clauses", r["high_risk_clauses"])
+        st.metric("Critical Flags", r["critical_flags"])
+        st.metric("Average Risk Score", r["average_score"])
 
 # ---------------- CHAT ----------------
 
 with tab5:
     q = st.text_input("Ask about safety, risk, summary, or contract type")
 
-    if q:
+    if q and summary is None:
+        st.caption("The assistant is available once the summary is ready.")
+    elif q:
         response = answer_question(
             q,
             classification,
@@ -253,40 +453,68 @@ with tab5:
         )
 
         st.markdown(
-            f"<div class='chat-bubble'><b>AI Assistant</b><br>{response}</div>",
+            f"<div class='chat-bubble'><b>AI Assistant</b><br>{html.escape(response)}</div>",
             unsafe_allow_html=True
         )
 
+# Partial result: render what is ready, come back for the rest
+if not complete:
+    poll_until_finished()
+    st.stop()
+
 # -------------------------------------------------
 # DOWNLOAD REPORT
 # -------------------------------------------------
 
 st.divider()
 
-pdf_path = generate_pdf_report(
-    uploaded.name,
-    classification,
-    analysis["contract_risk"],
-    explained
-)
+pdf_path = reports.get(result["document_id"])
+
+# Once per document (again only if the report store evicted the file)
+if not pdf_path or not os.path.exists(pdf_path):
+    report_profiler = StageProfiler(result["document_id"], result["filename"], 0)
+    report_profiler.text_chars = result["text_chars"]
+
+    with report_profiler.stage("report_generator"):
+        pdf_path = generate_pdf_report(
+            result["filename"],
+            classification,
+            analysis["contract_risk"],
+            explained
+        )
+
+    report_profiler.write()
+    reports[result["document_id"]] = pdf_path
 
 with open(pdf_path, "rb") as f:
     st.download_button(
         "⬇️ Download Full Legal Report (PDF)",
         f,
-        file_name=pdf_path.split("/")[-1],
+        file_name=f"Contract_Report_{result['filename'].rsplit('.', 1)[0]}.pdf",
         mime="application/pdf"
     )
 
 # -------------------------------------------------
-# AUDIT LOG
+# RENEGOTIATION SUGGESTIONS (STREAMED INTO CLAUSES TAB)
 # -------------------------------------------------
 
-log_event(
-    filename=uploaded.name,
-    contract_type=classification["contract_type"],
-    risk_summary=analysis["contract_risk"],
-    total_clauses=len(explained)
-)
+if renegotiation_slots:
+    drafted = renegotiations.get(result["document_id"])
+
+    if drafted is None:
+        drafted = {}
+        try:
+            for index, suggestion in stream_renegotiations(explained):
+                renegotiation_slots[index].markdown(suggestion)
+                drafted[index] = suggestion
+            renegotiations[result["document_id"]] = drafted
+        except OSError:
+            for slot in renegotiation_slots.values():
+                slot.caption("Renegotiation backend unavailable")
+    else:
+        for index, suggestion in drafted.items():
+            renegotiation_slots[index].markdown(suggestion)
 
 st.caption("🔒 Local analysis • No data shared • Not legal advice")
+
+poll_until_finished()
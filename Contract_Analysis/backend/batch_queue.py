@@ -0,0 +1,193 @@
+# backend/batch_queue.py
+# Work queue for multi-node batch analysis of a contract archive.
+# Nodes share one SQLite file (local disk or a shared filesystem) and
+# claim items under time-limited leases; an item whose lease expires
+# (node died or hung) is handed to the next node that asks.
+#
+# Delivery is at-least-once: a node that loses its lease while still
+# working may also write its result, so readers dedupe on item_id.
+
+import os
+import socket
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, Iterable, List, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_QUEUE = os.path.join(BASE_DIR, "indexes", "batch_queue.sqlite3")
+
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 3
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+def default_node_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _connect(queue_path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(os.path.abspath(queue_path)), exist_ok=True)
+    conn = sqlite3.connect(queue_path, timeout=60, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS items (
+            item_id       INTEGER PRIMARY KEY,
+            path          TEXT NOT NULL UNIQUE,
+            shard         INTEGER NOT NULL,
+            status        TEXT NOT NULL,
+            lease_owner   TEXT,
+            lease_expires REAL,
+            attempts      INTEGER NOT NULL DEFAULT 0,
+            error         TEXT,
+            updated_at    REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_items_claim
+            ON items (status, lease_expires);
+    """)
+    return conn
+
+# -------------------------------------------------
+# PRODUCER
+# -------------------------------------------------
+
+def enqueue(queue_path: str, paths: Iterable[str], shards: int = 8) -> int:
+    """
+    Adds files to the queue (already-queued paths are skipped).
+    Shard = item_id % shards, fixed at enqueue time.
+    """
+    added = 0
+    with closing(_connect(queue_path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        for path in paths:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO items (path, shard, status, updated_at) "
+                "VALUES (?, 0, ?, ?)",
+                (os.path.abspath(path), PENDING, time.time()),
+            )
+            if cursor.rowcount:
+                conn.execute(
+                    "UPDATE items SET shard = item_id % ? WHERE item_id = ?",
+                    (max(1, shards), cursor.lastrowid),
+                )
+                added += 1
+        conn.execute("COMMIT")
+    return added
+
+# -------------------------------------------------
+# CONSUMER
+# -------------------------------------------------
+
+def claim(
+    queue_path: str,
+    node_id: str,
+    lease_seconds: float = LEASE_SECONDS,
+    max_attempts: int = MAX_ATTEMPTS
+) -> Optional[Dict]:
+    """
+    Leases the oldest pending (or lease-expired) item to node_id.
+    Returns None when nothing is claimable right now.
+    """
+    now = time.time()
+    with closing(_connect(queue_path)) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+
+        # Expired leases that used up their attempts are given up on
+        conn.execute(
+            "UPDATE items SET status = ?, error = 'lease expired', updated_at = ? "
+            "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+            (FAILED, now, LEASED, now, max_attempts),
+        )
+
+        row = conn.execute(
+            "SELECT * FROM items "
+            "WHERE status = ? OR (status = ? AND lease_expires < ?) "
+            "ORDER BY item_id LIMIT 1",
+            (PENDING, LEASED, now),
+        ).fetchone()
+
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+
+        conn.execute(
+            "UPDATE items SET status = ?, lease_owner = ?, lease_expires = ?, "
+            "attempts = attempts + 1, updated_at = ? WHERE item_id = ?",
+            (LEASED, node_id, now + lease_seconds, now, row["item_id"]),
+        )
+        conn.execute("COMMIT")
+
+    item = dict(row)
+    item["attempts"] += 1
+    return item
+
+
+def renew(queue_path: str, item_id: int, node_id: str, lease_seconds: float = LEASE_SECONDS) -> bool:
+    """
+    Extends a lease still held by node_id; False if it was lost.
+    """
+    now = time.time()
+    with closing(_connect(queue_path)) as conn:
+        cursor = conn.execute(
+            "UPDATE items SET lease_expires = ?, updated_at = ? "
+            "WHERE item_id = ? AND status = ? AND lease_owner = ?",
+            (now + lease_seconds, now, item_id, LEASED, node_id),
+        )
+        return cursor.rowcount == 1
+
+
+def complete(queue_path: str, item_id: int, node_id: str) -> bool:
+    with closing(_connect(queue_path)) as conn:
+        cursor = conn.execute(
+            "UPDATE items SET status = ?, lease_expires = NULL, error = NULL, updated_at = ? "
+            "WHERE item_id = ? AND status = ? AND lease_owner = ?",
+            (DONE, time.time(), item_id, LEASED, node_id),
+        )
+        return cursor.rowcount == 1
+
+
+def fail(
+    queue_path: str,
+    item_id: int,
+    node_id: str,
+    error: str,
+    max_attempts: int = MAX_ATTEMPTS
+) -> None:
+    """
+    Puts the item back for another node, or marks it failed once it
+    has used up its attempts.
+    """
+    with closing(_connect(queue_path)) as conn:
+        conn.execute(
+            "UPDATE items SET "
+            "status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "lease_owner = NULL, lease_expires = NULL, error = ?, updated_at = ? "
+            "WHERE item_id = ? AND status = ? AND lease_owner = ?",
+            (max_attempts, FAILED, PENDING, error[:500], time.time(), item_id, LEASED, node_id),
+        )
+
+# -------------------------------------------------
+# MONITORING
+# -------------------------------------------------
+
+def queue_stats(queue_path: str) -> Dict[str, int]:
+    with closing(_connect(queue_path)) as conn:
+        counts = dict(conn.execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall())
+    return {status: counts.get(status, 0) for status in (PENDING, LEASED, DONE, FAILED)}
+
+
+def failed_items(queue_path: str) -> List[Dict]:
+    with closing(_connect(queue_path)) as conn:
+        return [
+            dict(row) for row in
+            conn.execute("SELECT * FROM items WHERE status = ? ORDER BY item_id", (FAILED,))
+        ]
+
+
+def is_drained(queue_path: str) -> bool:
+    stats = queue_stats(queue_path)
+    return not stats[PENDING] and not stats[LEASED]
@@ -1,5 +1,7 @@
 import re
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence, Tuple
+
+from backend.clause_tagger import tag_clauses
 
 
 # -------------------------------------------------------------------
@@ -45,6 +47,12 @@ NOISE_PATTERNS = [
 
 SCHEDULE_WORDS = ["schedule", "annexure", "appendix", "exhibit"]
 
+# Bracket heading lines while normalize_text runs, so their position in
+# the normalized text is known; removed again before anything sees it
+HEADING_START = "\x02"
+HEADING_END = "\x03"
+HEADING_BRACKET_SPLIT = re.compile("([\x02\x03])")
+
 
 # -------------------------------------------------------------------
 # TEXT NORMALIZATION
@@ -68,8 +76,8 @@ def normalize_text(text: str) -> str:
     # Normalize punctuation
     text = text.replace("—", "-").replace("–", "-")
 
-    # Fix broken numbering: 1 . Duration
-    text = re.sub(r'(\d)\s*\.\s*', r'\1. ', text)
+    # Fix broken numbering: 1 . Duration (not decimals: 12.5%, 1,000.50)
+    text = re.sub(r'(\d)\s*\.(?!\d)\s*', r'\1. ', text)
 
     # Normalize Hindi artifacts (basic)
     text = text.replace("किरायेदार", "tenant").replace("मकान", "property")
@@ -80,6 +88,49 @@ def normalize_text(text: str) -> str:
     return text.strip()
 
 
+def normalize_with_headings(
+    text: str,
+    heading_lines: Sequence[int]
+) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    normalize_text(text) plus the (start, end) span, in that normalized
+    text, of every heading line (line numbers in `text`, as found by
+    file_reader from the PDF layout).
+    """
+    if not heading_lines:
+        return normalize_text(text), []
+
+    wanted = set(heading_lines)
+    lines = text.replace(HEADING_START, "").replace(HEADING_END, "").splitlines()
+    marked = normalize_text("\n".join(
+        f"{HEADING_START}{line}{HEADING_END}" if i in wanted else line
+        for i, line in enumerate(lines)
+    ))
+
+    pieces, headings = [], []
+    length = start = 0
+    for piece in HEADING_BRACKET_SPLIT.split(marked):
+        if piece == HEADING_START:
+            start = length
+        elif piece == HEADING_END:
+            headings.append((start, length))
+        else:
+            pieces.append(piece)
+            length += len(piece)
+    document = "".join(pieces)
+
+    spans = []
+    for start, end in headings:
+        while start < end and document[start].isspace():
+            start += 1
+        while end > start and document[end - 1].isspace():
+            end -= 1
+        if start < end:
+            spans.append((start, end))
+
+    return document, spans
+
+
 # -------------------------------------------------------------------
 # UTILITIES
 # -------------------------------------------------------------------
@@ -119,19 +170,74 @@ def keyword_in_text(text: str) -> Optional[str]:
 # PRIMARY CLAUSE REGEX (NUMBERED)
 # -------------------------------------------------------------------
 
+# Both run over the whole single-line document, so every quantifier is
+# bounded and a match may only start at the beginning of a number / word:
+# the unanchored, case-insensitive [IVXLC]+ retried inside every word
+# (and went quadratic on long runs of those letters).
 NUMBERED_CLAUSE_REGEX = re.compile(
-    r'(?P<num>\d{1,2})\s*[\.\:\)]\s*'
-    r'(?P<title>[A-Za-z][A-Za-z\s&/\-]{2,60})\s*:',
-    re.IGNORECASE
+    r'(?<!\d)(?P<num>\d{1,2})\s*[\.\:\)]\s*'
+    r'(?P<title>[A-Za-z][A-Za-z\s&/\-]{2,60})\s*:'
 )
 
 ROMAN_CLAUSE_REGEX = re.compile(
-    r'(?P<num>[IVXLC]+)\s*[\.\:\)]\s*'
-    r'(?P<title>[A-Za-z][A-Za-z\s&/\-]{2,60})',
-    re.IGNORECASE
+    r'(?<![A-Za-z])(?P<num>[IVXLCivxlc]{1,8})\s*[\.\:\)]\s*'
+    r'(?P<title>[A-Za-z][A-Za-z\s&/\-]{2,60})'
 )
 
 
+# -------------------------------------------------------------------
+# CLAUSE SPANS
+# -------------------------------------------------------------------
+
+def make_clause(text: str, title: str, start: int, end: int, confidence: float) -> Dict:
+    """
+    Clause whose text is exactly text[start:end] (whitespace-trimmed),
+    so downstream stages can map offsets back to the document.
+    """
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+
+    return {
+        "title": title,
+        "text": text[start:end],
+        "start": start,
+        "end": end,
+        "confidence": confidence
+    }
+
+
+def iter_spans(text: str, separator: "re.Pattern"):
+    """(start, end) of the pieces between separator matches."""
+    pos = 0
+    for m in separator.finditer(text):
+        yield pos, m.start()
+        pos = m.end()
+    yield pos, len(text)
+
+
+BLOCK_SEPARATOR = re.compile(r'\n{2,}')
+SENTENCE_SEPARATOR = re.compile(r'(?<=[.;])\s+')
+
+
+# -------------------------------------------------------------------
+# STAGE 0: LAYOUT HEADINGS (PDF font metrics)
+# -------------------------------------------------------------------
+
+def extract_layout_headings(text: str, headings: Sequence[Tuple[int, int]]) -> List[Dict]:
+    clauses = []
+
+    for i, (start, end) in enumerate(headings):
+        body_end = headings[i + 1][0] if i + 1 < len(headings) else len(text)
+
+        clause = make_clause(text, text[start:end], end, body_end, 0.97)
+        if clause["text"]:
+            clauses.append(clause)
+
+    return clauses
+
+
 # -------------------------------------------------------------------
 # STAGE 1: STRICT NUMBERED EXTRACTION
 # -------------------------------------------------------------------
@@ -141,18 +247,13 @@ def extract_numbered_clauses(text: str) -> List[Dict]:
     matches = list(NUMBERED_CLAUSE_REGEX.finditer(text))
 
     for i, m in enumerate(matches):
-        start = m.start()
         end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
 
         title = f"{m.group('num')}. {m.group('title').strip()}"
-        body = text[m.end():end].strip()
+        clause = make_clause(text, title, m.end(), end, 0.95)
 
-        if body and not is_noise(body):
-            clauses.append({
-                "title": title,
-                "text": body,
-                "confidence": 0.95
-            })
+        if clause["text"] and not is_noise(clause["text"]):
+            clauses.append(clause)
 
     return clauses
 
@@ -166,17 +267,10 @@ def extract_roman_clauses(text: str) -> List[Dict]:
     matches = list(ROMAN_CLAUSE_REGEX.finditer(text))
 
     for i, m in enumerate(matches):
-        start = m.start()
         end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
 
         title = f"{m.group('num')}. {m.group('title').strip()}"
-        body = text[m.end():end].strip()
-
-        clauses.append({
-            "title": title,
-            "text": body,
-            "confidence": 0.9
-        })
+        clauses.append(make_clause(text, title, m.end(), end, 0.9))
 
     return clauses
 
@@ -186,27 +280,29 @@ def extract_roman_clauses(text: str) -> List[Dict]:
 # -------------------------------------------------------------------
 
 def extract_heading_blocks(text: str) -> List[Dict]:
-    blocks = re.split(r'\n{2,}', text)
     clauses = []
     current = None
 
-    for block in blocks:
-        clean = block.strip()
+    for start, end in iter_spans(text, BLOCK_SEPARATOR):
+        clean = text[start:end].strip()
         if not clean or is_noise(clean):
             continue
 
         if looks_like_heading(clean):
             if current:
                 clauses.append(current)
-            current = {"title": clean, "text": "", "confidence": 0.8}
+            current = {"title": clean, "start": end, "end": end}
         else:
             if current:
-                current["text"] += " " + clean
+                current["end"] = end
 
     if current:
         clauses.append(current)
 
-    return clauses
+    return [
+        make_clause(text, c["title"], c["start"], c["end"], 0.8)
+        for c in clauses
+    ]
 
 
 # -------------------------------------------------------------------
@@ -215,28 +311,26 @@ def extract_heading_blocks(text: str) -> List[Dict]:
 
 def extract_inline_clauses(text: str) -> List[Dict]:
     clauses = []
-    sentences = re.split(r'(?<=[.;])\s+', text)
     current = None
 
-    for sent in sentences:
-        kw = keyword_in_text(sent)
+    for start, end in iter_spans(text, SENTENCE_SEPARATOR):
+        kw = keyword_in_text(text[start:end])
         if kw:
             if current:
                 clauses.append(current)
 
-            current = {
-                "title": kw.capitalize(),
-                "text": sent,
-                "confidence": 0.6
-            }
+            current = {"title": kw.capitalize(), "start": start, "end": end}
         else:
             if current:
-                current["text"] += " " + sent
+                current["end"] = end
 
     if current:
         clauses.append(current)
 
-    return clauses
+    return [
+        make_clause(text, c["title"], c["start"], c["end"], 0.6)
+        for c in clauses
+    ]
 
 
 # -------------------------------------------------------------------
@@ -250,30 +344,58 @@ def extract_schedules(text: str) -> List[Dict]:
     for word in SCHEDULE_WORDS:
         if word in lower:
             idx = lower.index(word)
-            clauses.append({
-                "title": word.capitalize(),
-                "text": text[idx:],
-                "confidence": 0.7
-            })
+            clauses.append(
+                make_clause(text, word.capitalize(), idx, len(text), 0.7)
+            )
             break
 
     return clauses
 
 
+# -------------------------------------------------------------------
+# STAGE 6: ABSOLUTE FALLBACK
+# -------------------------------------------------------------------
+
+def single_clause(text: str) -> List[Dict]:
+    """The whole document as one "Agreement" clause."""
+    return [make_clause(text, "Agreement", 0, len(text), 0.4)]
+
+
 # -------------------------------------------------------------------
 # MASTER EXTRACTOR
 # -------------------------------------------------------------------
 
-def extract_clauses(contract_text: str) -> List[Dict]:
+def extract_clauses(
+    contract_text: str,
+    normalized: bool = False,
+    headings: Sequence[Tuple[int, int]] = ()
+) -> List[Dict]:
     """
     Master clause extractor.
+    Segments the contract, then labels every clause with a clause_type.
+    Clause start/end offsets refer to normalize_text(contract_text);
+    pass normalized=True when the caller already holds that text, and
+    headings (from normalize_with_headings) to segment on PDF headings.
+    """
+    text = contract_text if normalized else normalize_text(contract_text)
+    return tag_clauses(segment_clauses(text, headings))
+
+
+def segment_clauses(text: str, headings: Sequence[Tuple[int, int]] = ()) -> List[Dict]:
+    """
     Multi-pass, defensive, real-world safe.
+    Expects text from normalize_text() / normalize_with_headings().
     """
 
-    text = normalize_text(contract_text)
     if not text:
         return []
 
+    # 0. Headings found by the PDF reader from font metrics
+    if headings:
+        clauses = extract_layout_headings(text, headings)
+        if len(clauses) >= 2:
+            return clauses
+
     # 1. Strict numbered clauses
     clauses = extract_numbered_clauses(text)
     if len(clauses) >= 3:
@@ -300,21 +422,4 @@ def extract_clauses(contract_text: str) -> List[Dict]:
         return clauses
 
     # 6. Absolute fallback
-    return [{
-        "title": "Agreement",
-        "text": text,
-        "confidence": 0.4
-    }]
-def normalize_title(title, text):
-    t = title.lower()
-    if "terminate" in text.lower():
-        return "Termination"
-    if "payment" in text.lower():
-        return "Payment Terms"
-    if "indemn" in text.lower():
-        return "Indemnity & Liability"
-    if "confidential" in text.lower():
-        return "Confidentiality"
-    if "non compete" in text.lower() or "shall not engage" in text.lower():
-        return "Non-Compete"
-    return title
+    return single_clause(text)
@@ -0,0 +1,123 @@
+# backend/clause_record.py
+# Compact per-clause record used by the pipeline.
+# The clause text is a span of one shared document buffer, and the
+# explanation fields reference the explainer's template strings, so a
+# document with hundreds of clauses keeps one copy of its text and one
+# copy of each template. Reads like a dict (clause["text"], .get, keys)
+# for the UI, report generator and API.
+
+import sys
+from collections.abc import Mapping
+from typing import Dict, List
+
+KEYS = (
+    "title", "clause_type", "text", "confidence", "start", "end",
+    "obligation_type", "risk_level", "risk_reason", "unfavorable", "rule_hits",
+    "entities",
+    "plain_english_explanation", "business_impact", "suggested_alternatives", "disclaimer",
+)
+
+# Keys later stages may assign with clause[key] = value
+SETTABLE = frozenset((
+    "clause_type", "obligation_type", "risk_level", "risk_reason",
+    "unfavorable", "rule_hits", "entities",
+))
+
+
+class ClauseRecord(Mapping):
+    __slots__ = (
+        "_document", "start", "end", "title", "clause_type", "confidence",
+        "obligation_type", "risk_level", "risk_reason", "unfavorable", "rule_hits",
+        "entities",
+        "_explanation_parts", "business_impact", "_suggestions", "disclaimer",
+    )
+
+    def __init__(self, document: str, start: int, end: int, title: str,
+                 clause_type: str = "General", confidence: float = None):
+        self._document = document
+        self.start = start
+        self.end = end
+        self.title = sys.intern(title)
+        self.clause_type = sys.intern(clause_type)
+        self.confidence = confidence
+
+    # ---------------- derived fields ----------------
+
+    @property
+    def text(self) -> str:
+        return self._document[self.start:self.end]
+
+    @property
+    def plain_english_explanation(self) -> str:
+        return " ".join(self._explanation_parts)
+
+    @property
+    def suggested_alternatives(self) -> List[str]:
+        return list(self._suggestions)
+
+    # ---------------- stage annotations ----------------
+
+    def annotate(self, **fields) -> "ClauseRecord":
+        for key, value in fields.items():
+            self[key] = value
+        return self
+
+    def set_explanation(self, parts, business_impact: str, suggestions, disclaimer: str) -> "ClauseRecord":
+        """parts/suggestions are template strings, stored by reference."""
+        self._explanation_parts = tuple(parts)
+        self.business_impact = business_impact
+        self._suggestions = tuple(suggestions)
+        self.disclaimer = disclaimer
+        return self
+
+    # ---------------- mapping interface ----------------
+
+    def __getitem__(self, key: str):
+        if key not in KEYS:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value) -> None:
+        if key not in SETTABLE:
+            raise KeyError(key)
+        setattr(self, key, sys.intern(value) if isinstance(value, str) else value)
+
+    def __iter__(self):
+        return (key for key in KEYS if key in self)
+
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> Dict:
+        return {key: self[key] for key in self}
+
+    def __repr__(self) -> str:
+        return f"ClauseRecord({self.title!r}, {self.start}:{self.end})"
+
+
+def to_records(document: str, clauses: List[Dict]) -> List[ClauseRecord]:
+    """
+    Converts extractor output (offsets into `document`) to records,
+    dropping the per-clause text copies.
+    """
+    return [
+        ClauseRecord(
+            document,
+            c["start"],
+            c["end"],
+            c["title"],
+            c.get("clause_type", "General"),
+            c.get("confidence"),
+        )
+        for c in clauses
+    ]
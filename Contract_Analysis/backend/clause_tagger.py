@@ -0,0 +1,163 @@
+# backend/clause_tagger.py
+# Clause-type tagging with a precomputed TF-IDF centroid matrix.
+# All clauses of a document (or a batch of documents) are labelled
+# with a single sparse × dense matrix multiply.
+
+from functools import lru_cache
+from typing import Dict, List
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+GENERAL_TYPE = "General"
+
+# Below this cosine similarity a clause keeps the GENERAL_TYPE label
+MIN_SIMILARITY = 0.08
+
+# -------------------------------------------------------------------
+# SEED PHRASES PER CLAUSE TYPE (extendable, no external legal data)
+# -------------------------------------------------------------------
+
+CLAUSE_TYPE_SEEDS = {
+    "Termination": [
+        "either party may terminate this agreement",
+        "terminate the agreement without notice",
+        "termination for breach written notice",
+        "upon termination or expiry of this agreement",
+        "cancellation and exit of the contract",
+    ],
+    "Payment Terms": [
+        "payment shall be made within days of invoice",
+        "fees charges and billing",
+        "monthly rent payable in advance",
+        "withhold payment delay payment",
+        "late payment interest on outstanding amount",
+    ],
+    "Indemnity & Liability": [
+        "shall indemnify and hold harmless",
+        "indemnification against all losses claims damages",
+        "limitation of liability",
+        "liable for any direct or indirect damages",
+        "penalty and liquidated damages",
+    ],
+    "Confidentiality": [
+        "confidential information shall not be disclosed",
+        "non disclosure of proprietary information",
+        "confidentiality obligations survive termination",
+        "trade secrets and data protection",
+    ],
+    "Non-Compete": [
+        "non compete restriction after termination",
+        "shall not engage in any competing business",
+        "shall not solicit clients or employees",
+        "restrictive covenant territory period",
+    ],
+    "Governing Law & Disputes": [
+        "governed by the laws of india",
+        "courts at shall have exclusive jurisdiction",
+        "disputes shall be referred to arbitration",
+        "arbitration and conciliation act",
+    ],
+    "Intellectual Property": [
+        "intellectual property rights shall vest",
+        "sole and exclusive property of the company",
+        "copyright patents trademarks ownership",
+        "waives all moral rights in perpetuity",
+    ],
+    "Term & Renewal": [
+        "this agreement shall remain in force for a term of",
+        "duration tenure and renewal",
+        "auto renew for successive periods",
+        "lock in period",
+    ],
+    "Security Deposit": [
+        "security deposit refundable",
+        "interest free deposit returned on vacating",
+        "deposit adjusted against dues",
+    ],
+    "Maintenance & Use": [
+        "maintenance and repairs of the premises",
+        "electricity water charges",
+        "use of premises sublet subletting",
+    ],
+    "Force Majeure": [
+        "force majeure act of god",
+        "events beyond reasonable control",
+        "war flood pandemic epidemic",
+    ],
+    "Notices": [
+        "notices shall be in writing",
+        "notice sent by registered post or email",
+        "address for notices",
+    ],
+}
+
+
+# -------------------------------------------------------------------
+# MODEL (built once per process)
+# -------------------------------------------------------------------
+
+@lru_cache(maxsize=1)
+def _model():
+    labels = list(CLAUSE_TYPE_SEEDS)
+    seeds = [seed for label in labels for seed in CLAUSE_TYPE_SEEDS[label]]
+    owners = np.array([
+        i for i, label in enumerate(labels) for _ in CLAUSE_TYPE_SEEDS[label]
+    ])
+
+    vectorizer = TfidfVectorizer(
+        ngram_range=(1, 2),
+        sublinear_tf=True,
+        stop_words="english",
+        dtype=np.float32,
+    )
+    seed_matrix = vectorizer.fit_transform(seeds)
+
+    # centroid per type = mean of its seed vectors, L2-normalised
+    centroids = np.vstack([
+        np.asarray(seed_matrix[owners == i].mean(axis=0)).ravel()
+        for i in range(len(labels))
+    ])
+    centroids /= np.linalg.norm(centroids, axis=1, keepdims=True)
+
+    # stored transposed: (n_features × n_types) for X @ C
+    return vectorizer, np.ascontiguousarray(centroids.T), labels
+
+
+# -------------------------------------------------------------------
+# TAGGING
+# -------------------------------------------------------------------
+
+def tag_texts(texts: List[str]) -> List[str]:
+    if not texts:
+        return []
+
+    vectorizer, centroids_t, labels = _model()
+    scores = vectorizer.transform(texts) @ centroids_t  # (n_texts × n_types)
+
+    best = scores.argmax(axis=1)
+    best_scores = scores[np.arange(len(texts)), best]
+
+    return [
+        labels[b] if s >= MIN_SIMILARITY else GENERAL_TYPE
+        for b, s in zip(best, best_scores)
+    ]
+
+
+def tag_clauses(clauses: List[Dict]) -> List[Dict]:
+    """
+    Adds "clause_type" to every clause in place (title + text).
+    """
+    types = tag_texts([f"{c['title']} {c['text']}" for c in clauses])
+    for clause, clause_type in zip(clauses, types):
+        clause["clause_type"] = clause_type
+    return clauses
+
+
+def tag_documents(documents: List[List[Dict]]) -> List[List[Dict]]:
+    """
+    Tags the clauses of many documents with one matrix multiply.
+    """
+    flat = [clause for clauses in documents for clause in clauses]
+    tag_clauses(flat)
+    return documents
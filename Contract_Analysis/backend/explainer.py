@@ -3,7 +3,9 @@
 # SME-focused, explainable, no legal advice
 
 import re
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from backend.clause_record import ClauseRecord
 
 DISCLAIMER = (
     "This explanation is for informational purposes only and does not constitute legal advice."
@@ -27,6 +29,15 @@ RISK_EXPLANATIONS = {
     ),
 }
 
+HIGH_IMPACT = (
+    "This clause may affect operational flexibility, cash flow, "
+    "or legal exposure."
+)
+
+LOW_IMPACT = "This clause is unlikely to significantly impact daily operations."
+
+DEFAULT_SUGGESTION = "Consider discussing this clause with the other party to ensure fairness."
+
 # ---------------------------------------------------------
 # Clause-Specific Explanations
 # ---------------------------------------------------------
@@ -90,16 +101,102 @@ RENOGOTIATION_SUGGESTIONS = {
     ),
 }
 
+# ---------------------------------------------------------
+# Contract-Type Packs (same keys as risk_analyzer.RULE_PACKS)
+# ---------------------------------------------------------
+
+EXPLANATION_PACKS = {
+    "Lease / Rental Agreement": {
+        "explanations": {
+            "evict": (
+                "Eviction terms decide when the tenant can be made to leave. "
+                "Short or discretionary eviction rights put the business premises at risk."
+            ),
+            "lock-in": (
+                "A lock-in period stops the tenant from leaving early. "
+                "Rent for the remaining period or the deposit may be lost on early exit."
+            ),
+            "deposit": (
+                "Security deposit terms decide how much is refunded and when. "
+                "Broad deduction or forfeiture rights can reduce the refund."
+            ),
+        },
+        "suggestions": {
+            "evict": "Ask for a written notice and cure period before any eviction.",
+            "lock-in": "Negotiate a shorter lock-in or an exit fee instead of full forfeiture.",
+            "deposit": "Fix a refund deadline and limit deductions to documented damage.",
+        },
+    },
+    "Employment Agreement": {
+        "explanations": {
+            "non-solicit": (
+                "Non-solicitation clauses bar approaching clients or staff after leaving. "
+                "Long or broad restrictions limit future work."
+            ),
+            "bond": (
+                "Training or service bonds require a payment if the employee leaves early."
+            ),
+            "probation": (
+                "During probation, notice periods and protections are usually shorter."
+            ),
+        },
+        "suggestions": {
+            "non-solicit": "Limit non-solicitation to named clients and 6–12 months.",
+            "bond": "Tie any bond amount to actual training cost, reducing over time.",
+            "probation": "Fix the probation length and the criteria for confirmation.",
+        },
+    },
+    "Vendor / Service Agreement": {
+        "explanations": {
+            "service level": (
+                "Service levels define the performance the vendor must meet. "
+                "Missed levels often trigger credits or deductions from payment."
+            ),
+            "set-off": (
+                "Set-off lets the client deduct amounts it claims from payments due, "
+                "which can hold back invoices without a dispute process."
+            ),
+            "withhold": (
+                "Payment withholding rights allow the client to delay paying invoices."
+            ),
+        },
+        "suggestions": {
+            "service level": "Cap service credits and exclude delays caused by the client.",
+            "set-off": "Allow set-off only for undisputed, agreed amounts.",
+            "withhold": "Limit withholding to the disputed part of an invoice, with a deadline.",
+        },
+    },
+}
+
 # ---------------------------------------------------------
 # Utility
 # ---------------------------------------------------------
 
+def compile_keywords(packs: List[Dict]):
+    """(keywords, explanations, suggestions) for common + given packs."""
+    explanations = dict(CLAUSE_KEYWORD_EXPLANATIONS)
+    suggestions = dict(RENOGOTIATION_SUGGESTIONS)
+    for pack in packs:
+        explanations.update(pack["explanations"])
+        suggestions.update(pack["suggestions"])
+    return tuple(explanations), explanations, suggestions
+
+
+# Built once, like the risk rule sets
+COMMON_KEYWORDS = compile_keywords([])
+PACK_KEYWORDS = {t: compile_keywords([pack]) for t, pack in EXPLANATION_PACKS.items()}
+
+
+def keywords_for(contract_type: Optional[str]):
+    return PACK_KEYWORDS.get(contract_type, COMMON_KEYWORDS)
+
+
 def normalize(text: str) -> str:
     return re.sub(r"\s+", " ", text.lower()).strip()
 
-def detect_keywords(text: str) -> List[str]:
+def detect_keywords(text: str, keywords=COMMON_KEYWORDS[0]) -> List[str]:
     detected = []
-    for key in CLAUSE_KEYWORD_EXPLANATIONS.keys():
+    for key in keywords:
         if key in text:
             detected.append(key)
     return detected
@@ -108,18 +205,18 @@ def detect_keywords(text: str) -> List[str]:
 # Main Explanation Engine
 # ---------------------------------------------------------
 
-def explain_clause(clause: Dict) -> Dict:
+def explanation_parts(clause: Dict, packed=None):
     """
-    Returns:
-    - plain_english_explanation
-    - business_impact
-    - renegotiation_suggestion
+    Returns the template strings (not copies) that make up a clause's
+    explanation: (explanation_parts, business_impact, suggestions).
+    packed: keywords_for(contract_type), default the common keywords.
     """
+    keyword_list, keyword_explanations, keyword_suggestions = packed or COMMON_KEYWORDS
 
     text = normalize(clause["text"])
     risk = clause["risk_level"]
 
-    keywords = detect_keywords(text)
+    keywords = detect_keywords(text, keyword_list)
 
     explanation_parts = []
     suggestions = []
@@ -129,24 +226,32 @@ def explain_clause(clause: Dict) -> Dict:
 
     # Keyword-based explanation
     for kw in keywords:
-        explanation_parts.append(CLAUSE_KEYWORD_EXPLANATIONS.get(kw, ""))
+        explanation_parts.append(keyword_explanations.get(kw, ""))
 
-        if kw in RENOGOTIATION_SUGGESTIONS:
-            suggestions.append(RENOGOTIATION_SUGGESTIONS[kw])
+        if kw in keyword_suggestions:
+            suggestions.append(keyword_suggestions[kw])
 
     if not suggestions:
-        suggestions.append(
-            "Consider discussing this clause with the other party to ensure fairness."
-        )
+        suggestions.append(DEFAULT_SUGGESTION)
+
+    business_impact = HIGH_IMPACT if risk != "Low" else LOW_IMPACT
+
+    return explanation_parts, business_impact, suggestions
+
+
+def explain_clause(clause: Dict, contract_type: Optional[str] = None) -> Dict:
+    """
+    Returns:
+    - plain_english_explanation
+    - business_impact
+    - renegotiation_suggestion
+    """
+
+    explanation, business_impact, suggestions = explanation_parts(clause, keywords_for(contract_type))
 
     return {
-        "plain_english_explanation": " ".join(explanation_parts),
-        "business_impact": (
-            "This clause may affect operational flexibility, cash flow, "
-            "or legal exposure."
-            if risk != "Low"
-            else "This clause is unlikely to significantly impact daily operations."
-        ),
+        "plain_english_explanation": " ".join(explanation),
+        "business_impact": business_impact,
         "suggested_alternatives": suggestions,
         "disclaimer": DISCLAIMER,
     }
@@ -155,11 +260,24 @@ def explain_clause(clause: Dict) -> Dict:
 # Batch Processing
 # ---------------------------------------------------------
 
-def explain_contract_clauses(analyzed_clauses: List[Dict]) -> List[Dict]:
+def explain_contract_clauses(analyzed_clauses: List[Dict], contract_type: Optional[str] = None) -> List[Dict]:
+    """
+    contract_type selects the explanation pack; None uses the common
+    keywords only.
+    """
+    packed = keywords_for(contract_type)
     explained = []
 
     for clause in analyzed_clauses:
-        explanation = explain_clause(clause)
+        # Records keep references to the templates instead of copies
+        if isinstance(clause, ClauseRecord):
+            explanation, business_impact, suggestions = explanation_parts(clause, packed)
+            explained.append(
+                clause.set_explanation(explanation, business_impact, suggestions, DISCLAIMER)
+            )
+            continue
+
+        explanation = explain_clause(clause, contract_type)
 
         explained.append({
             **clause,
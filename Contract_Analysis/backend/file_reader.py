@@ -1,8 +1,24 @@
 # backend/file_reader.py
 
+import io
+import os
+import re
+import threading
+from typing import Dict, List, Tuple
+
 import pdfplumber
 from docx import Document
 
+# Fast plain-text backend (pdfium, a pdfplumber dependency)
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# PDFium is not thread-safe, and triage reads PDFs on the API's worker
+# threads: every pdfium call in this process holds this lock
+_pdfium_lock = threading.Lock()
+
 
 def read_txt(file):
     try:
@@ -20,23 +36,271 @@ def read_docx(file):
         raise ValueError("Unable to read DOCX file")
 
 
-def read_pdf(file):
-    try:
-        extracted_text = ""
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text(
-                    layout=True,
-                    x_tolerance=2,
-                    y_tolerance=2
+# auto:       pdfium plain text; re-read as "structured" only when the text
+#             has no numbered clause headings but does have heading-like
+#             lines, i.e. headings that font metrics can confirm
+# text:       pdfium plain text only (no headings)
+# structured: pdfplumber word/char objects + font metrics, finds heading lines
+# layout:     pdfplumber's layout-preserving text rendering (no headings)
+#
+# Any pdfplumber read costs about the same (scripts/benchmark_pdf.py, 5-6
+# page contracts: 100-150 ms/page for structured, 100-180 for layout and
+# plain pdfplumber text) against 1-2 ms/page for pdfium, so a re-read is
+# only worth it when it can find headings the plain text lacks.
+PDF_READER_MODE = os.environ.get("PDF_READER_MODE", "auto")
+
+# "1. Term", "4.2) Fees", "IV. Termination" at the start of a line
+NUMBERED_HEADING_LINE = re.compile(
+    r"^[ \t]*(?:\d{1,2}(?:\.\d{1,2})*|[IVXLC]{1,6})[ \t]*[.):][ \t]+[A-Za-z]",
+    re.MULTILINE
+)
+MIN_NUMBERED_HEADINGS = 2
+MIN_HEADING_LINES = 2        # heading-like lines worth a structured re-read
+SENTENCE_PUNCTUATION = ".,;:!?"
+
+HEADING_SIZE_RATIO = 1.15    # font size vs. body text
+MAX_HEADING_WORDS = 12
+LINE_TOLERANCE = 3           # points between word tops on one line
+INDENT_TOLERANCE = 4         # points from the left margin
+BOLD_HINTS = ("bold", "black", "heavy", "semibold")
+
+
+def _is_bold(fontname: str) -> bool:
+    name = fontname.lower()
+    return any(h in name for h in BOLD_HINTS)
+
+
+def _page_lines(page) -> List[Dict]:
+    """
+    Groups pdfplumber words (already in reading order) into lines
+    carrying font size, boldness and indentation.
+    """
+    words = page.extract_words(
+        x_tolerance=2,
+        y_tolerance=2,
+        extra_attrs=["size", "fontname"]
+    )
+
+    lines = []
+    for w in words:
+        if lines and abs(w["top"] - lines[-1]["top"]) <= LINE_TOLERANCE:
+            lines[-1]["words"].append(w)
+        else:
+            lines.append({"top": w["top"], "words": [w]})
+
+    return [
+        {
+            "text": " ".join(w["text"] for w in line["words"]),
+            "size": max(w["size"] for w in line["words"]),
+            "bold": all(_is_bold(w["fontname"]) for w in line["words"]),
+            "x0": line["words"][0]["x0"],
+        }
+        for line in lines
+    ]
+
+
+def _body_size(lines: List[Dict]) -> float:
+    """Font size covering the most characters = body text."""
+    chars_by_size = {}
+    for line in lines:
+        size = round(line["size"], 1)
+        chars_by_size[size] = chars_by_size.get(size, 0) + len(line["text"])
+    return max(chars_by_size, key=chars_by_size.get)
+
+
+def find_headings(lines: List[Dict]) -> Tuple[str, List[int]]:
+    """
+    Page text plus the line numbers (in that text) of heading lines,
+    which the clause segmenter uses as explicit boundaries.
+    """
+    if not lines:
+        return "", []
+
+    body_size = _body_size(lines)
+    left_margin = min(line["x0"] for line in lines)
+
+    # Bold only counts as a heading signal when body text is not bold
+    body_chars = [line for line in lines if round(line["size"], 1) == body_size]
+    bold_share = sum(line["bold"] for line in body_chars) / max(len(body_chars), 1)
+    bold_is_signal = bold_share < 0.5
+
+    out, headings = [], []
+    for line in lines:
+        text = line["text"].strip()
+        words = text.split()
+
+        heading = (
+            3 <= len(text)
+            and len(words) <= MAX_HEADING_WORDS
+            and any(c.isalpha() for c in text)
+            and (
+                line["size"] >= body_size * HEADING_SIZE_RATIO
+                or (
+                    bold_is_signal
+                    and line["bold"]
+                    and line["x0"] <= left_margin + INDENT_TOLERANCE
                 )
-                if text:
-                    extracted_text += text + "\n"
+            )
+        )
+
+        if heading:
+            out.append("")
+            headings.append(len(out))
+        out.append(text)
+
+    return "\n".join(out), headings
+
+
+def read_pdf_structured(file) -> Tuple[str, List[int]]:
+    with pdfplumber.open(file) as pdf:
+        lines = []
+        for page in pdf.pages:
+            lines.extend(_page_lines(page))
+            page.flush_cache()
+
+    return find_headings(lines)
+
+
+def read_pdf_layout(file) -> str:
+    extracted_text = ""
+    with pdfplumber.open(file) as pdf:
+        for page in pdf.pages:
+            text = page.extract_text(
+                layout=True,
+                x_tolerance=2,
+                y_tolerance=2
+            )
+            if text:
+                extracted_text += text + "\n"
+    return extracted_text
+
+
+def _pdfium_page_text(page) -> str:
+    textpage = page.get_textpage()
+    try:
+        return textpage.get_text_range().replace("\r\n", "\n")
+    finally:
+        textpage.close()
+        page.close()
+
+
+def read_pdf_text(data: bytes) -> str:
+    """Plain text of every page via pdfium; no layout information."""
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(data)
+        try:
+            return "\n".join(_pdfium_page_text(pdf[i]) for i in range(len(pdf)))
+        finally:
+            pdf.close()
+
+
+def looks_like_heading(line: str) -> bool:
+    """Short Title Case / UPPER CASE line without sentence punctuation."""
+    text = line.strip()
+    words = text.split()
+    return (
+        3 <= len(text)
+        and len(words) <= MAX_HEADING_WORDS
+        and text[0].isupper()
+        and not any(c in text for c in SENTENCE_PUNCTUATION)
+        and all(w[0].isupper() for w in words if len(w) > 3)
+    )
+
+
+def needs_layout(text: str) -> bool:
+    """
+    True when plain text leaves the clause segmenter without numbered
+    headings but has heading-like lines, so a structured read can find
+    the headings from font metrics. Text with neither is kept as is.
+    """
+    found = 0
+    for _ in NUMBERED_HEADING_LINE.finditer(text):
+        found += 1
+        if found >= MIN_NUMBERED_HEADINGS:
+            return False
+
+    candidates = 0
+    for line in text.splitlines():
+        if looks_like_heading(line):
+            candidates += 1
+            if candidates >= MIN_HEADING_LINES:
+                return True
+    return False
+
+
+def read_pdf(file, mode: str = PDF_READER_MODE) -> Tuple[str, List[int]]:
+    """
+    (text, heading line numbers); only "structured" reads find headings.
+    """
+    try:
+        data = file.read()
+
+        extracted_text, headings = "", []
+        if mode in ("auto", "text") and pdfium is not None:
+            try:
+                extracted_text = read_pdf_text(data)
+            except pdfium.PdfiumError:
+                extracted_text = ""  # let pdfplumber have a go
+
+            if mode == "auto" and needs_layout(extracted_text):
+                extracted_text = ""
+
+        if not extracted_text.strip():
+            if mode == "layout":
+                extracted_text = read_pdf_layout(io.BytesIO(data))
+            else:
+                extracted_text, headings = read_pdf_structured(io.BytesIO(data))
 
         if not extracted_text.strip():
             raise ValueError
 
-        return extracted_text
+        return extracted_text, headings
+
+    except Exception:
+        raise ValueError(
+            "PDF is scanned or protected. Only text-based PDFs are supported."
+        )
+
+
+def read_pdf_pages(file, max_pages: int) -> str:
+    """
+    Plain text (no layout or heading analysis) of the first pages plus
+    evenly spaced later ones. Used for quick screening. pdfplumber reads
+    the same pages when pdfium is missing, fails or finds no text.
+    """
+    def pick(total: int) -> List[int]:
+        if total <= max_pages:
+            return list(range(total))
+        head = (max_pages + 1) // 2
+        rest = max_pages - head
+        step = (total - head) / max(rest, 1)
+        return list(range(head)) + [head + int(i * step) for i in range(rest)]
+
+    try:
+        data = file.read()
+
+        text = ""
+        if pdfium is not None:
+            try:
+                with _pdfium_lock:
+                    pdf = pdfium.PdfDocument(data)
+                    try:
+                        text = "\n".join(_pdfium_page_text(pdf[i]) for i in pick(len(pdf)))
+                    finally:
+                        pdf.close()
+            except pdfium.PdfiumError:
+                text = ""  # let pdfplumber have a go
+
+        if not text.strip():
+            with pdfplumber.open(io.BytesIO(data)) as pdf:
+                text = "\n".join(
+                    pdf.pages[i].extract_text() or "" for i in pick(len(pdf.pages))
+                )
+
+        if not text.strip():
+            raise ValueError
+
+        return text
 
     except Exception:
         raise ValueError(
@@ -45,12 +309,18 @@ def read_pdf(file):
 
 
 def normalize_text(text: str) -> str:
+    # Keeps one output line per input line (heading line numbers stay valid)
     lines = [line.rstrip() for line in text.splitlines()]
     return "\n".join(lines)
 
 
-def extract_text(uploaded_file):
+def read_document(uploaded_file) -> Tuple[str, List[int]]:
+    """
+    Text of an upload plus the line numbers of headings found from the
+    PDF layout (empty for other formats).
+    """
     filename = uploaded_file.name.lower()
+    headings = []
 
     if filename.endswith(".txt"):
         raw_text = read_txt(uploaded_file)
@@ -59,11 +329,25 @@ def extract_text(uploaded_file):
         raw_text = read_docx(uploaded_file)
 
     elif filename.endswith(".pdf"):
-        raw_text = read_pdf(uploaded_file)
+        raw_text, headings = read_pdf(uploaded_file)
 
     else:
         raise ValueError(
             "Unsupported file format. Please upload PDF, DOCX, or TXT."
         )
 
-    return normalize_text(raw_text)
+    return normalize_text(raw_text), headings
+
+
+def extract_text(uploaded_file):
+    return read_document(uploaded_file)[0]
+
+
+def extract_text_sample(uploaded_file, max_pdf_pages: int = 6):
+    """
+    Like extract_text, but PDFs are only partially read (read_pdf_pages).
+    """
+    if uploaded_file.name.lower().endswith(".pdf"):
+        return normalize_text(read_pdf_pages(uploaded_file, max_pdf_pages))
+
+    return extract_text(uploaded_file)
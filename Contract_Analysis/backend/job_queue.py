@@ -0,0 +1,292 @@
+# backend/job_queue.py
+# Background analysis jobs: a pool of warm worker processes that the
+# Streamlit script submits to and polls, so the UI thread never blocks.
+# Workers stream partial results per pipeline stage, so a running job's
+# "result" fills in progressively.
+
+import atexit
+import multiprocessing as mp
+import os
+import sys
+import threading
+import time
+import types
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from multiprocessing.connection import wait
+from typing import Dict, Optional
+
+# Configurable via environment (e.g. ANALYSIS_MAX_WORKERS=4)
+MAX_CONCURRENCY = int(os.environ.get("ANALYSIS_MAX_WORKERS", "2"))
+POLL_INTERVAL = 0.2
+
+# Finished jobs nobody collected (closed tab, abandoned session) are
+# dropped after this many seconds, result and all
+RESULT_TTL = float(os.environ.get("ANALYSIS_RESULT_TTL_S", "3600"))
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Worker -> queue message carrying one stage's partial result
+PARTIAL = "partial"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+# -------------------------------------------------
+# WORKER PROCESS
+# -------------------------------------------------
+
+def _worker_main(conn) -> None:
+    """
+    Long-lived worker: imports the pipeline (spaCy etc.) once,
+    then runs one job at a time until told to stop.
+    """
+    from backend.pipeline import iter_analysis
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+
+        if message is None:
+            return
+
+        job_id, filename, data = message
+        try:
+            for stage, partial in iter_analysis(filename, data):
+                conn.send((job_id, PARTIAL, (stage, partial)))
+            conn.send((job_id, DONE, None))
+        except Exception as e:
+            conn.send((job_id, FAILED, str(e) or e.__class__.__name__))
+
+
+_spawn_lock = threading.Lock()
+
+
+@contextmanager
+def _without_script_main():
+    """
+    Streamlit executes the page as sys.modules["__main__"], and spawn
+    re-imports __main__ in every child, i.e. would re-run app.py in each
+    worker. Workers only need this module, so hide the script meanwhile.
+    """
+    with _spawn_lock:
+        main = sys.modules.get("__main__")
+        sys.modules["__main__"] = types.ModuleType("__main__")
+        try:
+            yield
+        finally:
+            sys.modules["__main__"] = main
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn,), daemon=True
+        )
+        with _without_script_main():
+            self.process.start()
+        child_conn.close()
+        self.job_id: Optional[str] = None
+
+    def kill(self) -> None:
+        self.process.terminate()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+# -------------------------------------------------
+# JOB QUEUE
+# -------------------------------------------------
+
+class JobQueue:
+    """
+    submit() returns a job id immediately; status() is cheap and
+    safe to call on every Streamlit rerun. Finished jobs are kept until
+    forget() or RESULT_TTL, after which status() raises KeyError.
+    """
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY):
+        self.max_concurrency = max(1, max_concurrency)
+        self._ctx = mp.get_context("spawn")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict] = {}
+        self._pending = deque()
+        self._workers = [_Worker(self._ctx) for _ in range(self.max_concurrency)]
+        self._closed = False
+
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_loop, name="job-dispatcher", daemon=True
+        )
+        self._dispatcher.start()
+        atexit.register(self.shutdown)
+
+    # ---------------- PUBLIC API ----------------
+
+    def submit(self, filename: str, data: bytes) -> str:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "filename": filename,
+                "status": PENDING,
+                "submitted_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "stage": None,
+                "error": None,
+                "_data": data,
+            }
+            self._pending.append(job_id)
+        return job_id
+
+    def status(self, job_id: str) -> Dict:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise KeyError(f"Unknown job: {job_id}")
+            info = {k: v for k, v in job.items() if not k.startswith("_")}
+            if job["result"] is not None:
+                # Snapshot: later partials must not change what is being rendered
+                info["result"] = dict(job["result"])
+            if job["status"] == PENDING:
+                info["queue_position"] = list(self._pending).index(job_id) + 1
+            return info
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Pending jobs are dropped from the queue; running jobs have
+        their worker terminated and replaced with a fresh one.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] in FINISHED_STATES:
+                return False
+
+            if job["status"] == PENDING:
+                self._pending.remove(job_id)
+            else:
+                for i, worker in enumerate(self._workers):
+                    if worker.job_id == job_id:
+                        worker.kill()
+                        self._workers[i] = _Worker(self._ctx)
+                        break
+
+            self._finish(job, CANCELLED)
+            return True
+
+    def forget(self, job_id: str) -> None:
+        """Drops a finished job (and its result) from memory."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job and job["status"] in FINISHED_STATES:
+                del self._jobs[job_id]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "pending": len(self._pending),
+                "running": sum(1 for w in self._workers if w.job_id),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for worker in self._workers:
+                worker.kill()
+
+    # ---------------- INTERNALS ----------------
+
+    def _finish(self, job: Dict, status: str, payload=None) -> None:
+        job["status"] = status
+        job["finished_at"] = time.time()
+        job["_data"] = None
+        if status == FAILED:
+            job["error"] = payload
+
+    def _evict_expired(self) -> None:
+        cutoff = time.time() - RESULT_TTL
+        with self._lock:
+            for job_id, job in list(self._jobs.items()):
+                if job["status"] in FINISHED_STATES and job["finished_at"] < cutoff:
+                    del self._jobs[job_id]
+
+    def _dispatch_loop(self) -> None:
+        while not self._closed:
+            self._evict_expired()
+            self._start_pending()
+
+            with self._lock:
+                busy = {w.conn: w for w in self._workers if w.job_id}
+
+            if not busy:
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            try:
+                ready = wait(list(busy), timeout=POLL_INTERVAL)
+            except (OSError, ValueError):
+                # A connection was closed by cancel(); re-read the pool
+                continue
+
+            for conn in ready:
+                self._collect(busy[conn])
+
+    def _start_pending(self) -> None:
+        with self._lock:
+            for i, worker in enumerate(self._workers):
+                if not self._pending:
+                    return
+                if worker.job_id:
+                    continue
+
+                job = self._jobs[self._pending.popleft()]
+                job["status"] = RUNNING
+                job["started_at"] = time.time()
+                try:
+                    worker.conn.send((job["job_id"], job["filename"], job["_data"]))
+                    worker.job_id = job["job_id"]
+                except OSError:
+                    # Worker died before taking the job: fail it, replace worker
+                    self._finish(job, FAILED, "Worker process exited unexpectedly")
+                    worker.kill()
+                    self._workers[i] = _Worker(self._ctx)
+
+    def _collect(self, worker: _Worker) -> None:
+        with self._lock:
+            if worker not in self._workers or not worker.job_id:
+                return  # replaced by cancel() in the meantime
+
+            try:
+                job_id, status, payload = worker.conn.recv()
+            except (EOFError, OSError):
+                # Worker died (e.g. OOM-killed): fail the job, replace worker
+                job_id, status, payload = worker.job_id, FAILED, "Worker process exited unexpectedly"
+                index = self._workers.index(worker)
+                worker.kill()
+                self._workers[index] = _Worker(self._ctx)
+
+            job = self._jobs.get(job_id)
+
+            if status == PARTIAL:
+                stage, partial = payload
+                if job and job["status"] == RUNNING:
+                    job["result"] = job["result"] or {}
+                    job["result"].update(partial)
+                    job["stage"] = stage
+                return  # worker is still busy with this job
+
+            worker.job_id = None
+            if job and job["status"] == RUNNING:
+                self._finish(job, status, payload)
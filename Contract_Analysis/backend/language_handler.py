@@ -1,63 +1,160 @@
 # backend/language_handler.py
 
+import re
+from typing import Dict, List
+
 from langdetect import detect, DetectorFactory
-import argostranslate.translate
+
+from backend.translation_service import TranslationUnavailable, translate_batch
 
 DetectorFactory.seed = 0
 
+# -------------------------------------------------
+# SCRIPT DETECTION (Unicode ranges)
+# -------------------------------------------------
+
+# Devanagari + Devanagari Extended
+DEVANAGARI_RE = re.compile(r"[\u0900-\u097F\uA8E0-\uA8FF]+")
+LATIN_RE = re.compile(r"[A-Za-z]+")
+
+# A line is routed to translation when most of its letters are Devanagari
+DEVANAGARI_LINE_RATIO = 0.5
+
+# Document-level langdetect runs on a bounded sample, not the whole text
+SAMPLE_SEGMENTS = 24
+SAMPLE_SEGMENT_CHARS = 300
+
+
+def line_script(line: str) -> str:
+    """
+    Returns "devanagari", "latin" or "other" for one line.
+    """
+    devanagari = sum(map(len, DEVANAGARI_RE.findall(line)))
+    if not devanagari:
+        return "latin" if LATIN_RE.search(line) else "other"
+
+    latin = sum(map(len, LATIN_RE.findall(line)))
+    if devanagari / (devanagari + latin) >= DEVANAGARI_LINE_RATIO:
+        return "devanagari"
+    return "latin"
+
+
+def sample_text(text: str, segments: int = SAMPLE_SEGMENTS,
+                segment_chars: int = SAMPLE_SEGMENT_CHARS) -> str:
+    """
+    Evenly spaced slices across the document, so detection cost
+    stays flat no matter how long the contract is.
+    """
+    if len(text) <= segments * segment_chars:
+        return text
+
+    step = len(text) // segments
+    return "\n".join(
+        text[i * step: i * step + segment_chars] for i in range(segments)
+    )
+
 
 def detect_language(text: str) -> str:
     try:
-        return detect(text)
+        return detect(sample_text(text))
     except Exception:
         return "unknown"
 
 
+# -------------------------------------------------
+# TRANSLATION
+# -------------------------------------------------
+
+def translate_lines(lines: List[str]) -> List[str]:
+    """
+    Offline Hindi → English translation, one output line per input line.
+    All lines go to the shared translation service as one batch.
+    """
+    if not lines:
+        return []
+    return translate_batch(lines)
+
+
 def translate_hindi_to_english(text: str) -> str:
     """
     Offline Hindi → English translation
     Preserves line structure
     """
-    translated_lines = []
+    return "\n".join(translate_lines(text.splitlines()))
 
-    for line in text.splitlines():
-        if line.strip():
-            translated = argostranslate.translate.translate(
-                line, "hi", "en"
-            )
-            translated_lines.append(translated)
-        else:
-            translated_lines.append("")
 
-    return "\n".join(translated_lines)
+# -------------------------------------------------
+# ENTRY POINT
+# -------------------------------------------------
 
+def normalize_language(contract_text: str) -> Dict:
+    lines = contract_text.splitlines()
 
-def normalize_language(contract_text: str) -> dict:
-    detected_lang = detect_language(contract_text)
+    # Single pass: classify every line by script
+    hindi_rows = []
+    latin_lines = 0
+    for i, line in enumerate(lines):
+        script = line_script(line)
+        if script == "devanagari":
+            hindi_rows.append(i)
+        elif script == "latin":
+            latin_lines += 1
+
+    script_stats = {
+        "devanagari_lines": len(hindi_rows),
+        "latin_lines": latin_lines,
+    }
+
+    if hindi_rows:
+        mixed = latin_lines > 0
+
+        try:
+            translated = translate_lines([lines[i] for i in hindi_rows])
+        except TranslationUnavailable as e:
+            # Analyse what is readable rather than failing the document
+            return {
+                "original_text": contract_text,
+                "language": "mixed" if mixed else "hi",
+                "normalized_english_text": contract_text,
+                "script_stats": script_stats,
+                "untranslated_lines": len(hindi_rows),
+                "note": (
+                    f"{len(hindi_rows)} Hindi line(s) kept untranslated "
+                    f"(translation unavailable: {e})"
+                )
+            }
+
+        for i, english in zip(hindi_rows, translated):
+            lines[i] = english
 
-    if detected_lang == "en":
         return {
             "original_text": contract_text,
-            "language": "en",
-            "normalized_english_text": contract_text,
-            "note": "Original document is already in English"
+            "language": "mixed" if mixed else "hi",
+            "normalized_english_text": "\n".join(lines),
+            "script_stats": script_stats,
+            "note": (
+                f"Translated {len(hindi_rows)} Hindi line(s) to English (offline); "
+                "English lines kept as-is"
+                if mixed else
+                "Translated from Hindi to English (offline)"
+            )
         }
 
-    if detected_lang == "hi":
-        translated_text = translate_hindi_to_english(contract_text)
+    detected_lang = detect_language(contract_text)
 
+    if detected_lang == "en":
         return {
             "original_text": contract_text,
-            "language": "hi",
-            "normalized_english_text": translated_text,
-            "note": "Translated from Hindi to English (offline)"
+            "language": "en",
+            "normalized_english_text": contract_text,
+            "script_stats": script_stats,
+            "note": "Original document is already in English"
         }
 
     return {
         "original_text": contract_text,
         "language": detected_lang,
         "normalized_english_text": contract_text,
+        "script_stats": script_stats,
         "note": "Language detected but translation not applied"
     }
-
-
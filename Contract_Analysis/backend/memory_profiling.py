@@ -0,0 +1,296 @@
+# backend/memory_profiling.py
+# Opt-in per-stage memory profiling (tracemalloc) and memory budgets.
+#
+#   CONTRACT_MEMORY_PROFILE=1          record peaks + top allocations per stage
+#   CONTRACT_MEMORY_BUDGET_MB=512      refuse / degrade documents above budget
+#   CONTRACT_MEMORY_BUDGET_MODE=refuse (default: degrade)
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILE_DIR = os.path.join(BASE_DIR, "exports", "profiles")
+RATIOS_FILE = os.path.join(PROFILE_DIR, "peak_ratios.json")
+
+ENABLED = os.environ.get("CONTRACT_MEMORY_PROFILE", "0") == "1"
+TOP_N = int(os.environ.get("CONTRACT_MEMORY_TOP_N", "10"))
+BUDGET_MB = float(os.environ.get("CONTRACT_MEMORY_BUDGET_MB", "0"))  # 0 = unlimited
+BUDGET_MODE = os.environ.get("CONTRACT_MEMORY_BUDGET_MODE", "degrade")
+
+MB = 1024 * 1024
+
+# Peak bytes allocated per unit of input, per stage. "file_reader" is per
+# uploaded byte, every other stage per character of extracted text.
+# Seeded from profiling the sample contracts; profiling runs raise these
+# (never lower them) in RATIOS_FILE as larger documents are observed.
+DEFAULT_PEAK_RATIOS = {
+    "file_reader": 40.0,
+    "language_handler": 8.0,
+    "contract_classifier": 4.0,
+    "clause_extractor": 16.0,
+    "risk_analyzer": 12.0,
+    "explainer": 10.0,
+    "ner_extractor": 120.0,   # with spaCy
+    "ner_regex_only": 12.0,   # degraded: regex scanner only
+    "summary_generator": 8.0,
+    "report_generator": 6.0,
+}
+
+# Only documents at least this long update the learned ratios; below it
+# one-off costs (model loading, imports) dominate and skew the estimate
+LEARN_MIN_CHARS = 200_000
+
+# Stages that run on the extracted text inside the pipeline
+TEXT_STAGES = (
+    "language_handler", "contract_classifier", "clause_extractor",
+    "risk_analyzer", "explainer", "ner_extractor", "summary_generator",
+)
+
+_ratio_lock = threading.Lock()
+
+# tracemalloc is process-wide and slows every allocation while on: it is
+# started for the first live profiler and stopped after the last one
+# (unless something else had started it)
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_started = False
+
+os.makedirs(PROFILE_DIR, exist_ok=True)
+
+
+class MemoryBudgetExceeded(ValueError):
+    """Raised when a document cannot be processed within the budget."""
+
+
+# -------------------------------------------------
+# PEAK RATIOS
+# -------------------------------------------------
+
+def load_ratios() -> Dict[str, float]:
+    ratios = dict(DEFAULT_PEAK_RATIOS)
+    try:
+        with open(RATIOS_FILE, encoding="utf-8") as f:
+            ratios.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+    return ratios
+
+
+def _raise_ratios(observed: Dict[str, float]) -> None:
+    with _ratio_lock:
+        ratios = load_ratios()
+        changed = False
+        for stage, ratio in observed.items():
+            if ratio > ratios.get(stage, 0.0):
+                ratios[stage] = round(ratio, 2)
+                changed = True
+
+        if changed:
+            tmp_path = RATIOS_FILE + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(ratios, f, indent=2)
+            os.replace(tmp_path, RATIOS_FILE)
+
+
+# -------------------------------------------------
+# BUDGET PLANNING
+# -------------------------------------------------
+
+def check_input_budget(input_bytes: int, budget_mb: float = BUDGET_MB) -> None:
+    """
+    Before reading: parsing cannot be degraded, so an oversized
+    upload is refused outright.
+    """
+    if not budget_mb:
+        return
+
+    estimate = load_ratios()["file_reader"] * input_bytes / MB
+    if estimate > budget_mb:
+        raise MemoryBudgetExceeded(
+            f"Document would need ~{estimate:.0f} MB to read "
+            f"(budget {budget_mb:.0f} MB)."
+        )
+
+
+def plan_text_budget(
+    text_chars: int,
+    budget_mb: float = BUDGET_MB,
+    mode: str = BUDGET_MODE
+) -> Optional[Dict]:
+    """
+    After reading: returns None when the full pipeline fits, otherwise a
+    degradation plan {"use_spacy", "max_chars", "reason"} (or raises in
+    refuse mode).
+    """
+    if not budget_mb:
+        return None
+
+    ratios = load_ratios()
+    budget = budget_mb * MB
+
+    def peak(stages) -> float:
+        return max(ratios[s] for s in stages) * text_chars
+
+    if peak(TEXT_STAGES) <= budget:
+        return None
+
+    if mode == "refuse":
+        raise MemoryBudgetExceeded(
+            f"Analysis would need ~{peak(TEXT_STAGES) / MB:.0f} MB "
+            f"(budget {budget_mb:.0f} MB)."
+        )
+
+    # Degrade step 1: regex-only NER (spaCy dominates peak memory)
+    light = tuple(s for s in TEXT_STAGES if s != "ner_extractor") + ("ner_regex_only",)
+    if peak(light) <= budget:
+        return {
+            "use_spacy": False,
+            "max_chars": text_chars,
+            "reason": "spaCy NER skipped to stay within the memory budget",
+        }
+
+    # Degrade step 2: also analyze only the prefix that fits
+    max_chars = int(budget / max(ratios[s] for s in light))
+    return {
+        "use_spacy": False,
+        "max_chars": max_chars,
+        "reason": (
+            f"Only the first {max_chars:,} of {text_chars:,} characters were "
+            "analyzed, without spaCy NER, to stay within the memory budget"
+        ),
+    }
+
+
+# -------------------------------------------------
+# PER-STAGE PROFILER
+# -------------------------------------------------
+
+def _acquire_tracing() -> None:
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_users += 1
+
+
+def _release_tracing() -> None:
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+
+
+class StageProfiler:
+    """
+    with profiler.stage("clause_extractor"): ...
+    No-op unless profiling is enabled. Tracing stays on from creation
+    until close() (called by write()) or until the profiler is dropped.
+    """
+
+    def __init__(self, document_id: str, filename: str, input_bytes: int,
+                 enabled: bool = ENABLED):
+        self.document_id = document_id
+        self.filename = filename
+        self.input_bytes = input_bytes
+        self.text_chars = 0
+        self.enabled = enabled
+        self.stages: Dict[str, Dict] = {}
+
+        if enabled:
+            _acquire_tracing()
+            self._release = weakref.finalize(self, _release_tracing)
+        else:
+            self._release = None
+
+    def close(self) -> None:
+        """Stops profiling; tracing ends once no profiler needs it."""
+        if self._release:
+            self._release()
+        self.enabled = False
+
+    @contextmanager
+    def stage(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        before = tracemalloc.take_snapshot()
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            # A stage abandoned after its budget can finish after the
+            # profiler was closed (and tracing stopped, or restarted by
+            # another document's profiler): its numbers are not recorded
+            if self.enabled and tracemalloc.is_tracing():
+                elapsed = time.perf_counter() - started
+                current, peak = tracemalloc.get_traced_memory()
+                top = tracemalloc.take_snapshot().compare_to(before, "lineno")[:TOP_N]
+
+                self.stages[name] = {
+                    "peak_mb": round((peak - base) / MB, 3),
+                    "retained_mb": round((current - base) / MB, 3),
+                    "seconds": round(elapsed, 3),
+                    "top_allocations": [str(stat) for stat in top],
+                }
+
+    def observed_ratios(self) -> Dict[str, float]:
+        ratios = {}
+        if self.text_chars < LEARN_MIN_CHARS:
+            return ratios
+
+        for name, info in self.stages.items():
+            units = self.input_bytes if name == "file_reader" else self.text_chars
+            if units:
+                ratios[name] = info["peak_mb"] * MB / units
+        return ratios
+
+    def path(self) -> str:
+        return os.path.join(PROFILE_DIR, f"profile_{self.document_id[:16]}.json")
+
+    def write(self) -> Optional[str]:
+        """
+        Merges this run's stages into the document's profile file
+        (the UI adds report_generator after the pipeline has finished)
+        and closes the profiler.
+        """
+        enabled = self.enabled
+        self.close()
+        if not enabled or not self.stages:
+            return None
+
+        path = self.path()
+        try:
+            with open(path, encoding="utf-8") as f:
+                profile = json.load(f)
+        except (OSError, ValueError):
+            profile = {"document_id": self.document_id, "stages": {}}
+
+        profile["filename"] = self.filename
+        profile["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        if self.input_bytes:
+            profile["input_bytes"] = self.input_bytes
+        if self.text_chars:
+            profile["text_chars"] = self.text_chars
+        profile["stages"].update(self.stages)
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+
+        _raise_ratios(self.observed_ratios())
+        return path
+
+    def summary(self) -> Dict[str, float]:
+        return {name: info["peak_mb"] for name, info in self.stages.items()}
@@ -2,6 +2,7 @@
 # Cloud-safe Legal NER (spaCy optional, regex primary)
 
 import re
+from bisect import bisect_left, bisect_right
 from typing import Dict, List
 
 # -------------------------------------------------
@@ -9,8 +10,8 @@ from typing import Dict, List
 # -------------------------------------------------
 
 DATE_REGEX = r"\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b"
-MONEY_REGEX = r"(₹|\$|rs\.?)\s?\d+(?:,\d+)*(?:\.\d+)?"
-PERCENT_REGEX = r"\b\d{1,3}%\b"
+MONEY_REGEX = r"(?:₹|\$|\brs\b\.?)\s?\d+(?:,\d+)*(?:\.\d+)?"
+PERCENT_REGEX = r"\b\d{1,3}(?:\.\d+)?\s?%"
 
 ORG_HINTS = [
     "pvt", "private limited", "ltd", "limited",
@@ -25,6 +26,46 @@ JURISDICTION_HINTS = [
     "mumbai", "delhi"
 ]
 
+# Up to six capitalised words on one line ending in an organisation
+# hint, e.g. "ABC Technologies Pvt. Ltd." or "The Company". Word length
+# is bounded so a long unbroken run of capitals stays linear.
+ORG_NAME_REGEX = (
+    r"(?:[A-Z][\w&.,'\-]{0,40}[^\S\n]+){1,6}?"
+    r"(?:(?i:" + "|".join(re.escape(h) for h in sorted(ORG_HINTS, key=len, reverse=True)) + r"))\b\.?"
+    r"(?:[^\S\n]+(?i:pvt|private|ltd|limited)\b\.?)*"
+)
+
+# One scanner, one walk over the text. Alternatives are tried left to
+# right at each position, so more specific patterns come first.
+ENTITY_SCANNER = re.compile(
+    "|".join([
+        rf"(?P<Dates>{DATE_REGEX})",
+        rf"(?P<Money>(?i:{MONEY_REGEX}))",
+        rf"(?P<Percentages>{PERCENT_REGEX})",
+        rf"(?P<Parties>{ORG_NAME_REGEX})",
+    ])
+)
+
+# Jurisdictions get their own walk: they often sit inside another entity
+# ("Chennai Technologies Pvt Ltd"), which one alternation would swallow.
+# Adjectival forms count too: "Indian Partnership Act" -> India.
+JURISDICTION_SCANNER = re.compile(
+    r"\b(?i:("
+    + "|".join(re.escape(h) for h in JURISDICTION_HINTS)
+    + r"))(?i:n|ns|al)?\b"
+)
+
+ENTITY_LABELS = ["Parties", "Dates", "Money", "Percentages", "Jurisdiction"]
+
+MAX_PARTY_LENGTH = 120
+
+SPACY_LABELS = {
+    "ORG": "Parties",
+    "GPE": "Jurisdiction",
+    "DATE": "Dates",
+    "MONEY": "Money",
+}
+
 # -------------------------------------------------
 # OPTIONAL spaCy (ONLY IF AVAILABLE)
 # -------------------------------------------------
@@ -39,57 +80,89 @@ def load_spacy():
 nlp = load_spacy()
 
 # -------------------------------------------------
-# MAIN ENTITY EXTRACTION
+# SPAN SCANNER
 # -------------------------------------------------
 
-def extract_entities(text: str) -> Dict[str, List[str]]:
-    entities = {
-        "Parties": set(),
-        "Dates": set(),
-        "Money": set(),
-        "Percentages": set(),
-        "Jurisdiction": set(),
-    }
+def scan_entities(text: str, use_spacy: bool = True) -> List[Dict]:
+    """
+    Returns typed entity spans sorted by offset:
+    {"label", "text", "start", "end", "source"}
+    """
+    spans = []
+
+    for m in ENTITY_SCANNER.finditer(text):
+        label = m.lastgroup
+        value = m.group().strip(" ,")
+
+        if label == "Parties" and len(value) >= MAX_PARTY_LENGTH:
+            continue
+
+        spans.append({
+            "label": label,
+            "text": value,
+            "start": m.start(),
+            "end": m.end(),
+            "source": "regex",
+        })
+
+    for m in JURISDICTION_SCANNER.finditer(text):
+        spans.append({
+            "label": "Jurisdiction",
+            "text": m.group(1).title(),
+            "start": m.start(),
+            "end": m.end(),
+            "source": "regex",
+        })
 
-    lower = text.lower()
-
-    # -------- REGEX BASED (ALWAYS WORKS) --------
+    # -------- spaCy (ENHANCEMENT ONLY) --------
 
-    for d in re.findall(DATE_REGEX, text):
-        entities["Dates"].add(d)
+    if use_spacy and nlp:
+        doc = nlp(text)
+        for ent in doc.ents:
+            label = SPACY_LABELS.get(ent.label_)
+            if label:
+                spans.append({
+                    "label": label,
+                    "text": ent.text,
+                    "start": ent.start_char,
+                    "end": ent.end_char,
+                    "source": "spacy",
+                })
+
+    spans.sort(key=lambda s: s["start"])
+    return spans
+
+
+def group_entities(spans: List[Dict]) -> Dict[str, List[str]]:
+    entities = {label: set() for label in ENTITY_LABELS}
+    for span in spans:
+        entities[span["label"]].add(span["text"])
+    return {k: sorted(v) for k, v in entities.items()}
 
-    for m in re.findall(MONEY_REGEX, text, flags=re.IGNORECASE):
-        entities["Money"].add(m)
 
-    for p in re.findall(PERCENT_REGEX, text):
-        entities["Percentages"].add(p)
+def attach_entities(clauses: List[Dict], spans: List[Dict]) -> List[Dict]:
+    """
+    Adds "entities" to every clause that has start/end offsets into the
+    same text the spans were scanned from. O((clauses + spans) log spans).
+    """
+    starts = [s["start"] for s in spans]
 
-    for j in JURISDICTION_HINTS:
-        if j in lower:
-            entities["Jurisdiction"].add(j.title())
+    for clause in clauses:
+        if "start" not in clause:
+            clause["entities"] = []
+            continue
 
-    # -------- HEURISTIC PARTY DETECTION --------
+        lo = bisect_left(starts, clause["start"])
+        hi = bisect_right(starts, clause["end"])
+        clause["entities"] = [
+            s for s in spans[lo:hi] if s["end"] <= clause["end"]
+        ]
 
-    lines = text.splitlines()
-    for line in lines:
-        l = line.lower()
-        if any(h in l for h in ORG_HINTS):
-            clean = line.strip()
-            if len(clean) < 120:
-                entities["Parties"].add(clean)
+    return clauses
 
-    # -------- spaCy (ENHANCEMENT ONLY) --------
-
-    if nlp:
-        doc = nlp(text)
-        for ent in doc.ents:
-            if ent.label_ == "ORG":
-                entities["Parties"].add(ent.text)
-            elif ent.label_ == "GPE":
-                entities["Jurisdiction"].add(ent.text)
-            elif ent.label_ == "DATE":
-                entities["Dates"].add(ent.text)
-            elif ent.label_ == "MONEY":
-                entities["Money"].add(ent.text)
+# -------------------------------------------------
+# MAIN ENTITY EXTRACTION
+# -------------------------------------------------
 
-    return {k: sorted(v) for k, v in entities.items()}
+def extract_entities(text: str) -> Dict[str, List[str]]:
+    return group_entities(scan_entities(text))
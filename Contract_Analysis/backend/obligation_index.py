@@ -0,0 +1,249 @@
+# backend/obligation_index.py
+# Structured obligation records (party, action, due date / notice period,
+# source clause) and a date-sorted on-disk index across all contracts.
+
+import os
+import re
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INDEX_DIR = os.path.join(BASE_DIR, "indexes")
+INDEX_PATH = os.path.join(INDEX_DIR, "obligations.sqlite3")
+
+os.makedirs(INDEX_DIR, exist_ok=True)
+
+# ==========================================================
+# PATTERNS
+# ==========================================================
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.;])\s+")
+
+MODAL_REGEX = re.compile(
+    r"\b(?P<modal>shall not|must not|shall|must|will|agrees to|undertakes to|"
+    r"is required to|is obligated to|may)\b\s+(?P<action>[^.;]{3,160})"
+)
+
+# Last 1-4 capitalised words before the modal verb, e.g. "The Vendor", "Either party"
+PARTY_REGEX = re.compile(r"((?:[A-Z][\w&'\-]*\s+){0,3}[A-Z][\w&'\-]*|[Ee]ither party|[Bb]oth parties)\s*$")
+
+# PARTY_REGEX is anchored at the end, so it only needs to see the text
+# just before the modal (searching a whole run-on sentence is quadratic)
+PARTY_WINDOW = 120
+WHITESPACE = re.compile(r"\s")
+
+MONTHS = (
+    "january|february|march|april|may|june|july|august|"
+    "september|october|november|december|"
+    "jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec"
+)
+
+DATE_PATTERNS = [
+    # 31/12/2026, 31-12-26
+    (re.compile(r"\b(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})\b"), "dmy_numeric"),
+    # 31st December 2026, 1 Jan, 2027
+    (re.compile(rf"\b(\d{{1,2}})(?:st|nd|rd|th)?\s+({MONTHS})\.?,?\s+(\d{{4}})\b", re.IGNORECASE), "dmy_text"),
+    # December 31, 2026
+    (re.compile(rf"\b({MONTHS})\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s+(\d{{4}})\b", re.IGNORECASE), "mdy_text"),
+]
+
+WORD_NUMBERS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "ten": 10, "fifteen": 15, "thirty": 30, "forty-five": 45,
+    "sixty": 60, "ninety": 90,
+}
+
+NOTICE_REGEX = re.compile(
+    r"\b(?P<n>\d{1,3}|" + "|".join(WORD_NUMBERS) + r")\s*(?:\(\d{1,3}\)\s*)?"
+    r"(?P<unit>days?|weeks?|months?)['’]?\s+(?:prior\s+|advance\s+)?(?:written\s+)?notice",
+    re.IGNORECASE
+)
+
+UNIT_DAYS = {"day": 1, "week": 7, "month": 30}
+
+KIND_HINTS = [
+    ("renewal", ("renew", "renewal", "expiry", "expire", "extension")),
+    ("termination", ("terminat",)),
+    ("payment", ("pay", "invoice", "rent", "fee")),
+]
+
+# ==========================================================
+# NORMALIZATION
+# ==========================================================
+
+def _year(value: str) -> int:
+    y = int(value)
+    return y + 2000 if y < 100 else y
+
+
+def _month(name: str) -> int:
+    return datetime.strptime(name[:3].title(), "%b").month
+
+
+def parse_dates(text: str) -> List[date]:
+    found = []
+    for pattern, kind in DATE_PATTERNS:
+        for m in pattern.finditer(text):
+            try:
+                if kind == "dmy_numeric":
+                    # Indian contracts are day-first
+                    found.append(date(_year(m.group(3)), int(m.group(2)), int(m.group(1))))
+                elif kind == "dmy_text":
+                    found.append(date(int(m.group(3)), _month(m.group(2)), int(m.group(1))))
+                else:
+                    found.append(date(int(m.group(3)), _month(m.group(1)), int(m.group(2))))
+            except ValueError:
+                continue
+    return sorted(found)
+
+
+def parse_notice_days(text: str) -> Optional[int]:
+    m = NOTICE_REGEX.search(text)
+    if not m:
+        return None
+
+    n = m.group("n").lower()
+    count = int(n) if n.isdigit() else WORD_NUMBERS[n]
+    unit = m.group("unit").lower().rstrip("s")
+    return count * UNIT_DAYS[unit]
+
+
+def classify_kind(sentence: str, notice_days: Optional[int]) -> str:
+    lower = sentence.lower()
+    for kind, hints in KIND_HINTS:
+        if any(h in lower for h in hints):
+            return kind
+    return "notice" if notice_days else "obligation"
+
+# ==========================================================
+# EXTRACTION
+# ==========================================================
+
+def party_window(sentence: str, end: int) -> str:
+    """
+    Up to PARTY_WINDOW characters before `end`, starting on a word
+    boundary so a name cut by the window is not matched half-way.
+    """
+    start = max(0, end - PARTY_WINDOW)
+    if start and not sentence[start - 1].isspace():
+        space = WHITESPACE.search(sentence, start, end)
+        start = space.end() if space else end
+    return sentence[start:end].rstrip()
+
+
+def extract_obligations(analyzed_clauses: List[Dict]) -> List[Dict]:
+    """
+    One record per obligation-bearing sentence that names a date or
+    a notice period. due_date is the last day to act (ISO), if known.
+    """
+    records = []
+
+    for clause in analyzed_clauses:
+        for sentence in SENTENCE_SPLIT.split(clause["text"]):
+            dates = parse_dates(sentence)
+            notice_days = parse_notice_days(sentence)
+            if not dates and notice_days is None:
+                continue
+
+            modal = MODAL_REGEX.search(sentence)
+            if not modal:
+                continue
+
+            party_match = PARTY_REGEX.search(party_window(sentence, modal.start()))
+            due = None
+            if dates:
+                # Notice must be served notice_days before the date it refers to
+                due = dates[-1] - timedelta(days=notice_days or 0)
+
+            records.append({
+                "party": party_match.group(1).strip() if party_match else "Unspecified",
+                "action": f"{modal.group('modal').lower()} {modal.group('action').strip()}",
+                "kind": classify_kind(sentence, notice_days),
+                "due_date": due.isoformat() if due else None,
+                "notice_days": notice_days,
+                "source_clause": clause.get("title", "Clause"),
+                "sentence": sentence.strip()[:500],
+            })
+
+    return records
+
+# ==========================================================
+# ON-DISK INDEX (SQLite B-tree on due_date)
+# ==========================================================
+
+_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(INDEX_PATH, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS obligations (
+            document_id   TEXT NOT NULL,
+            filename      TEXT NOT NULL,
+            contract_type TEXT,
+            party         TEXT,
+            action        TEXT,
+            kind          TEXT,
+            due_date      TEXT,
+            notice_days   INTEGER,
+            source_clause TEXT,
+            sentence      TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_obligations_due
+            ON obligations (due_date, kind);
+        CREATE INDEX IF NOT EXISTS idx_obligations_document
+            ON obligations (document_id);
+    """)
+    return conn
+
+
+def index_contract(
+    document_id: str,
+    filename: str,
+    contract_type: str,
+    obligations: List[Dict]
+) -> None:
+    """
+    Replaces the records of one document (idempotent on re-analysis).
+    """
+    rows = [
+        (
+            document_id, filename, contract_type,
+            o["party"], o["action"], o["kind"], o["due_date"],
+            o["notice_days"], o["source_clause"], o["sentence"],
+        )
+        for o in obligations
+    ]
+
+    with _lock, closing(_connect()) as conn, conn:
+        conn.execute("DELETE FROM obligations WHERE document_id = ?", (document_id,))
+        conn.executemany(
+            "INSERT INTO obligations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+
+
+def upcoming_deadlines(
+    days: int = 30,
+    kinds: Optional[List[str]] = None,
+    today: Optional[date] = None
+) -> List[Dict]:
+    """
+    Range scan over the due_date index, e.g. every renewal or notice
+    deadline in the next 30 days across all contracts.
+    """
+    start = today or date.today()
+    end = start + timedelta(days=days)
+
+    sql = "SELECT * FROM obligations WHERE due_date BETWEEN ? AND ?"
+    params = [start.isoformat(), end.isoformat()]
+    if kinds:
+        sql += f" AND kind IN ({', '.join('?' for _ in kinds)})"
+        params += kinds
+    sql += " ORDER BY due_date"
+
+    with closing(_connect()) as conn:
+        return [dict(row) for row in conn.execute(sql, params)]
@@ -0,0 +1,248 @@
+# backend/pipeline.py
+# End-to-end analysis pipeline shared by the UI and background workers
+
+import hashlib
+import io
+import time
+from typing import Dict, Iterator, Tuple
+
+from backend.file_reader import read_document
+from backend.language_handler import normalize_language
+from backend.contract_classifier import classify_contract
+from backend.clause_extractor import extract_clauses, normalize_with_headings, single_clause
+from backend.clause_tagger import GENERAL_TYPE
+from backend.clause_record import to_records
+from backend.risk_analyzer import analyze_contract_clauses, rule_pack_for
+from backend.explainer import explain_contract_clauses
+from backend.summary_generator import generate_executive_summary
+from backend.ner_extractor import scan_entities, group_entities, attach_entities
+from backend.obligation_index import extract_obligations
+from backend.memory_profiling import StageProfiler, check_input_budget, plan_text_budget
+from backend.text_archive import lookup_text, store_text
+from backend.stage_graph import run_stages, critical_path, timed_out
+
+
+def as_upload(filename: str, data: bytes) -> io.BytesIO:
+    """
+    Wrap raw bytes so file_reader sees the same interface
+    as a Streamlit UploadedFile (.name + .read()).
+    """
+    buffer = io.BytesIO(data)
+    buffer.name = filename
+    return buffer
+
+
+def document_id(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+# Partial results, in the order iter_analysis yields them
+STAGES = ("overview", "clauses", "entities")
+
+
+def _extract_records(document: str, headings):
+    return to_records(document, extract_clauses(document, normalized=True, headings=headings))
+
+
+def _single_record(document: str, headings):
+    clauses = single_clause(document)
+    clauses[0]["clause_type"] = GENERAL_TYPE
+    return to_records(document, clauses)
+
+
+# Everything after text extraction, as a dependency graph: classification,
+# clause extraction and the NER scan only need the text and run side by
+# side; the clause chain (risk -> explanations / summary / obligations)
+# follows extraction and classification, which picks the contract-type
+# rule pack. Names match the memory profiler's stage names.
+#
+# "fallback" gives a stage a time budget (see backend.stage_graph) and
+# the cheap output used when it runs out; "note" is shown to the user.
+# Risk analysis and explanations annotate the clause records in place,
+# so they cannot be abandoned half-way and have no fallback.
+ANALYSIS_STAGES = (
+    {"name": "contract_classifier", "inputs": ("text_en",),
+     "output": "classification", "run": classify_contract,
+     "fallback": lambda text_en: {"contract_type": "General / Unknown Contract", "confidence": 0.0},
+     "note": "contract type not determined"},
+    {"name": "clause_extractor", "inputs": ("document", "headings"),
+     "output": "clauses", "run": _extract_records,
+     "fallback": _single_record,
+     "note": "document analysed as a single \"Agreement\" clause"},
+    {"name": "ner_extractor", "inputs": ("document", "use_spacy"),
+     "output": "spans", "run": scan_entities,
+     "fallback": lambda document, use_spacy: [],
+     "note": "entities skipped"},
+    {"name": "risk_analyzer", "inputs": ("clauses", "classification"),
+     "output": "analysis",
+     "run": lambda clauses, classification: analyze_contract_clauses(
+         clauses, rule_pack_for(classification))},
+    {"name": "explainer", "inputs": ("analysis",),
+     "output": "explained",
+     "run": lambda analysis: explain_contract_clauses(analysis["clauses"], analysis["rule_pack"])},
+    {"name": "summary_generator", "inputs": ("classification", "analysis"),
+     "output": "summary", "run": generate_executive_summary,
+     "fallback": lambda classification, analysis: generate_executive_summary(
+         classification, analysis, extractive=False),
+     "note": "summary without key provisions"},
+    {"name": "obligation_index", "inputs": ("analysis",),
+     "output": "obligations", "run": lambda analysis: extract_obligations(analysis["clauses"]),
+     "fallback": lambda analysis: [],
+     "note": "obligations skipped"},
+)
+STAGE_NOTES = {s["name"]: s["note"] for s in ANALYSIS_STAGES if "note" in s}
+
+CLAUSE_OUTPUTS = ("explained", "summary", "obligations")
+
+
+def iter_analysis(filename: str, data: bytes) -> Iterator[Tuple[str, Dict]]:
+    """
+    Runs every analysis stage for one document, yielding (stage, partial)
+    as soon as each group of results is ready:
+
+    overview  classification, language, document metadata
+    clauses   clause risk, explanations, summary, obligations
+    entities  entities (also attached to the clauses), memory peaks,
+              stage timings and the critical path
+
+    "degraded" (in every partial, latest wins) explains why the result
+    is partial: memory budget, or stages that ran out of time.
+
+    Merging the partials in order gives the full result. Partials are
+    plain dicts/lists and picklable ClauseRecords, so they can cross
+    process boundaries (the document text is pickled once per partial).
+    """
+    started = time.perf_counter()
+    doc_id = document_id(data)
+    profiler = StageProfiler(doc_id, filename, len(data))
+
+    # Seen before: reuse the extracted, translated text
+    with profiler.stage("text_archive"):
+        archived = lookup_text(doc_id)
+
+    from_archive = bool(archived) and not plan_text_budget(archived["text_chars"])
+    if from_archive:
+        degraded = None
+        text_chars = archived["text_chars"]
+        lang_info = archived
+        text_en = archived["text"]
+        heading_lines = archived["heading_lines"]
+    else:
+        check_input_budget(len(data))
+
+        with profiler.stage("file_reader"):
+            raw_text, heading_lines = read_document(as_upload(filename, data))
+
+        # Refuse, or degrade (no spaCy / prefix only), above the memory budget
+        degraded = plan_text_budget(len(raw_text))
+        if degraded:
+            raw_text = raw_text[:degraded["max_chars"]]
+            line_count = raw_text.count("\n") + 1
+            heading_lines = [i for i in heading_lines if i < line_count]
+        text_chars = len(raw_text)
+
+        with profiler.stage("language_handler"):
+            lang_info = normalize_language(raw_text)
+            text_en = lang_info["normalized_english_text"]
+
+        # Truncated texts depend on the budget, and untranslated ones on
+        # the model being installed, so only complete ones are kept
+        if not degraded and not lang_info.get("untranslated_lines"):
+            store_text(
+                doc_id, text_en, text_chars, lang_info["language"], lang_info["note"], heading_lines
+            )
+
+    profiler.text_chars = text_chars
+
+    # Clause offsets, heading spans and entity spans all refer to this
+    # one buffer (translation keeps lines, so heading line numbers hold)
+    document, headings = normalize_with_headings(text_en, heading_lines)
+    ingest_seconds = time.perf_counter() - started
+
+    values = {
+        "text_en": text_en, "document": document, "headings": headings,
+        "use_spacy": not degraded,
+    }
+    timings = {}
+    sent = set()
+
+    def degraded_reason():
+        reasons = [degraded["reason"]] if degraded else []
+        notes = [STAGE_NOTES[name] for name in timed_out(timings)]
+        if notes:
+            reasons.append(f"Time budget exceeded: {'; '.join(notes)}.")
+        return " ".join(reasons) or None
+
+    for _ in run_stages(ANALYSIS_STAGES, values, timings, profiler):
+        if "overview" not in sent and "classification" in values:
+            sent.add("overview")
+            yield "overview", {
+                "document_id": doc_id,
+                "filename": filename,
+                "language": lang_info["language"],
+                "language_note": lang_info["note"],
+                "text_chars": text_chars,
+                "classification": values["classification"],
+                "degraded": degraded_reason(),
+                "from_archive": from_archive,
+            }
+
+        if "clauses" not in sent and "overview" in sent and all(k in values for k in CLAUSE_OUTPUTS):
+            sent.add("clauses")
+            yield "clauses", {
+                "analysis": values["analysis"],
+                "explained": values["explained"],
+                "summary": values["summary"],
+                "obligations": values["obligations"],
+                "degraded": degraded_reason(),
+            }
+
+    # Only once no stage is touching the clauses any more
+    analysis = values["analysis"]
+    attach_entities(analysis["clauses"], values["spans"])
+
+    profiler.write()
+
+    # Clauses are re-sent so the receiver gets their attached entities
+    yield "entities", {
+        "analysis": analysis,
+        "explained": values["explained"],
+        "entities": group_entities(values["spans"]),
+        "memory_peaks_mb": profiler.summary(),
+        "degraded": degraded_reason(),
+        "timings": {
+            "ingest_seconds": round(ingest_seconds, 4),
+            **critical_path(ANALYSIS_STAGES, timings),
+        },
+    }
+
+
+def run_analysis(filename: str, data: bytes) -> Dict:
+    """
+    Runs every analysis stage for one document and returns the full result.
+    """
+    result = {}
+    for _, partial in iter_analysis(filename, data):
+        result.update(partial)
+    return result
+
+
+def run_api_analysis(filename: str, data: bytes) -> Dict:
+    """
+    JSON-ready subset used by the HTTP API: classification,
+    contract-level risk and per-clause analysis.
+    """
+    result = run_analysis(filename, data)
+
+    return {
+        "filename": filename,
+        "language": result["language"],
+        "classification": result["classification"],
+        "risk": result["analysis"]["contract_risk"],
+        "clauses": [dict(c) for c in result["explained"]],
+        "entities": result["entities"],
+        "obligations": result["obligations"],
+        "summary": result["summary"],
+        "degraded": result["degraded"],
+        "timings": result["timings"],
+    }
@@ -0,0 +1,205 @@
+# backend/portfolio_stats.py
+# Materialized portfolio risk aggregates.
+# Updated incrementally on every completed analysis, so the dashboard
+# never has to rescan audit history.
+#
+# The cells live in SQLite: analyses finish in several processes at once
+# (API pool, JobQueue and batch workers), and each update is one atomic
+# upsert instead of a read-modify-write of a shared file.
+
+import glob
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from backend.audit_logger import AUDIT_DIR
+
+STATS_DB = os.path.join(AUDIT_DIR, "portfolio_stats.sqlite3")
+
+# Written by earlier versions; imported into a new database, then renamed
+LEGACY_STATS_FILE = os.path.join(AUDIT_DIR, "portfolio_stats.json")
+
+# cell key = "<YYYY-MM>|<contract_type>|<overall_risk>"
+KEY_SEP = "|"
+
+_lock = threading.Lock()
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS portfolio_cells (
+        month         TEXT NOT NULL,
+        contract_type TEXT NOT NULL,
+        overall_risk  TEXT NOT NULL,
+        count         INTEGER NOT NULL,
+        score_sum     REAL NOT NULL,
+        PRIMARY KEY (month, contract_type, overall_risk)
+    )
+"""
+
+UPSERT_CELL = """
+    INSERT INTO portfolio_cells (month, contract_type, overall_risk, count, score_sum)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (month, contract_type, overall_risk) DO UPDATE SET
+        count = count + excluded.count,
+        score_sum = score_sum + excluded.score_sum
+"""
+
+
+def _empty() -> Dict:
+    return {
+        "cells": {},
+        "by_contract_type": {},
+        "by_overall_risk": {},
+        "by_month": {},
+        "total": {"count": 0, "score_sum": 0.0},
+    }
+
+
+def _add(bucket: Dict, count: int, score_sum: float) -> None:
+    bucket["count"] += count
+    bucket["score_sum"] += score_sum
+
+
+def _import_legacy(conn: sqlite3.Connection) -> bool:
+    try:
+        with open(LEGACY_STATS_FILE, encoding="utf-8") as f:
+            cells = json.load(f)["cells"]
+    except (OSError, ValueError, KeyError):
+        return False
+
+    conn.executemany(UPSERT_CELL, [
+        (*key.split(KEY_SEP), bucket["count"], bucket["score_sum"])
+        for key, bucket in cells.items()
+    ])
+    return True
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(STATS_DB, timeout=30)
+    with conn:
+        conn.execute(CREATE_TABLE)
+
+    if os.path.exists(LEGACY_STATS_FILE):
+        # Under the write lock, so exactly one process imports the file
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if os.path.exists(LEGACY_STATS_FILE) and _import_legacy(conn):
+                os.replace(LEGACY_STATS_FILE, LEGACY_STATS_FILE + ".imported")
+    return conn
+
+
+# -------------------------------------------------
+# READ
+# -------------------------------------------------
+
+def load_stats() -> Dict:
+    """
+    Returns the aggregates, rolled up from the materialized cells
+    (one row per month × contract type × overall risk).
+    """
+    with _lock, closing(_connect()) as conn:
+        rows = conn.execute(
+            "SELECT month, contract_type, overall_risk, count, score_sum FROM portfolio_cells"
+        ).fetchall()
+
+    stats = _empty()
+    blank = {"count": 0, "score_sum": 0.0}
+    for month, contract_type, overall_risk, count, score_sum in rows:
+        key = KEY_SEP.join((month, contract_type, overall_risk))
+        stats["cells"][key] = {"count": count, "score_sum": score_sum}
+        _add(stats["by_contract_type"].setdefault(contract_type, dict(blank)), count, score_sum)
+        _add(stats["by_overall_risk"].setdefault(overall_risk, dict(blank)), count, score_sum)
+        _add(stats["by_month"].setdefault(month, dict(blank)), count, score_sum)
+        _add(stats["total"], count, score_sum)
+
+    return stats
+
+
+def average(bucket: Dict) -> float:
+    return round(bucket["score_sum"] / bucket["count"], 2) if bucket["count"] else 0.0
+
+
+def query(
+    months: Optional[Iterable[str]] = None,
+    contract_type: Optional[str] = None,
+    overall_risk: Optional[str] = None
+) -> Dict:
+    """
+    e.g. query(["2026-07", "2026-08", "2026-09"], "Vendor / Service Agreement", "High Risk")
+    Touches only the materialized cells, never the audit files.
+    """
+    stats = load_stats()
+    wanted_months = set(months) if months is not None else None
+
+    result = {"count": 0, "score_sum": 0.0}
+    for key, bucket in stats["cells"].items():
+        month, ctype, risk = key.split(KEY_SEP)
+        if wanted_months is not None and month not in wanted_months:
+            continue
+        if contract_type and ctype != contract_type:
+            continue
+        if overall_risk and risk != overall_risk:
+            continue
+        result["count"] += bucket["count"]
+        result["score_sum"] += bucket["score_sum"]
+
+    result["average_score"] = average(result)
+    return result
+
+
+# -------------------------------------------------
+# WRITE
+# -------------------------------------------------
+
+def record_analysis(
+    contract_type: str,
+    risk_summary: Dict,
+    timestamp: Optional[datetime] = None
+) -> None:
+    """
+    O(1) incremental update for one completed analysis; safe to call
+    from any number of processes at once.
+    """
+    month = (timestamp or datetime.now()).strftime("%Y-%m")
+
+    with _lock, closing(_connect()) as conn, conn:
+        conn.execute(UPSERT_CELL, (
+            month,
+            contract_type,
+            risk_summary["overall_risk"],
+            1,
+            float(risk_summary["average_score"]),
+        ))
+
+
+def rebuild_from_audit_logs() -> Dict:
+    """
+    One-off backfill from existing audit_*.json files.
+    """
+    rows = []
+    for path in sorted(glob.glob(os.path.join(AUDIT_DIR, "audit_*.json"))):
+        with open(path, encoding="utf-8") as f:
+            record = json.load(f)
+
+        risk = record["risk_summary"]
+        rows.append((
+            record["timestamp"][:7],
+            record["contract_type"],
+            risk["overall_risk"],
+            1,
+            float(risk["average_score"]),
+        ))
+
+    with _lock, closing(_connect()) as conn, conn:
+        conn.execute("DELETE FROM portfolio_cells")
+        conn.executemany(UPSERT_CELL, rows)
+
+    return load_stats()
+
+
+if __name__ == "__main__":
+    totals = rebuild_from_audit_logs()["total"]
+    print(f"Rebuilt portfolio stats from {totals['count']} audit records")
@@ -5,7 +5,26 @@ GEN-AI powered renegotiation suggestion engine
 Uses LLM ONLY for reasoning & drafting safer alternatives
 """
 
-from typing import Dict
+import hashlib
+import json
+import os
+import threading
+import urllib.request
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Bump when the prompt / drafting rules change so cached answers are not reused
+PROMPT_VERSION = "renegotiate-v1"
+
+# rules | local-server
+BACKEND = os.environ.get("RENEGOTIATION_BACKEND", "rules")
+SERVER_URL = os.environ.get(
+    "RENEGOTIATION_URL", "http://127.0.0.1:8765/v1/renegotiate"
+)
+MAX_IN_FLIGHT = int(os.environ.get("RENEGOTIATION_MAX_IN_FLIGHT", "2"))
+REQUEST_TIMEOUT = 120
+CACHE_SIZE = 2048
 
 RISKY_PATTERNS = {
     "unilateral_termination": [
@@ -108,3 +127,146 @@ def suggest_renegotiations(clause: Dict) -> str:
         "The clause should clearly define responsibilities, timelines, and "
         "limitations to reduce ambiguity."
     )
+
+
+# ==========================================================
+# PLUGGABLE BACKENDS
+# ==========================================================
+
+class RenegotiationBackend(ABC):
+    """
+    A backend receives every clause that needs a suggestion in one
+    batch and yields (clause_id, suggestion) pairs as they are ready.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def suggest_batch(self, batch: List[Dict]) -> Iterator[Tuple[int, str]]:
+        ...
+
+
+class RuleBackend(RenegotiationBackend):
+    """Offline fallback: the rule-guided drafts above."""
+
+    name = "rules"
+
+    def suggest_batch(self, batch: List[Dict]) -> Iterator[Tuple[int, str]]:
+        for item in batch:
+            yield item["id"], suggest_renegotiations(item)
+
+
+class LocalServerBackend(RenegotiationBackend):
+    """
+    Talks to a local LLM server (see renegotiation_server.py for the
+    stand-in). The whole batch goes out as one request and the server
+    streams back one JSON object per line.
+    """
+
+    name = "local-server"
+
+    def __init__(self, url: str = SERVER_URL, max_in_flight: int = MAX_IN_FLIGHT):
+        self.url = url
+        self.in_flight = threading.BoundedSemaphore(max(1, max_in_flight))
+
+    def suggest_batch(self, batch: List[Dict]) -> Iterator[Tuple[int, str]]:
+        payload = json.dumps({
+            "prompt_version": PROMPT_VERSION,
+            "clauses": batch,
+        }).encode("utf-8")
+
+        request = urllib.request.Request(
+            self.url,
+            data=payload,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+
+        with self.in_flight:
+            with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+                for line in response:
+                    if line.strip():
+                        item = json.loads(line)
+                        yield item["id"], item["suggestion"]
+
+
+BACKENDS = {"rules": RuleBackend, "local-server": LocalServerBackend}
+
+# One instance per backend name for the whole process, so every session
+# shares LocalServerBackend's in-flight limit
+_backends: Dict[str, RenegotiationBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name: str = BACKEND) -> RenegotiationBackend:
+    """Unknown names fall back to the rule backend."""
+    name = name if name in BACKENDS else "rules"
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = BACKENDS[name]()
+        return _backends[name]
+
+
+# ==========================================================
+# PROMPT CACHE
+# ==========================================================
+
+_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def cache_key(text: str, backend_name: str) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{backend_name}:{PROMPT_VERSION}:{digest}"
+
+
+def _cache_get(key: str) -> Optional[str]:
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    return None
+
+
+def _cache_put(key: str, suggestion: str) -> None:
+    with _cache_lock:
+        _cache[key] = suggestion
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+# ==========================================================
+# ENTRY POINT
+# ==========================================================
+
+def stream_renegotiations(
+    clauses: List[Dict],
+    backend: Optional[RenegotiationBackend] = None
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yields (clause_index, suggestion) for every High risk clause.
+    Cached suggestions come first; the rest are sent as one batch.
+    """
+    backend = backend or get_backend()
+
+    batch = []
+    keys = {}
+    for i, clause in enumerate(clauses):
+        if clause.get("risk_level") != "High":
+            continue
+
+        key = cache_key(clause["text"], backend.name)
+        cached = _cache_get(key)
+        if cached is not None:
+            yield i, cached
+        else:
+            keys[i] = key
+            batch.append({"id": i, "title": clause.get("title", ""), "text": clause["text"]})
+
+    if not batch:
+        return
+
+    for i, suggestion in backend.suggest_batch(batch):
+        _cache_put(keys[i], suggestion)
+        yield i, suggestion
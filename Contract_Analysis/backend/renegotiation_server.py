@@ -0,0 +1,65 @@
+# backend/renegotiation_server.py
+# Local stand-in for an LLM renegotiation server.
+# Speaks the same batched, line-streamed protocol a real model server
+# would, but drafts suggestions with the rule engine.
+#
+#   python -m backend.renegotiation_server --port 8765 --latency 0.3
+#   RENEGOTIATION_BACKEND=local-server streamlit run app.py
+
+import argparse
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from backend.renegotiation_engine import PROMPT_VERSION, suggest_renegotiations
+
+
+class RenegotiationHandler(BaseHTTPRequestHandler):
+    # Seconds per clause, to mimic model generation time
+    latency = 0.0
+
+    def do_POST(self):
+        if self.path != "/v1/renegotiate":
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+
+        if request.get("prompt_version") != PROMPT_VERSION:
+            self.send_error(409, "Prompt version mismatch")
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+
+        # One JSON object per line, flushed as each suggestion is drafted
+        for clause in request.get("clauses", []):
+            time.sleep(self.latency)
+            line = json.dumps({
+                "id": clause["id"],
+                "suggestion": suggest_renegotiations(clause),
+            })
+            self.wfile.write(line.encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stand-in LLM renegotiation server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    RenegotiationHandler.latency = args.latency
+    server = ThreadingHTTPServer((args.host, args.port), RenegotiationHandler)
+    print(f"Renegotiation stand-in server on http://{args.host}:{args.port}/v1/renegotiate")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,10 @@
-import os
-from datetime import datetime
 from typing import Dict, List
 
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import inch
 
-# ✅ Absolute-safe export directory
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-EXPORT_DIR = os.path.join(BASE_DIR, "exports", "reports")
-
-os.makedirs(EXPORT_DIR, exist_ok=True)
+from backend.report_store import get_or_create, report_key
 
 
 def generate_pdf_report(
@@ -21,11 +15,27 @@ def generate_pdf_report(
 ) -> str:
     """
     Generates a PDF report and RETURNS the file path.
+    Identical analyses reuse the stored report.
     """
 
-    pdf_filename = f"Contract_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    pdf_path = os.path.join(EXPORT_DIR, pdf_filename)
+    key = report_key(filename, classification, contract_risk, explained_clauses)
+
+    return get_or_create(
+        key,
+        lambda pdf_path: render_pdf_report(
+            pdf_path, filename, classification, contract_risk, explained_clauses
+        ),
+        filename,
+    )
 
+
+def render_pdf_report(
+    pdf_path: str,
+    filename: str,
+    classification: Dict,
+    contract_risk: Dict,
+    explained_clauses: List[Dict]
+) -> None:
     c = canvas.Canvas(pdf_path, pagesize=A4)
     width, height = A4
     y = height - 1 * inch
@@ -74,4 +84,3 @@ def generate_pdf_report(
         y -= 12
 
     c.save()
-    return pdf_path
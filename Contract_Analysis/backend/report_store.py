@@ -0,0 +1,237 @@
+# backend/report_store.py
+# Content-addressed PDF report store.
+# Reports are keyed by a hash of everything that goes into them, so an
+# identical analysis reuses the stored PDF instead of writing a new file.
+# A disk quota (LRU eviction) and an age limit keep exports/reports bounded.
+# PDFs in exports/reports that the index does not know (reports written
+# before the store existed, including the samples kept in git) are
+# adopted with their file time and count towards the quota. They are
+# never expired by age, only evicted (oldest first) when over quota.
+#
+#   REPORT_STORE_QUOTA_MB=200       total size of stored reports
+#   REPORT_RETENTION_DAYS=30        reports older than this are removed
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_DIR = os.path.join(BASE_DIR, "exports", "reports")
+INDEX_FILE = os.path.join(REPORT_DIR, "report_index.json")
+
+QUOTA_MB = float(os.environ.get("REPORT_STORE_QUOTA_MB", "200"))
+RETENTION_DAYS = float(os.environ.get("REPORT_RETENTION_DAYS", "30"))
+
+# Bump when the report layout changes so old PDFs are not reused
+REPORT_VERSION = "report-v1"
+
+# Clause fields that appear in the PDF
+REPORT_CLAUSE_FIELDS = (
+    "title", "risk_level", "obligation_type", "text",
+    "plain_english_explanation", "suggested_alternatives",
+)
+
+MB = 1024 * 1024
+DAY = 24 * 60 * 60
+
+_lock = threading.Lock()
+
+os.makedirs(REPORT_DIR, exist_ok=True)
+
+
+def _empty() -> Dict:
+    return {
+        "reports": {},
+        "stats": {"hits": 0, "misses": 0, "evictions": 0, "expired": 0},
+    }
+
+
+def _load() -> Dict:
+    try:
+        with open(INDEX_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return _empty()
+
+
+def _write(index: Dict) -> None:
+    tmp_path = INDEX_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, INDEX_FILE)
+
+
+def report_path(key: str) -> str:
+    return os.path.join(REPORT_DIR, f"{key}.pdf")
+
+
+def report_key(
+    filename: str,
+    classification: Dict,
+    contract_risk: Dict,
+    explained_clauses: List[Dict]
+) -> str:
+    """
+    sha256 over the report inputs; identical analyses share a key.
+    """
+    payload = {
+        "version": REPORT_VERSION,
+        "filename": filename,
+        "classification": classification,
+        "contract_risk": contract_risk,
+        "clauses": [
+            {field: clause.get(field) for field in REPORT_CLAUSE_FIELDS}
+            for clause in explained_clauses
+        ],
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=list)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+# -------------------------------------------------
+# RETENTION / EVICTION
+# -------------------------------------------------
+
+def _remove(index: Dict, key: str) -> None:
+    index["reports"].pop(key, None)
+    try:
+        os.remove(report_path(key))
+    except OSError:
+        pass
+
+
+def _expired(entry: Dict, now: float) -> bool:
+    if entry.get("legacy"):
+        return False  # left to the quota
+    return bool(RETENTION_DAYS) and now - entry["created"] > RETENTION_DAYS * DAY
+
+
+def _adopt_unindexed(index: Dict) -> None:
+    """
+    Indexes PDFs the store did not write, dated by their mtime.
+    They never match a report key; only the quota removes them.
+    """
+    reports = index["reports"]
+    for name in os.listdir(REPORT_DIR):
+        key, ext = os.path.splitext(name)
+        if ext != ".pdf" or key in reports:
+            continue
+        try:
+            stat = os.stat(os.path.join(REPORT_DIR, name))
+        except OSError:
+            continue
+        reports[key] = {
+            "filename": name,
+            "size": stat.st_size,
+            "created": stat.st_mtime,
+            "last_access": stat.st_mtime,
+            "hits": 0,
+            "legacy": True,
+        }
+
+
+def _enforce_limits(index: Dict, keep: str = None) -> None:
+    """
+    Drops expired reports, then least recently used ones until the
+    store fits the quota. `keep` (the report just served) is never evicted.
+    """
+    _adopt_unindexed(index)
+
+    now = time.time()
+    reports = index["reports"]
+
+    if RETENTION_DAYS:
+        for key in [k for k, r in reports.items() if _expired(r, now)]:
+            if key != keep:
+                _remove(index, key)
+                index["stats"]["expired"] += 1
+
+    quota = QUOTA_MB * MB
+    total = sum(r["size"] for r in reports.values())
+    for key in sorted(reports, key=lambda k: reports[k]["last_access"]):
+        if total <= quota:
+            break
+        if key == keep:
+            continue
+        total -= reports[key]["size"]
+        _remove(index, key)
+        index["stats"]["evictions"] += 1
+
+# -------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------
+
+def get_or_create(key: str, render: Callable[[str], None], filename: str = "") -> str:
+    """
+    Returns the stored PDF for `key`, calling render(path) to write it
+    on a miss. A stored report past retention counts as a miss.
+    """
+    path = report_path(key)
+
+    with _lock:
+        index = _load()
+        entry = index["reports"].get(key)
+
+        if entry and _expired(entry, time.time()):
+            _remove(index, key)
+            index["stats"]["expired"] += 1
+            entry = None
+
+        if entry and os.path.exists(path):
+            entry["last_access"] = time.time()
+            entry["hits"] = entry.get("hits", 0) + 1
+            index["stats"]["hits"] += 1
+            _write(index)
+            return path
+
+        tmp_path = path + ".tmp"
+        render(tmp_path)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        index["reports"][key] = {
+            "filename": filename,
+            "size": os.path.getsize(path),
+            "created": now,
+            "last_access": now,
+            "hits": 0,
+        }
+        index["stats"]["misses"] += 1
+        _enforce_limits(index, keep=key)
+        _write(index)
+
+    return path
+
+
+def sweep() -> Dict:
+    """
+    Applies retention and quota without serving a report.
+    """
+    with _lock:
+        index = _load()
+        _enforce_limits(index)
+        _write(index)
+    return store_stats()
+
+
+def store_stats() -> Dict:
+    index = _load()
+    stats = index["stats"]
+    lookups = stats["hits"] + stats["misses"]
+
+    return {
+        **stats,
+        "reports": len(index["reports"]),
+        "disk_mb": round(sum(r["size"] for r in index["reports"].values()) / MB, 2),
+        "quota_mb": QUOTA_MB,
+        "hit_rate": round(stats["hits"] / lookups, 3) if lookups else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    result = sweep() if "--sweep" in sys.argv else store_stats()
+    print(json.dumps(result, indent=2))
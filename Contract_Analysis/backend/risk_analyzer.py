@@ -3,7 +3,9 @@
 # Production-grade, hackathon-ready, edge-case safe
 
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from backend.clause_record import ClauseRecord
 
 # ==========================================================
 # CONFIGURATION
@@ -76,6 +78,164 @@ CRITICAL_DOMINANT_TERMS = [
     "withhold payment",
 ]
 
+# Contract-type rule packs, keyed by classify_contract's contract_type.
+# The lists above apply to every contract; a pack's patterns are only
+# evaluated for its own type, and only when the classifier is confident
+# (PACK_MIN_CONFIDENCE). Uncertain or unknown types get the common rules.
+RULE_PACKS = {
+    "Lease / Rental Agreement": {
+        "high": [
+            r"evict",
+            r"lock.*forfeit",
+            r"forfeit(ure of)? (the )?(security )?deposit",
+            r"re[-\s]?enter (and|the) ",
+        ],
+        "medium": [
+            r"(rent|rental) (escalation|increase|revision)",
+            r"sub[-\s]?let",
+            r"maintenance charges",
+        ],
+        "low": [
+            r"refundable (security )?deposit",
+            r"normal wear and tear",
+        ],
+    },
+    "Employment Agreement": {
+        "high": [
+            r"non[-\s]?solicit",
+            r"training bond",
+            r"deduct(ed)? from (the |his |her )?(salary|wages)",
+            r"without (any )?notice pay",
+        ],
+        "medium": [
+            r"probation",
+            r"garden leave",
+            r"notice pay",
+            r"overtime",
+        ],
+        "low": [
+            r"gratuity",
+            r"paid leave",
+        ],
+    },
+    "Vendor / Service Agreement": {
+        "high": [
+            r"set[-\s]?off",
+            r"payment.*discretion",
+            r"service credits?",
+        ],
+        "medium": [
+            r"service levels?",
+            r"\bsla\b",
+            r"uptime",
+            r"acceptance criteria",
+            r"audit",
+        ],
+        "low": [
+            r"cure period",
+        ],
+    },
+}
+
+# Below this classifier confidence no pack is used, only the common rules
+PACK_MIN_CONFIDENCE = 0.4
+
+# Column order of the clause × rule hit matrix (see backend/risk_matrix.py).
+# New rules are appended, so stored matrices stay aligned by rule id.
+RULE_IDS = (
+    [f"high:{p}" for p in HIGH_RISK_PATTERNS]
+    + [f"medium:{p}" for p in MEDIUM_RISK_PATTERNS]
+    + [f"low:{p}" for p in LOW_RISK_PATTERNS]
+    + [f"critical:{t}" for t in CRITICAL_DOMINANT_TERMS]
+)
+RULE_IDS += [
+    rule_id
+    for pack in RULE_PACKS.values()
+    for level, patterns in pack.items()
+    for rule_id in (f"{level}:{p}" for p in patterns)
+    if rule_id not in RULE_IDS
+]
+RULE_INDEX = {rule_id: i for i, rule_id in enumerate(RULE_IDS)}
+
+# ==========================================================
+# COMPILED RULES
+# ==========================================================
+
+# "head.*tail" with literal head / tail
+GAP_RULE = re.compile(r"([\w \-]+)\.\*([\w \-]+)")
+
+
+def compile_rule(pattern: str):
+    """
+    Returns search(text) -> bool for one risk pattern.
+
+    A literal "head.*tail" rule is answered with two str.find calls: as a
+    regex, every occurrence of head rescans the rest of the (single-line)
+    clause looking for tail, which is quadratic on long clauses.
+    """
+    gap = GAP_RULE.fullmatch(pattern)
+    if gap:
+        head, tail = gap.groups()
+
+        def search(text: str) -> bool:
+            i = text.find(head)
+            return i >= 0 and text.find(tail, i + len(head)) >= 0
+
+        return search
+
+    regex = re.compile(pattern)
+    return lambda text: regex.search(text) is not None
+
+
+def compile_rules(packs: List[Dict]) -> Dict:
+    """
+    {"high"/"medium"/"low": [(pattern, search), ...]}: the common
+    patterns followed by those of the given packs.
+    """
+    common = {"high": HIGH_RISK_PATTERNS, "medium": MEDIUM_RISK_PATTERNS, "low": LOW_RISK_PATTERNS}
+    rules = {}
+    for level, patterns in common.items():
+        merged = list(patterns)
+        for pack in packs:
+            merged += [p for p in pack.get(level, []) if p not in merged]
+        rules[level] = [(p, compile_rule(p)) for p in merged]
+    return rules
+
+
+# Compiled once per process: common rules only (type unknown, uncertain
+# or without a pack) and one set per pack
+COMMON_RULES = compile_rules([])
+PACK_RULES = {contract_type: compile_rules([pack]) for contract_type, pack in RULE_PACKS.items()}
+
+
+def rules_for(contract_type: Optional[str]) -> Dict:
+    return PACK_RULES.get(contract_type, COMMON_RULES)
+
+
+def evaluated_rule_ids(contract_type: Optional[str]) -> List[str]:
+    """RULE_IDS of every rule a clause is checked against under this pack."""
+    rules = rules_for(contract_type)
+    return (
+        [f"{level}:{p}" for level in ("high", "medium", "low") for p, _ in rules[level]]
+        + [f"critical:{t}" for t in CRITICAL_DOMINANT_TERMS]
+    )
+
+
+def rule_pack_for(classification: Dict) -> Optional[str]:
+    """
+    The contract_type whose rules apply, or None (common rules only)
+    when the classifier is unsure.
+    """
+    if classification.get("confidence", 0.0) < PACK_MIN_CONFIDENCE:
+        return None
+    return classification["contract_type"]
+
+# Contract-level scoring defaults
+SCORE_MAP = {"Low": 1, "Medium": 2, "High": 3}
+HIGH_CLAUSE_THRESHOLD = 3       # High-risk clauses for "High Risk"
+CRITICAL_FLAG_THRESHOLD = 4     # critical term hits for "High Risk"
+MEDIUM_AVERAGE_THRESHOLD = 1.7  # average clause score for "Medium Risk"
+
 # ==========================================================
 # NORMALIZATION
 # ==========================================================
@@ -113,50 +273,66 @@ def classify_obligation_type(text: str) -> str:
 # CLAUSE-LEVEL RISK SCORING
 # ==========================================================
 
-def score_clause_risk(text: str) -> Dict:
+def score_clause_risk(text: str, rules: Optional[Dict] = None) -> Dict:
+    """
+    rules: from rules_for(contract_type); defaults to the common rules.
+    """
     t = normalize_text(text)
+    rules = rules or COMMON_RULES
 
     high_hits = []
     medium_hits = []
     low_hits = []
 
-    for p in HIGH_RISK_PATTERNS:
-        if re.search(p, t):
+    for p, search in rules["high"]:
+        if search(t):
             high_hits.append(p)
 
-    for p in MEDIUM_RISK_PATTERNS:
-        if re.search(p, t):
+    for p, search in rules["medium"]:
+        if search(t):
             medium_hits.append(p)
 
-    for p in LOW_RISK_PATTERNS:
-        if re.search(p, t):
+    for p, search in rules["low"]:
+        if search(t):
             low_hits.append(p)
 
+    # Every rule that fired, for re-scoring without the text
+    rule_hits = (
+        [RULE_INDEX[f"high:{p}"] for p in high_hits]
+        + [RULE_INDEX[f"medium:{p}"] for p in medium_hits]
+        + [RULE_INDEX[f"low:{p}"] for p in low_hits]
+        + [RULE_INDEX[f"critical:{term}"] for term in CRITICAL_DOMINANT_TERMS if term in t]
+    )
+
     if high_hits:
         return {
             "risk_level": "High",
             "reason": "Clause contains potentially one-sided or severe legal terms",
-            "matched_patterns": high_hits
+            "matched_patterns": high_hits,
+            "rule_hits": rule_hits
         }
 
     if medium_hits:
         return {
             "risk_level": "Medium",
             "reason": "Clause requires attention or clarification",
-            "matched_patterns": medium_hits
+            "matched_patterns": medium_hits,
+            "rule_hits": rule_hits
         }
 
     if low_hits:
         return {
             "risk_level": "Low",
             "reason": "Clause appears balanced or mutual",
-            "matched_patterns": low_hits
+            "matched_patterns": low_hits,
+            "rule_hits": rule_hits
         }
 
     return {
         "risk_level": "Low",
         "reason": "No obvious legal risk detected",
-        "matched_patterns": []
+        "matched_patterns": [],
+        "rule_hits": rule_hits
     }
 
 # ==========================================================
@@ -174,14 +350,25 @@ def is_unfavorable(risk_level: str, obligation_type: str) -> bool:
 # SINGLE CLAUSE ANALYSIS
 # ==========================================================
 
-def analyze_clause(clause: Dict) -> Dict:
+def analyze_clause(clause: Dict, rules: Optional[Dict] = None) -> Dict:
     text = clause.get("text", "")
 
     obligation_type = classify_obligation_type(text)
-    risk_info = score_clause_risk(text)
-
-    return {
+    risk_info = score_clause_risk(text, rules)
+
+    # Records are annotated in place; the text stays a span of the document
+    if isinstance(clause, ClauseRecord):
+        return clause.annotate(
+            obligation_type=obligation_type,
+            risk_level=risk_info["risk_level"],
+            risk_reason=risk_info["reason"],
+            unfavorable=is_unfavorable(risk_info["risk_level"], obligation_type),
+            rule_hits=tuple(risk_info["rule_hits"]),
+        )
+
+    analyzed = {
         "title": clause.get("title", "Clause"),
+        "clause_type": clause.get("clause_type", "General"),
         "text": text,
         "obligation_type": obligation_type,
         "risk_level": risk_info["risk_level"],
@@ -189,14 +376,27 @@ def analyze_clause(clause: Dict) -> Dict:
         "unfavorable": is_unfavorable(
             risk_info["risk_level"], obligation_type
         ),
+        "rule_hits": risk_info["rule_hits"],
     }
 
+    # Offsets into the normalized document, when the extractor provided them
+    if "start" in clause:
+        analyzed["start"] = clause["start"]
+        analyzed["end"] = clause["end"]
+
+    return analyzed
+
 # ==========================================================
 # CONTRACT-LEVEL RISK AGGREGATION (CRITICAL PART)
 # ==========================================================
 
-def compute_contract_risk(analyzed_clauses: List[Dict]) -> Dict:
-    score_map = {"Low": 1, "Medium": 2, "High": 3}
+def compute_contract_risk(
+    analyzed_clauses: List[Dict],
+    score_map: Dict[str, float] = SCORE_MAP,
+    high_clause_threshold: int = HIGH_CLAUSE_THRESHOLD,
+    critical_flag_threshold: int = CRITICAL_FLAG_THRESHOLD,
+    medium_average_threshold: float = MEDIUM_AVERAGE_THRESHOLD
+) -> Dict:
 
     total_score = 0
     high_risk_count = 0
@@ -217,9 +417,9 @@ def compute_contract_risk(analyzed_clauses: List[Dict]) -> Dict:
     avg_score = total_score / max(len(analyzed_clauses), 1)
 
     # 🔴 DOMINANT LEGAL RISK OVERRIDE
-    if high_risk_count >= 3 or critical_flag_count >= 4:
+    if high_risk_count >= high_clause_threshold or critical_flag_count >= critical_flag_threshold:
         overall_risk = "High Risk"
-    elif avg_score >= 1.7:
+    elif avg_score >= medium_average_threshold:
         overall_risk = "Medium Risk"
     else:
         overall_risk = "Low Risk"
@@ -236,15 +436,21 @@ def compute_contract_risk(analyzed_clauses: List[Dict]) -> Dict:
 # PHASE-6 ENTRY POINT (CALL THIS FROM fapp.py)
 # ==========================================================
 
-def analyze_contract_clauses(clauses: List[Dict]) -> Dict:
+def analyze_contract_clauses(clauses: List[Dict], contract_type: Optional[str] = None) -> Dict:
+    """
+    contract_type selects the rule pack (see rule_pack_for); None
+    evaluates the common rules only.
+    """
+    rules = rules_for(contract_type)
     analyzed_clauses = []
 
     for clause in clauses:
-        analyzed_clauses.append(analyze_clause(clause))
+        analyzed_clauses.append(analyze_clause(clause, rules))
 
     contract_risk = compute_contract_risk(analyzed_clauses)
 
     return {
         "clauses": analyzed_clauses,
-        "contract_risk": contract_risk
+        "contract_risk": contract_risk,
+        "rule_pack": contract_type,
     }
@@ -0,0 +1,259 @@
+# backend/risk_matrix.py
+# Per-contract sparse clause × rule hit matrices.
+# Re-scoring the whole portfolio under new weights, thresholds or rule
+# tiers is a handful of vectorized operations over the stacked matrices,
+# without re-reading or re-analyzing any contract text.
+#
+# Only rules that were evaluated when a contract was analyzed can be
+# re-scored: each matrix records its rule pack and the rules it was
+# checked against, so a zero column is "no hit" only for those. When its
+# pack now applies a rule it was not checked against (a newly added
+# pattern), the contract needs to be re-run (reported as "stale").
+
+import glob
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+from backend.risk_analyzer import (
+    RULE_IDS,
+    evaluated_rule_ids,
+    SCORE_MAP,
+    HIGH_CLAUSE_THRESHOLD,
+    CRITICAL_FLAG_THRESHOLD,
+    MEDIUM_AVERAGE_THRESHOLD,
+)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MATRIX_DIR = os.path.join(BASE_DIR, "indexes", "risk_matrices")
+
+os.makedirs(MATRIX_DIR, exist_ok=True)
+
+LEVELS = ["Low", "Medium", "High"]
+TIER_LEVELS = {"low": "Low", "medium": "Medium", "high": "High"}
+
+# -------------------------------------------------
+# BUILD / SAVE / LOAD
+# -------------------------------------------------
+
+def build_hit_matrix(analyzed_clauses: List[Dict]) -> sparse.csr_matrix:
+    """
+    (n_clauses × len(RULE_IDS)) boolean CSR matrix from each clause's
+    "rule_hits" column indices.
+    """
+    indptr = [0]
+    indices = []
+    for clause in analyzed_clauses:
+        indices.extend(clause.get("rule_hits", []))
+        indptr.append(len(indices))
+
+    return sparse.csr_matrix(
+        (np.ones(len(indices), dtype=bool), np.array(indices, dtype=np.int32), indptr),
+        shape=(len(analyzed_clauses), len(RULE_IDS)),
+    )
+
+
+def matrix_path(document_id: str) -> str:
+    return os.path.join(MATRIX_DIR, f"{document_id}.npz")
+
+
+def save_hit_matrix(
+    document_id: str,
+    filename: str,
+    contract_type: str,
+    analyzed_clauses: List[Dict],
+    contract_risk: Dict,
+    rule_pack: Optional[str] = None
+) -> str:
+    """
+    Stores the matrix with the rule ids it was built against, the rule
+    pack (analysis["rule_pack"]) and rules it evaluated, and the labels
+    it was scored with (idempotent on re-analysis).
+    """
+    matrix = build_hit_matrix(analyzed_clauses)
+    meta = {
+        "document_id": document_id,
+        "filename": filename,
+        "contract_type": contract_type,
+        "rule_pack": rule_pack,
+        "analyzed_at": datetime.now().isoformat(),
+        "overall_risk": contract_risk["overall_risk"],
+        "average_score": contract_risk["average_score"],
+    }
+
+    path = matrix_path(document_id)
+    tmp_path = path + ".tmp.npz"
+    np.savez_compressed(
+        tmp_path,
+        indices=matrix.indices,
+        indptr=matrix.indptr,
+        shape=np.array(matrix.shape),
+        rule_ids=np.array(RULE_IDS),
+        evaluated=np.array(evaluated_rule_ids(rule_pack)),
+        meta=np.array(json.dumps(meta)),
+    )
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_hit_matrix(path: str) -> Dict:
+    """
+    Returns {"matrix", "meta", "evaluated", "stale"} with columns
+    realigned to the current RULE_IDS by rule id; "evaluated" marks the
+    columns this contract was checked against.
+    """
+    with np.load(path, allow_pickle=False) as npz:
+        stored_ids = [str(r) for r in npz["rule_ids"]]
+        if "evaluated" in npz.files:
+            evaluated = {str(r) for r in npz["evaluated"]}
+        else:
+            evaluated = set(stored_ids)  # saved before rule packs: every rule ran
+        n_rows = int(npz["shape"][0])
+        stored = sparse.csr_matrix(
+            (np.ones(len(npz["indices"]), dtype=bool), npz["indices"], npz["indptr"]),
+            shape=(n_rows, len(stored_ids)),
+        )
+        meta = json.loads(str(npz["meta"]))
+
+    evaluated_columns = np.array([rule_id in evaluated for rule_id in RULE_IDS])
+    stale = any(
+        rule_id not in evaluated for rule_id in evaluated_rule_ids(meta.get("rule_pack"))
+    )
+
+    if stored_ids == RULE_IDS:
+        return {"matrix": stored, "meta": meta, "evaluated": evaluated_columns, "stale": stale}
+
+    # Rules were added, removed or reordered since this contract was analyzed
+    current = {rule_id: i for i, rule_id in enumerate(RULE_IDS)}
+    keep = [i for i, rule_id in enumerate(stored_ids) if rule_id in current]
+    remap = sparse.csr_matrix(
+        (
+            np.ones(len(keep), dtype=bool),
+            (np.arange(len(keep)), [current[stored_ids[i]] for i in keep]),
+        ),
+        shape=(len(keep), len(RULE_IDS)),
+    )
+    matrix = (stored[:, keep] @ remap).astype(bool).tocsr()
+
+    return {"matrix": matrix, "meta": meta, "evaluated": evaluated_columns, "stale": stale}
+
+# -------------------------------------------------
+# VECTORIZED RE-SCORING
+# -------------------------------------------------
+
+def _rule_tiers(tiers: Optional[Dict[str, Optional[str]]]) -> np.ndarray:
+    """
+    Level index per rule column (0 Low, 1 Medium, 2 High, -1 not a
+    level rule). tiers={"high:penalty": "Medium", "low:mutual": None}
+    moves or disables rules.
+    """
+    overrides = tiers or {}
+    out = np.full(len(RULE_IDS), -1, dtype=np.int8)
+
+    for i, rule_id in enumerate(RULE_IDS):
+        kind = rule_id.split(":", 1)[0]
+        level = overrides.get(rule_id, TIER_LEVELS.get(kind))
+        if level is not None and kind in TIER_LEVELS:
+            out[i] = LEVELS.index(level)
+
+    return out
+
+
+def _critical_columns(critical_terms: Optional[List[str]]) -> np.ndarray:
+    return np.array([
+        rule_id.startswith("critical:")
+        and (critical_terms is None or rule_id.split(":", 1)[1] in critical_terms)
+        for rule_id in RULE_IDS
+    ])
+
+
+def rescore_portfolio(
+    score_map: Dict[str, float] = SCORE_MAP,
+    high_clause_threshold: int = HIGH_CLAUSE_THRESHOLD,
+    critical_flag_threshold: int = CRITICAL_FLAG_THRESHOLD,
+    medium_average_threshold: float = MEDIUM_AVERAGE_THRESHOLD,
+    tiers: Optional[Dict[str, Optional[str]]] = None,
+    critical_terms: Optional[List[str]] = None
+) -> List[Dict]:
+    """
+    Same rules as compute_contract_risk, applied to every stored
+    contract at once.
+    """
+    loaded = [load_hit_matrix(p) for p in sorted(glob.glob(os.path.join(MATRIX_DIR, "*.npz")))]
+    if not loaded:
+        return []
+
+    hits = sparse.vstack([entry["matrix"] for entry in loaded], format="csr").astype(np.int8)
+    n_clauses = np.array([entry["matrix"].shape[0] for entry in loaded])
+    owner = np.repeat(np.arange(len(loaded)), n_clauses)
+
+    # Clause level = highest tier among its hits (no hits -> Low)
+    tier = _rule_tiers(tiers)
+    level_hits = hits[:, tier >= 0].multiply(tier[tier >= 0] + 1).tocsr()
+    clause_level = np.asarray(level_hits.max(axis=1).todense()).ravel() - 1
+    clause_level = np.maximum(clause_level, 0)
+
+    level_scores = np.array([score_map[level] for level in LEVELS], dtype=float)
+    clause_score = level_scores[clause_level]
+    clause_critical = np.asarray(hits[:, _critical_columns(critical_terms)].sum(axis=1)).ravel()
+
+    n = len(loaded)
+    total_score = np.bincount(owner, weights=clause_score, minlength=n)
+    high_count = np.bincount(owner, weights=clause_level == 2, minlength=n).astype(int)
+    critical_count = np.bincount(owner, weights=clause_critical, minlength=n).astype(int)
+    avg_score = total_score / np.maximum(n_clauses, 1)
+
+    overall = np.where(
+        (high_count >= high_clause_threshold) | (critical_count >= critical_flag_threshold),
+        "High Risk",
+        np.where(avg_score >= medium_average_threshold, "Medium Risk", "Low Risk"),
+    )
+
+    return [
+        {
+            "document_id": entry["meta"]["document_id"],
+            "filename": entry["meta"]["filename"],
+            "contract_type": entry["meta"]["contract_type"],
+            "rule_pack": entry["meta"].get("rule_pack"),
+            "overall_risk": str(overall[i]),
+            "previous_overall_risk": entry["meta"]["overall_risk"],
+            "average_score": round(float(avg_score[i]), 2),
+            "high_risk_clauses": int(high_count[i]),
+            "critical_flags": int(critical_count[i]),
+            "total_clauses": int(n_clauses[i]),
+            "stale": entry["stale"],
+        }
+        for i, entry in enumerate(loaded)
+    ]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Re-score every stored contract")
+    parser.add_argument("--high-clauses", type=int, default=HIGH_CLAUSE_THRESHOLD)
+    parser.add_argument("--critical-flags", type=int, default=CRITICAL_FLAG_THRESHOLD)
+    parser.add_argument("--medium-average", type=float, default=MEDIUM_AVERAGE_THRESHOLD)
+    parser.add_argument(
+        "--weight", action="append", default=[], metavar="LEVEL=SCORE",
+        help="e.g. --weight High=4"
+    )
+    args = parser.parse_args()
+
+    weights = dict(SCORE_MAP)
+    for item in args.weight:
+        level, value = item.split("=", 1)
+        weights[level] = float(value)
+
+    results = rescore_portfolio(
+        weights, args.high_clauses, args.critical_flags, args.medium_average
+    )
+    changed = [r for r in results if r["overall_risk"] != r["previous_overall_risk"]]
+
+    for r in changed:
+        print(f"{r['filename']}: {r['previous_overall_risk']} -> {r['overall_risk']}")
+    print(f"{len(changed)} of {len(results)} contracts change overall risk")
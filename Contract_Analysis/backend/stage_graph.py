@@ -0,0 +1,216 @@
+# backend/stage_graph.py
+# Minimal dependency-driven stage scheduler for the analysis pipeline.
+# A stage is a dict {"name", "inputs", "output", "run"}: it starts as soon
+# as every named input exists, so independent stages (classification,
+# clause extraction, NER) overlap on worker threads.
+#
+# Threads rather than processes: stages share the document buffer and
+# ClauseRecords, and the pipeline itself already runs one document per
+# worker process. spaCy, numpy and scikit-learn release the GIL for much
+# of their work, which is where the overlap comes from.
+#
+# Time budgets: a stage that also declares "fallback" (same inputs, cheap,
+# degraded output) is given up on once it runs past its budget, and
+# dependents continue with the fallback output; the stage is reported as
+# timed out. Stages without a fallback (those that annotate shared clause
+# records in place) are always waited for.
+#
+# Budgets are best effort: they bound how long a document waits on a slow
+# stage, not the work it does. A thread cannot be killed, so an abandoned
+# stage keeps running (and holding the GIL between releases) until it
+# finishes; its late output is dropped and it does not touch the next
+# document's values or timings. A stage stuck in one long regex match
+# never releases the GIL, so its budget cannot even fire until it returns.
+#
+#   PIPELINE_STAGE_WORKERS=3        stages running at once (1 = sequential)
+#   PIPELINE_STAGE_BUDGET_S=60      budget per stage with a fallback (0 = none)
+#   PIPELINE_STAGE_BUDGETS="clause_extractor=20,ner_extractor=30"
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import nullcontext
+from typing import Dict, Iterator, List, Optional, Sequence
+
+STAGE_WORKERS = int(os.environ.get("PIPELINE_STAGE_WORKERS", "3"))
+DEFAULT_BUDGET = float(os.environ.get("PIPELINE_STAGE_BUDGET_S", "60"))
+
+
+def _parse_budgets(spec: str) -> Dict[str, float]:
+    budgets = {}
+    for item in spec.split(","):
+        name, _, seconds = item.partition("=")
+        if name.strip() and seconds.strip():
+            budgets[name.strip()] = float(seconds)
+    return budgets
+
+
+STAGE_BUDGETS = _parse_budgets(os.environ.get("PIPELINE_STAGE_BUDGETS", ""))
+
+
+def stage_budget(stage: Dict) -> Optional[float]:
+    """Seconds a stage may run, or None when it is always waited for."""
+    if "fallback" not in stage:
+        return None
+    budget = STAGE_BUDGETS.get(stage["name"], DEFAULT_BUDGET)
+    return budget if budget > 0 else None
+
+
+def check_graph(stages: Sequence[Dict], initial: Sequence[str]) -> None:
+    """
+    Stages must be declared in dependency order (every input is an
+    initial value or an earlier stage's output); raises ValueError if not.
+    """
+    available = set(initial)
+    for stage in stages:
+        missing = [i for i in stage["inputs"] if i not in available]
+        if missing:
+            raise ValueError(f"Stage {stage['name']} needs {missing} before it is produced.")
+        if stage["output"] in available:
+            raise ValueError(f"Stage {stage['name']} overwrites {stage['output']}.")
+        available.add(stage["output"])
+
+# -------------------------------------------------
+# EXECUTION
+# -------------------------------------------------
+
+def _start(stage: Dict, fn) -> Future:
+    """
+    Runs fn(stage) on its own daemon thread. A pool would let stages
+    abandoned after their budget hold on to workers later stages need.
+    """
+    future = Future()
+
+    def target():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(stage))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=target, daemon=True, name=f"stage-{stage['name']}").start()
+    return future
+
+
+def run_stages(
+    stages: Sequence[Dict],
+    values: Dict,
+    timings: Dict,
+    profiler=None,
+    workers: int = STAGE_WORKERS
+) -> Iterator[str]:
+    """
+    Runs every stage, writing each output into `values` and its
+    {"start", "seconds"[, "timed_out"]} (relative to the first stage)
+    into `timings`. Yields stage names in completion order, so callers
+    can act on partial results while the remaining stages are running.
+
+    One stage at a time (in declaration order) when workers is 1 or the
+    memory profiler is on, since tracemalloc peaks are process-wide and
+    overlapping stages would be attributed together.
+    """
+    check_graph(stages, values)
+    started = time.perf_counter()
+    if profiler and profiler.enabled:
+        workers = 1
+
+    def call(stage):
+        begin = time.perf_counter()
+        stage_context = profiler.stage(stage["name"]) if profiler else nullcontext()
+        with stage_context:
+            output = stage["run"](*(values[i] for i in stage["inputs"]))
+        # A stage that timed out already has its entry
+        timings.setdefault(stage["name"], {
+            "start": round(begin - started, 4),
+            "seconds": round(time.perf_counter() - begin, 4),
+        })
+        return output
+
+    pending = list(stages)
+    running = {}    # future -> (stage, started_at)
+
+    try:
+        while pending or running:
+            for stage in list(pending):
+                if len(running) >= max(workers, 1):
+                    break
+                if all(i in values for i in stage["inputs"]):
+                    pending.remove(stage)
+                    running[_start(stage, call)] = (stage, time.perf_counter())
+                elif workers <= 1:
+                    break  # sequential: keep declaration order
+
+            deadlines = [
+                began + stage_budget(stage) for stage, began in running.values()
+                if stage_budget(stage)
+            ]
+            timeout = max(min(deadlines) - time.perf_counter(), 0) if deadlines else None
+            finished, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                stage, _ = running.pop(future)
+                values[stage["output"]] = future.result()
+                yield stage["name"]
+
+            now = time.perf_counter()
+            for future, (stage, began) in list(running.items()):
+                budget = stage_budget(stage)
+                if budget and now - began >= budget:
+                    del running[future]
+                    timings[stage["name"]] = {
+                        "start": round(began - started, 4),
+                        "seconds": round(now - began, 4),
+                        "timed_out": True,
+                    }
+                    values[stage["output"]] = stage["fallback"](
+                        *(values[i] for i in stage["inputs"])
+                    )
+                    yield stage["name"]
+    finally:
+        # Error or abandoned generator: nothing new is started; stages
+        # already running finish in the background
+        for future in running:
+            future.cancel()
+
+
+def timed_out(timings: Dict) -> List[str]:
+    return [name for name, t in timings.items() if t.get("timed_out")]
+
+# -------------------------------------------------
+# CRITICAL PATH
+# -------------------------------------------------
+
+def critical_path(stages: Sequence[Dict], timings: Dict) -> Dict:
+    """
+    Longest chain of dependent stages by measured duration: the time the
+    document would take with unlimited workers. Shortening any other
+    stage does not make the document finish sooner.
+    """
+    producer = {s["output"]: s["name"] for s in stages}
+    chain: Dict[str, float] = {}
+    previous: Dict[str, Optional[str]] = {}
+
+    for stage in stages:  # declaration order is topological (check_graph)
+        deps = [producer[i] for i in stage["inputs"] if i in producer]
+        slowest = max(deps, key=lambda d: chain[d], default=None)
+        previous[stage["name"]] = slowest
+        chain[stage["name"]] = timings[stage["name"]]["seconds"] + (chain[slowest] if slowest else 0.0)
+
+    path: List[str] = []
+    # Ties go to the later stage, so the path runs through to its end
+    name = max(reversed(list(chain)), key=chain.get, default=None)
+    while name:
+        path.append(name)
+        name = previous[name]
+
+    ends = [t["start"] + t["seconds"] for t in timings.values()]
+    return {
+        "critical_path": path[::-1],
+        "critical_path_seconds": round(chain[path[0]], 4) if path else 0.0,
+        "wall_seconds": round(max(ends, default=0.0), 4),
+        "busy_seconds": round(sum(t["seconds"] for t in timings.values()), 4),
+        "timed_out": timed_out(timings),
+        "stages": timings,
+    }
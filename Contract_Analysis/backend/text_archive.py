@@ -0,0 +1,216 @@
+# backend/text_archive.py
+# Append-only archive of extracted, language-normalized contract text.
+# Re-running the pipeline over a document that has been read before
+# (e.g. after a rule change) takes its English text from here instead
+# of parsing the PDF/DOCX again and re-translating Hindi lines.
+#
+#   texts.bin    UTF-8 texts, appended back to back, read through mmap
+#   texts.idx    one JSON line per text: key -> offset, length, metadata
+#
+# Both files are only ever appended to, with one O_APPEND write per
+# record, so several processes (UI workers, batch nodes on one disk) can
+# add texts without a lock. A record whose index line never made it
+# (crash between the two writes) is just unreferenced bytes.
+#
+#   TEXT_ARCHIVE=off                disable lookups and writes
+#
+#   python -m backend.text_archive  archive statistics
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+import zlib
+from typing import Dict, List, Optional
+
+from backend.file_reader import PDF_READER_MODE
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVE_DIR = os.path.join(BASE_DIR, "indexes", "text_archive")
+BLOB_FILE = os.path.join(ARCHIVE_DIR, "texts.bin")
+INDEX_FILE = os.path.join(ARCHIVE_DIR, "texts.idx")
+
+ENABLED = os.environ.get("TEXT_ARCHIVE", "on").lower() != "off"
+
+# Bump when file_reader / language_handler output changes, so texts
+# produced by the old code are no longer used
+ARCHIVE_VERSION = "text-v2"
+
+_lock = threading.Lock()
+
+# Index entries read so far and how far into INDEX_FILE that got
+_index: Dict[str, Dict] = {}
+_index_pos = 0
+
+_blob: Optional[mmap.mmap] = None
+
+
+def archive_key(document_id: str) -> str:
+    """
+    Content hash + everything that changes the extracted text.
+    """
+    return hashlib.sha256(
+        f"{document_id}|{ARCHIVE_VERSION}|{PDF_READER_MODE}".encode()
+    ).hexdigest()
+
+
+def _append(path: str, payload: bytes) -> int:
+    """
+    Appends payload in one write; returns the offset it landed at.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        written = os.write(fd, payload)
+        if written != len(payload):
+            raise OSError(f"short write to {path}")
+        return os.lseek(fd, 0, os.SEEK_CUR) - len(payload)
+    finally:
+        os.close(fd)
+
+
+def _refresh_index() -> None:
+    """Reads index lines appended (by any process) since the last call."""
+    global _index_pos
+
+    try:
+        with open(INDEX_FILE, "rb") as f:
+            f.seek(_index_pos)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # being written right now; read it next time
+                _index_pos += len(line)
+                try:
+                    entry = json.loads(line)
+                    _index[entry["key"]] = entry
+                except (ValueError, KeyError):
+                    continue  # torn line from a crashed writer
+    except OSError:
+        pass
+
+
+def _blob_view(end: int) -> Optional[mmap.mmap]:
+    """
+    Read-only mapping of the blob covering at least [0, end); remapped
+    when other processes have appended past the current mapping.
+    """
+    global _blob
+
+    if _blob is not None and len(_blob) >= end:
+        return _blob
+
+    try:
+        with open(BLOB_FILE, "rb") as f:
+            if os.fstat(f.fileno()).st_size < end:
+                return None
+            if _blob is not None:
+                _blob.close()
+            _blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        _blob = None
+    return _blob
+
+# -------------------------------------------------
+# LOOKUP / STORE
+# -------------------------------------------------
+
+def lookup_text(document_id: str) -> Optional[Dict]:
+    """
+    Archived {"text", "text_chars", "language", "note", "heading_lines"}
+    for a document, or None. The text is decoded straight from the
+    mapped file.
+    """
+    if not ENABLED:
+        return None
+
+    key = archive_key(document_id)
+    with _lock:
+        entry = _index.get(key)
+        if entry is None:
+            _refresh_index()
+            entry = _index.get(key)
+        if entry is None:
+            return None
+
+        start, end = entry["offset"], entry["offset"] + entry["length"]
+        blob = _blob_view(end)
+        if blob is None:
+            return None
+
+        view = memoryview(blob)[start:end]
+        try:
+            if zlib.crc32(view) != entry["crc32"]:
+                return None
+            text = str(view, "utf-8")
+        finally:
+            view.release()
+
+    return {
+        "text": text,
+        "text_chars": entry["text_chars"],
+        "language": entry["language"],
+        "note": entry["note"],
+        "heading_lines": entry["heading_lines"],
+    }
+
+
+def store_text(
+    document_id: str,
+    text: str,
+    text_chars: int,
+    language: str,
+    note: str,
+    heading_lines: List[int]
+) -> None:
+    """
+    Archives a document's normalized English text (text_chars is the
+    length of the extracted text before translation) with the line
+    numbers of its PDF layout headings.
+    """
+    if not ENABLED:
+        return
+
+    payload = text.encode("utf-8")
+    key = archive_key(document_id)
+
+    with _lock:
+        _refresh_index()
+        if key in _index:
+            return
+
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        offset = _append(BLOB_FILE, payload)
+        entry = {
+            "key": key,
+            "offset": offset,
+            "length": len(payload),
+            "crc32": zlib.crc32(payload),
+            "text_chars": text_chars,
+            "language": language,
+            "note": note,
+            "heading_lines": list(heading_lines),
+        }
+        _append(INDEX_FILE, (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8"))
+        _index[key] = entry
+
+
+def archive_stats() -> Dict:
+    with _lock:
+        _refresh_index()
+        live = sum(e["length"] for e in _index.values())
+        try:
+            blob_bytes = os.path.getsize(BLOB_FILE)
+        except OSError:
+            blob_bytes = 0
+
+    return {
+        "texts": len(_index),
+        "blob_mb": round(blob_bytes / (1024 * 1024), 2),
+        # Bytes not referenced by any current entry (crashed writes)
+        "unreferenced_mb": round(max(blob_bytes - live, 0) / (1024 * 1024), 2),
+        "version": ARCHIVE_VERSION,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(archive_stats(), indent=2))
@@ -0,0 +1,329 @@
+# backend/translation_service.py
+# Long-lived Hindi → English translation service.
+# Loads the argos hi→en model once and serves batches from every
+# Streamlit session / worker process over a local, authenticated socket.
+#
+# The socket speaks pickle, so the auth key must stay secret: it is
+# generated per install into KEY_FILE (mode 0600) unless
+# TRANSLATION_SERVICE_AUTHKEY is set, and the service will not start
+# without one.
+#
+#   python -m backend.translation_service           # run the service
+#   python -m backend.translation_service --stats   # queue depth + throughput
+
+import argparse
+import json
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.managers import BaseManager, RemoteError
+from typing import Dict, List, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HOST = "127.0.0.1"
+PORT = int(os.environ.get("TRANSLATION_SERVICE_PORT", "50071"))
+KEY_FILE = os.path.join(BASE_DIR, "indexes", "translation_service.key")
+
+# Set TRANSLATION_SERVICE=off to translate in-process instead
+ENABLED = os.environ.get("TRANSLATION_SERVICE", "on").lower() != "off"
+STARTUP_TIMEOUT = 60
+
+# After a failed start, documents skip translation for this long
+# instead of each trying (and waiting for) the service again
+RETRY_AFTER = 60
+
+READY_LINE = "ready"
+
+
+class TranslationUnavailable(RuntimeError):
+    """No hi→en model or service; callers keep the lines untranslated."""
+
+
+# -------------------------------------------------
+# AUTH KEY
+# -------------------------------------------------
+
+_authkey: Optional[bytes] = None
+
+
+def _read_key_file() -> bytes:
+    with open(KEY_FILE, "rb") as f:
+        return f.read().strip()
+
+
+def get_authkey() -> bytes:
+    """
+    TRANSLATION_SERVICE_AUTHKEY, else this install's random key (created
+    on first use). Raises RuntimeError when neither can be had.
+    """
+    global _authkey
+
+    if _authkey:
+        return _authkey
+
+    key = os.environ.get("TRANSLATION_SERVICE_AUTHKEY", "").encode()
+    if not key:
+        try:
+            key = _read_key_file()
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(KEY_FILE), exist_ok=True)
+            # Written in full under a temporary name, then linked into
+            # place: a concurrent reader never sees a partial key
+            tmp = f"{KEY_FILE}.{os.getpid()}.tmp"
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                os.write(fd, secrets.token_hex(32).encode())
+            finally:
+                os.close(fd)
+            try:
+                os.link(tmp, KEY_FILE)
+            except FileExistsError:
+                pass  # another process won the race; use its key
+            finally:
+                os.unlink(tmp)
+            key = _read_key_file()
+
+    if not key:
+        raise RuntimeError(f"Empty translation service key in {KEY_FILE}")
+
+    _authkey = key
+    return _authkey
+
+
+# -------------------------------------------------
+# MODEL
+# -------------------------------------------------
+
+def load_hi_en_translation():
+    """
+    Looks up the installed hi→en translation once.
+    Install it with: python lang.py
+    """
+    try:
+        import argostranslate.translate
+    except ImportError:
+        raise TranslationUnavailable("argostranslate is not installed")
+
+    languages = {lang.code: lang for lang in argostranslate.translate.get_installed_languages()}
+    if "hi" not in languages or "en" not in languages:
+        raise TranslationUnavailable("Hindi → English model not installed (run lang.py)")
+
+    return languages["hi"].get_translation(languages["en"])
+
+
+# -------------------------------------------------
+# SERVICE (runs inside the service process)
+# -------------------------------------------------
+
+class TranslationService:
+    """
+    One worker thread owns the model; callers enqueue batches and
+    block until their batch is done. Queue depth = batches waiting.
+    """
+
+    def __init__(self):
+        self.translation = load_hi_en_translation()
+        self.jobs: queue.Queue = queue.Queue()
+        self.started_at = time.time()
+        self.batches = 0
+        self.lines = 0
+        self.busy_seconds = 0.0
+
+        threading.Thread(target=self._run, name="hi-en-translator", daemon=True).start()
+
+    def translate_batch(self, lines: List[str]) -> List[str]:
+        job = {"lines": lines, "done": threading.Event(), "result": None, "error": None}
+        self.jobs.put(job)
+        job["done"].wait()
+
+        # A builtin type: the client re-raises whatever crosses the
+        # socket, and this module's classes are __main__ in the service
+        if job["error"]:
+            raise RuntimeError(job["error"])
+        return job["result"]
+
+    def stats(self) -> Dict:
+        return {
+            "queue_depth": self.jobs.qsize(),
+            "batches": self.batches,
+            "lines": self.lines,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "lines_per_second": round(self.lines / self.busy_seconds, 2) if self.busy_seconds else 0.0,
+        }
+
+    def _run(self) -> None:
+        while True:
+            job = self.jobs.get()
+            started = time.perf_counter()
+            try:
+                job["result"] = [
+                    self.translation.translate(line) if line.strip() else ""
+                    for line in job["lines"]
+                ]
+            except Exception as e:
+                job["error"] = str(e)
+
+            self.busy_seconds += time.perf_counter() - started
+            self.batches += 1
+            self.lines += len(job["lines"])
+            job["done"].set()
+
+
+class _ServiceManager(BaseManager):
+    pass
+
+
+def serve() -> None:
+    """
+    Prints READY_LINE once listening, or "error: ..." and exits 1, so
+    the client that started it does not wait out STARTUP_TIMEOUT.
+    """
+    try:
+        authkey = get_authkey()
+        service = TranslationService()
+        _ServiceManager.register("service", callable=lambda: service)
+        server = _ServiceManager(address=(HOST, PORT), authkey=authkey).get_server()
+    except Exception as e:
+        print(f"error: {e}", flush=True)
+        sys.exit(1)
+
+    print(READY_LINE, flush=True)
+    # The starting client stops reading once it is connected
+    sys.stdout = open(os.devnull, "w")
+    server.serve_forever()
+
+
+# -------------------------------------------------
+# CLIENT (used by language_handler)
+# -------------------------------------------------
+
+class _ClientManager(BaseManager):
+    pass
+
+
+_ClientManager.register("service")
+
+_local_translation = None
+_client_lock = threading.Lock()
+
+# (time, reason) of the last failed start, see RETRY_AFTER
+_unavailable = (0.0, "")
+
+
+def _connect():
+    manager = _ClientManager(address=(HOST, PORT), authkey=get_authkey())
+    manager.connect()
+    return manager.service()
+
+
+def _start_service() -> str:
+    """
+    Starts the service and waits for its first output line:
+    READY_LINE, "error: ...", or "" if it died without a word.
+    """
+    # Detached so it outlives the Streamlit session / worker that started it
+    process = subprocess.Popen(
+        [sys.executable, "-m", "backend.translation_service"],
+        cwd=BASE_DIR,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        start_new_session=True,
+    )
+
+    first_line = []
+    reader = threading.Thread(
+        target=lambda: first_line.append(process.stdout.readline()), daemon=True
+    )
+    reader.start()
+    reader.join(STARTUP_TIMEOUT)
+    if reader.is_alive():
+        process.kill()  # unblocks the reader
+        reader.join()
+    process.stdout.close()
+
+    if not first_line or not first_line[0]:
+        return f"error: did not start within {STARTUP_TIMEOUT}s"
+    return first_line[0].strip()
+
+
+def get_service(start: bool = True):
+    """
+    Returns a proxy to the shared service, starting it on first use.
+    Raises TranslationUnavailable when it cannot be started.
+    """
+    global _unavailable
+
+    with _client_lock:
+        try:
+            return _connect()
+        except AuthenticationError:
+            raise TranslationUnavailable(f"service on port {PORT} rejected this install's key")
+        except (ConnectionRefusedError, OSError):
+            if not start:
+                raise
+
+        failed_at, reason = _unavailable
+        if time.time() - failed_at < RETRY_AFTER:
+            raise TranslationUnavailable(reason)
+
+        status = _start_service()
+        try:
+            # Also covers another process having started it meanwhile
+            return _connect()
+        except (ConnectionRefusedError, OSError, AuthenticationError):
+            reason = status[len("error: "):] if status.startswith("error: ") else (
+                "translation service exited during startup"
+            )
+            _unavailable = (time.time(), reason)
+            raise TranslationUnavailable(reason)
+
+
+def translate_batch(lines: List[str]) -> List[str]:
+    """
+    Translate a batch of Hindi lines through the shared warm model,
+    falling back to a per-process model if the service is disabled.
+    Raises TranslationUnavailable when there is no model to use or the
+    batch cannot be translated.
+    """
+    global _local_translation
+
+    if ENABLED:
+        service = get_service()
+        try:
+            return service.translate_batch(lines)
+        except (EOFError, ConnectionError):
+            raise TranslationUnavailable("translation service connection lost")
+        except (RuntimeError, RemoteError) as e:
+            raise TranslationUnavailable(f"translation failed: {e}")
+
+    if _local_translation is None:
+        _local_translation = load_hi_en_translation()
+    try:
+        return [_local_translation.translate(line) if line.strip() else "" for line in lines]
+    except Exception as e:
+        raise TranslationUnavailable(f"translation failed: {e}")
+
+
+def service_stats() -> Optional[Dict]:
+    try:
+        return get_service(start=False).stats()
+    except (ConnectionRefusedError, OSError, TranslationUnavailable):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shared hi→en translation service")
+    parser.add_argument("--stats", action="store_true", help="Print stats of a running service")
+    args = parser.parse_args()
+
+    if args.stats:
+        print(json.dumps(service_stats(), indent=2))
+    else:
+        serve()
@@ -0,0 +1,115 @@
+# backend/triage.py
+# Millisecond intake screening: contract type + critical-term scan over
+# a bounded prefix and sample of the text. No translation, clause
+# extraction, NER, explanations or report; flags which contracts
+# deserve a full analysis.
+#
+#   python -m backend.triage inbox/*.pdf
+
+import io
+import os
+import re
+import time
+from typing import Dict
+
+from backend.file_reader import extract_text_sample
+from backend.contract_classifier import classify_contract
+from backend.language_handler import DEVANAGARI_RE, LATIN_RE, sample_text
+from backend.risk_analyzer import CRITICAL_DOMINANT_TERMS
+
+PREFIX_CHARS = int(os.environ.get("TRIAGE_PREFIX_CHARS", "20000"))
+SAMPLE_SEGMENTS = 40
+SAMPLE_SEGMENT_CHARS = 500
+MAX_PDF_PAGES = int(os.environ.get("TRIAGE_MAX_PDF_PAGES", "4"))
+
+# Below this classifier confidence the type is not trusted
+MIN_CONFIDENCE = 0.4
+
+# Share of letters in Devanagari above which keyword triage is unreliable
+DEVANAGARI_SHARE = 0.3
+
+CRITICAL_REGEX = re.compile(
+    "|".join(re.escape(term) for term in CRITICAL_DOMINANT_TERMS)
+)
+
+
+def bounded_text(text: str) -> str:
+    """Prefix plus evenly spaced slices of the remainder."""
+    if len(text) <= PREFIX_CHARS:
+        return text
+    return text[:PREFIX_CHARS] + "\n" + sample_text(
+        text[PREFIX_CHARS:], SAMPLE_SEGMENTS, SAMPLE_SEGMENT_CHARS
+    )
+
+
+def triage_text(text: str) -> Dict:
+    scanned = bounded_text(text)
+    lower = scanned.lower()
+
+    classification = classify_contract(scanned)
+
+    critical_terms = {}
+    for m in CRITICAL_REGEX.finditer(lower):
+        critical_terms[m.group()] = critical_terms.get(m.group(), 0) + 1
+
+    devanagari = sum(map(len, DEVANAGARI_RE.findall(scanned)))
+    latin = sum(map(len, LATIN_RE.findall(scanned)))
+    devanagari_share = devanagari / max(devanagari + latin, 1)
+
+    reasons = []
+    if critical_terms:
+        reasons.append("critical terms: " + ", ".join(sorted(critical_terms)))
+    if classification["confidence"] < MIN_CONFIDENCE:
+        reasons.append("contract type uncertain")
+    if devanagari_share >= DEVANAGARI_SHARE:
+        reasons.append("mostly Hindi text; triage ran without translation")
+
+    return {
+        "contract_type": classification["contract_type"],
+        "confidence": classification["confidence"],
+        "critical_terms": critical_terms,
+        "needs_full_analysis": bool(reasons),
+        "reasons": reasons,
+        "chars_scanned": len(scanned),
+        "text_chars": len(text),
+    }
+
+
+def triage_document(filename: str, data: bytes) -> Dict:
+    """
+    Raises ValueError for unreadable or unsupported files, like the
+    full pipeline.
+    """
+    started = time.perf_counter()
+
+    # Same upload interface as pipeline.as_upload, without importing the
+    # full pipeline (spaCy) into screening processes
+    upload = io.BytesIO(data)
+    upload.name = filename
+    text = extract_text_sample(upload, MAX_PDF_PAGES)
+
+    result = {"filename": filename, **triage_text(text)}
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    started = time.perf_counter()
+    paths = sys.argv[1:]
+    flagged = 0
+
+    for path in paths:
+        with open(path, "rb") as f:
+            try:
+                result = triage_document(os.path.basename(path), f.read())
+            except ValueError as e:
+                result = {"filename": os.path.basename(path), "error": str(e)}
+        flagged += bool(result.get("needs_full_analysis"))
+        print(json.dumps(result, ensure_ascii=False))
+
+    elapsed = time.perf_counter() - started
+    print(f"{len(paths)} documents, {flagged} flagged, "
+          f"{elapsed * 1000 / max(len(paths), 1):.1f} ms/document", file=sys.stderr)
@@ -0,0 +1,111 @@
+from datetime import date
+
+import streamlit as st
+
+from backend.portfolio_stats import load_stats, query, average, KEY_SEP
+from backend.report_store import store_stats
+
+# -------------------------------------------------
+# PAGE CONFIG
+# -------------------------------------------------
+
+st.set_page_config(
+    page_title="Portfolio Risk Dashboard",
+    page_icon="📊",
+    layout="wide"
+)
+
+st.title("📊 Portfolio Risk Dashboard")
+st.caption("Served from incrementally maintained aggregates • No history rescans")
+
+stats = load_stats()
+
+if not stats["total"]["count"]:
+    st.info("No completed analyses yet. Analyze a contract to populate the dashboard.")
+    st.stop()
+
+# -------------------------------------------------
+# TOTALS
+# -------------------------------------------------
+
+c1, c2, c3 = st.columns(3)
+c1.metric("Contracts Analyzed", stats["total"]["count"])
+c2.metric("Average Risk Score", average(stats["total"]))
+c3.metric("High Risk Contracts", stats["by_overall_risk"].get("High Risk", {}).get("count", 0))
+
+st.divider()
+
+# -------------------------------------------------
+# QUARTER QUERY
+# -------------------------------------------------
+
+st.subheader("🔎 Query")
+
+today = date.today()
+years = sorted({int(m[:4]) for m in stats["by_month"]} | {today.year}, reverse=True)
+
+q1, q2, q3, q4 = st.columns(4)
+year = q1.selectbox("Year", years)
+quarter = q2.selectbox("Quarter", [1, 2, 3, 4], index=(today.month - 1) // 3)
+contract_type = q3.selectbox("Contract Type", ["All"] + sorted(stats["by_contract_type"]))
+overall_risk = q4.selectbox("Overall Risk", ["All"] + sorted(stats["by_overall_risk"]))
+
+months = [f"{year}-{m:02d}" for m in range(3 * quarter - 2, 3 * quarter + 1)]
+result = query(
+    months,
+    None if contract_type == "All" else contract_type,
+    None if overall_risk == "All" else overall_risk,
+)
+
+r1, r2 = st.columns(2)
+r1.metric(f"Contracts in Q{quarter} {year}", result["count"])
+r2.metric("Average Risk Score", result["average_score"])
+
+st.divider()
+
+# -------------------------------------------------
+# BREAKDOWNS
+# -------------------------------------------------
+
+def breakdown(buckets: dict, label: str) -> list:
+    return [
+        {label: key, "Contracts": b["count"], "Average Score": average(b)}
+        for key, b in sorted(buckets.items())
+    ]
+
+
+b1, b2 = st.columns(2)
+
+with b1:
+    st.subheader("By Contract Type")
+    st.dataframe(breakdown(stats["by_contract_type"], "Contract Type"))
+
+with b2:
+    st.subheader("By Overall Risk")
+    st.dataframe(breakdown(stats["by_overall_risk"], "Overall Risk"))
+
+st.subheader("By Month")
+st.bar_chart(
+    {month: b["count"] for month, b in sorted(stats["by_month"].items())}
+)
+
+with st.expander("All cells (month × type × risk)"):
+    rows = []
+    for key, b in sorted(stats["cells"].items()):
+        month, ctype, risk = key.split(KEY_SEP)
+        rows.append({
+            "Month": month,
+            "Contract Type": ctype,
+            "Overall Risk": risk,
+            "Contracts": b["count"],
+            "Average Score": average(b),
+        })
+    st.dataframe(rows)
+
+with st.expander("Report store"):
+    store = store_stats()
+    s1, s2, s3, s4 = st.columns(4)
+    s1.metric("Stored Reports", store["reports"])
+    s2.metric("Disk Usage (MB)", f"{store['disk_mb']} / {store['quota_mb']:.0f}")
+    s3.metric("Hit Rate", f"{store['hit_rate']:.0%}")
+    s4.metric("Evicted / Expired", f"{store['evictions']} / {store['expired']}")
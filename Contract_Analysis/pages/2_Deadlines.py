@@ -0,0 +1,46 @@
+import streamlit as st
+
+from backend.obligation_index import upcoming_deadlines
+
+# -------------------------------------------------
+# PAGE CONFIG
+# -------------------------------------------------
+
+st.set_page_config(
+    page_title="Upcoming Deadlines",
+    page_icon="📅",
+    layout="wide"
+)
+
+st.title("📅 Upcoming Obligations & Deadlines")
+st.caption("Renewals, notice periods and payment dates across all analyzed contracts")
+
+c1, c2 = st.columns(2)
+days = c1.slider("Look ahead (days)", min_value=7, max_value=365, value=30, step=1)
+kinds = c2.multiselect(
+    "Kinds",
+    ["renewal", "notice", "termination", "payment", "obligation"],
+    default=["renewal", "notice", "termination"]
+)
+
+rows = upcoming_deadlines(days, kinds or None)
+
+st.metric("Deadlines Found", len(rows))
+
+if not rows:
+    st.info("No deadlines in this window.")
+    st.stop()
+
+st.dataframe([
+    {
+        "Due": r["due_date"],
+        "Kind": r["kind"],
+        "Contract": r["filename"],
+        "Contract Type": r["contract_type"],
+        "Party": r["party"],
+        "Action": r["action"],
+        "Notice (days)": r["notice_days"],
+        "Clause": r["source_clause"],
+    }
+    for r in rows
+])
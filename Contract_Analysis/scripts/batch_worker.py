@@ -0,0 +1,176 @@
+# scripts/batch_worker.py
+# Sharded batch analysis of a contract archive across several nodes.
+#
+#   # once, from any node
+#   python scripts/batch_worker.py enqueue --queue /shared/q.sqlite3 --shards 16 /shared/archive
+#
+#   # on every node (each may run several local processes)
+#   python scripts/batch_worker.py work --queue /shared/q.sqlite3 --out /shared/results --processes 4
+#
+#   python scripts/batch_worker.py status --queue /shared/q.sqlite3
+#
+# Results go to <out>/shard-<NNN>.<node>.jsonl, one JSON object per
+# contract; concatenate a shard's files (deduping on item_id) to merge.
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from backend import batch_queue  # noqa: E402
+from backend.batch_queue import DEFAULT_QUEUE, LEASE_SECONDS, MAX_ATTEMPTS  # noqa: E402
+
+SUPPORTED = (".pdf", ".docx", ".txt")
+IDLE_POLL = 5.0
+
+
+def iter_contracts(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.lower().endswith(SUPPORTED):
+                        yield os.path.join(root, name)
+        elif path.lower().endswith(SUPPORTED):
+            yield path
+
+# -------------------------------------------------
+# WORKER
+# -------------------------------------------------
+
+class LeaseKeeper(threading.Thread):
+    """Renews the lease while a long document is being analyzed."""
+
+    def __init__(self, queue: str, item_id: int, node_id: str, lease: float):
+        super().__init__(daemon=True)
+        self.args = (queue, item_id, node_id, lease)
+        self.done = threading.Event()
+        self.lost = False
+
+    def run(self) -> None:
+        while not self.done.wait(self.args[3] / 3):
+            if not batch_queue.renew(*self.args):
+                self.lost = True
+                return
+
+
+def append_result(out_dir: str, shard: int, node_id: str, record: dict) -> None:
+    path = os.path.join(out_dir, f"shard-{shard:03d}.{node_id}.jsonl")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False, default=list) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def work(queue: str, out_dir: str, node_id: str, lease: float, max_attempts: int) -> int:
+    """
+    Claims and analyzes items until the queue is drained. Returns the
+    number of contracts this node completed.
+    """
+    from backend.pipeline import run_api_analysis
+
+    os.makedirs(out_dir, exist_ok=True)
+    completed = 0
+
+    while True:
+        item = batch_queue.claim(queue, node_id, lease, max_attempts)
+        if item is None:
+            if batch_queue.is_drained(queue):
+                return completed
+            time.sleep(IDLE_POLL)  # other nodes hold leases that may still expire
+            continue
+
+        keeper = LeaseKeeper(queue, item["item_id"], node_id, lease)
+        keeper.start()
+        started = time.perf_counter()
+
+        try:
+            with open(item["path"], "rb") as f:
+                result = run_api_analysis(os.path.basename(item["path"]), f.read())
+        except Exception as e:
+            keeper.done.set()
+            batch_queue.fail(queue, item["item_id"], node_id, str(e) or e.__class__.__name__, max_attempts)
+            print(f"[{node_id}] failed {item['path']}: {e}", flush=True)
+            continue
+
+        keeper.done.set()
+        if keeper.lost:
+            # Another node has taken over this item
+            continue
+
+        append_result(out_dir, item["shard"], node_id, {
+            "item_id": item["item_id"],
+            "path": item["path"],
+            "node": node_id,
+            "attempt": item["attempts"],
+            "seconds": round(time.perf_counter() - started, 3),
+            **result,
+        })
+        if batch_queue.complete(queue, item["item_id"], node_id):
+            completed += 1
+
+
+def _process_main(queue, out_dir, node_id, lease, max_attempts) -> None:
+    done = work(queue, out_dir, node_id, lease, max_attempts)
+    print(f"[{node_id}] completed {done} contracts", flush=True)
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sharded multi-node batch analysis")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_enqueue = sub.add_parser("enqueue", help="Queue files / directories")
+    p_enqueue.add_argument("paths", nargs="+")
+    p_enqueue.add_argument("--shards", type=int, default=8)
+
+    p_work = sub.add_parser("work", help="Process items until the queue is drained")
+    p_work.add_argument("--out", default=os.path.join(BASE_DIR, "exports", "batch"))
+    p_work.add_argument("--node", default=batch_queue.default_node_id())
+    p_work.add_argument("--processes", type=int, default=1)
+    p_work.add_argument("--lease", type=float, default=LEASE_SECONDS)
+    p_work.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+
+    p_status = sub.add_parser("status", help="Item counts and failures")
+
+    for p in (p_enqueue, p_work, p_status):
+        p.add_argument("--queue", default=DEFAULT_QUEUE, help="Shared SQLite queue file")
+
+    args = parser.parse_args()
+
+    if args.command == "enqueue":
+        added = batch_queue.enqueue(args.queue, iter_contracts(args.paths), args.shards)
+        print(f"queued {added} contracts")
+
+    elif args.command == "work":
+        if args.processes == 1:
+            _process_main(args.queue, args.out, args.node, args.lease, args.max_attempts)
+        else:
+            ctx = mp.get_context("spawn")
+            procs = [
+                ctx.Process(
+                    target=_process_main,
+                    args=(args.queue, args.out, f"{args.node}-{i}", args.lease, args.max_attempts),
+                )
+                for i in range(args.processes)
+            ]
+            for p in procs:
+                p.start()
+            for p in procs:
+                p.join()
+
+    print(json.dumps(batch_queue.queue_stats(args.queue)))
+    for item in batch_queue.failed_items(args.queue) if args.command == "status" else []:
+        print(f"failed: {item['path']} ({item['attempts']} attempts): {item['error']}")
+
+
+if __name__ == "__main__":
+    main()
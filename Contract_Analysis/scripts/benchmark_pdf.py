@@ -0,0 +1,140 @@
+# scripts/benchmark_pdf.py
+# Compares PDF text-extraction backends on the sample PDFs (or given
+# files): time per document and per page, extracted characters, and how
+# many clauses the segmenter finds in each backend's text.
+#
+#   python scripts/benchmark_pdf.py                      # Sample_files/*.pdf
+#   python scripts/benchmark_pdf.py contracts/*.pdf --repeat 5
+#   python scripts/benchmark_pdf.py --generate 40        # + a generated 40-page PDF
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+import pdfplumber
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_DIR = os.path.join(BASE_DIR, "Sample_files")
+
+sys.path.insert(0, BASE_DIR)
+
+from backend import file_reader  # noqa: E402
+from backend.clause_extractor import extract_clauses, normalize_with_headings  # noqa: E402
+
+
+def plumber_plain(data: bytes) -> str:
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return "\n".join(page.extract_text() or "" for page in pdf.pages)
+
+
+# Each returns (text, heading line numbers)
+BACKENDS: Dict[str, Callable[[bytes], Tuple[str, List[int]]]] = {
+    "pdfium-text": lambda data: (file_reader.read_pdf_text(data), []),
+    "pdfplumber-text": lambda data: (plumber_plain(data), []),
+    "pdfplumber-structured": lambda data: file_reader.read_pdf_structured(io.BytesIO(data)),
+    "pdfplumber-layout": lambda data: (file_reader.read_pdf_layout(io.BytesIO(data)), []),
+    "auto": lambda data: file_reader.read_pdf(io.BytesIO(data), "auto"),
+}
+
+
+GENERATED_CLAUSES = [
+    ("Payment Terms", "The Client shall pay Rs. 50,000 within 30 days of invoice."),
+    ("Termination", "The Company may terminate this Agreement without notice at its sole discretion."),
+    ("Indemnity", "The Vendor shall indemnify and hold harmless the Company against all losses."),
+    ("Confidentiality", "Both parties shall keep confidential information secret by mutual agreement."),
+    ("Governing Law", "This Agreement is governed by the laws of India."),
+]
+
+
+def generate_pdf(pages: int) -> str:
+    """Numbered-clause contract of roughly `pages` A4 pages (reportlab)."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    path = os.path.join(tempfile.gettempdir(), f"benchmark_{pages}_pages.pdf")
+    c = canvas.Canvas(path, pagesize=A4)
+    y, number = 800, 0
+
+    while c.getPageNumber() <= pages:
+        for title, body in GENERATED_CLAUSES:
+            number += 1
+            for font, size, text in (("Helvetica-Bold", 11, f"{number}. {title}"),
+                                     ("Helvetica", 10, body)):
+                if y < 60:
+                    c.showPage()
+                    y = 800
+                c.setFont(font, size)
+                c.drawString(60, y, text)
+                y -= size + 6
+    c.save()
+    return path
+
+
+def page_count(data: bytes) -> int:
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return len(pdf.pages)
+
+
+def bench(path: str, repeat: int, backends: List[str]) -> None:
+    with open(path, "rb") as f:
+        data = f.read()
+    pages = page_count(data)
+
+    print(f"\n{os.path.basename(path)}  ({pages} pages, {len(data) / 1024:.0f} KB)")
+    print(f"  {'backend':<24}{'median s':>10}{'ms/page':>10}{'chars':>10}{'clauses':>9}")
+
+    for name in backends:
+        times = []
+        try:
+            for _ in range(repeat):
+                started = time.perf_counter()
+                text, heading_lines = BACKENDS[name](data)
+                times.append(time.perf_counter() - started)
+        except Exception as e:
+            print(f"  {name:<24}failed: {e}")
+            continue
+
+        median = statistics.median(times)
+        document, headings = normalize_with_headings(file_reader.normalize_text(text), heading_lines)
+        clauses = extract_clauses(document, normalized=True, headings=headings)
+        print(
+            f"  {name:<24}{median:>10.3f}{median * 1000 / max(pages, 1):>10.1f}"
+            f"{len(text):>10,}{len(clauses):>9}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark PDF text-extraction backends")
+    parser.add_argument("paths", nargs="*", help="PDF files (default: Sample_files/*.pdf)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--generate", type=int, default=0, metavar="PAGES",
+                        help="Also benchmark a generated numbered contract of this many pages")
+    parser.add_argument("--backends", default=",".join(BACKENDS),
+                        help="Comma-separated subset of: " + ", ".join(BACKENDS))
+    args = parser.parse_args()
+
+    paths = args.paths or sorted(
+        os.path.join(SAMPLE_DIR, name) for name in os.listdir(SAMPLE_DIR)
+        if name.lower().endswith(".pdf")
+    )
+    if args.generate:
+        paths.append(generate_pdf(args.generate))
+    if not paths:
+        parser.error("no PDFs found; pass paths or --generate PAGES")
+
+    if file_reader.pdfium is None:
+        print("pypdfium2 is not installed: pdfium-text is skipped and auto uses pdfplumber")
+        BACKENDS.pop("pdfium-text")
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip() in BACKENDS]
+    for path in paths:
+        bench(path, args.repeat, backends)
+
+
+if __name__ == "__main__":
+    main()
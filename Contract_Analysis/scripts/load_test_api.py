@@ -0,0 +1,97 @@
+# scripts/load_test_api.py
+# Local load test for api.py
+#
+#   python api.py --max-concurrency 2 &
+#   python scripts/load_test_api.py --requests 50 --concurrency 8
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from collections import Counter
+from typing import List, Tuple
+from urllib.parse import quote
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_DIR = os.path.join(BASE_DIR, "Sample_files")
+
+
+async def post_file(host: str, port: int, filename: str, data: bytes) -> Tuple[int, float]:
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+
+    head = (
+        f"POST /analyze?filename={quote(filename)} HTTP/1.1\r\n"
+        f"Host: {host}:{port}\r\n"
+        "Content-Type: application/octet-stream\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + data)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    await reader.read()  # drain headers + body until close
+    writer.close()
+
+    status = int(status_line.split()[1])
+    return status, time.perf_counter() - started
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(host: str, port: int, total: int, concurrency: int, files: List[str]) -> None:
+    uploads = []
+    for path in files:
+        with open(path, "rb") as f:
+            uploads.append((os.path.basename(path), f.read()))
+
+    gate = asyncio.Semaphore(concurrency)
+    results = []
+
+    async def one(i: int) -> None:
+        filename, data = uploads[i % len(uploads)]
+        async with gate:
+            results.append(await post_file(host, port, filename, data))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+
+    codes = Counter(status for status, _ in results)
+    ok = [latency for status, latency in results if status == 200]
+
+    print(f"requests: {total}  concurrency: {concurrency}  wall: {elapsed:.2f}s")
+    print("status codes: " + ", ".join(f"{k}={v}" for k, v in sorted(codes.items())))
+    print(f"throughput (200s): {len(ok) / elapsed:.2f} req/s")
+    if ok:
+        print(
+            f"latency p50={percentile(ok, 50):.3f}s "
+            f"p95={percentile(ok, 95):.3f}s "
+            f"p99={percentile(ok, 99):.3f}s "
+            f"mean={statistics.mean(ok):.3f}s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the contract analysis API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("files", nargs="*", help="Defaults to every file in Sample_files/")
+    args = parser.parse_args()
+
+    files = args.files or [
+        os.path.join(SAMPLE_DIR, name) for name in sorted(os.listdir(SAMPLE_DIR))
+    ]
+    asyncio.run(run(args.host, args.port, args.requests, args.concurrency, files))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+# scripts/load_test_app.py
+# Concurrent-session load test for app.py using Streamlit's AppTest.
+# Every simulated session uploads a contract, waits for the analysis,
+# asks the chat assistant a question and fetches the report download,
+# all inside one process sharing the app's worker pool (as one
+# `streamlit run` server would). Needs a Streamlit release whose AppTest
+# supports file_uploader.
+#
+#   python scripts/load_test_app.py --levels 1,2,4,8 --rounds 2
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from streamlit.testing.v1 import AppTest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_DIR = os.path.join(BASE_DIR, "Sample_files")
+APP_PATH = os.path.join(BASE_DIR, "app.py")
+
+sys.path.insert(0, BASE_DIR)
+
+MIME_TYPES = {
+    ".pdf": "application/pdf",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".txt": "text/plain",
+}
+
+CHAT_QUESTIONS = [
+    "Is this contract safe?",
+    "What is the overall risk?",
+    "Give me a summary",
+    "What type of contract is this?",
+]
+
+STEPS = ("analysis", "chat", "download")
+
+# -------------------------------------------------
+# CONTRACTS
+# -------------------------------------------------
+
+GENERATED_CLAUSES = [
+    ("Term", "This Agreement shall remain in force for a term of {n} months from {date}."),
+    ("Payment Terms", "The Client shall pay Rs. {amount} within {n} days of invoice."),
+    ("Termination", "The Company may terminate this Agreement without notice at its sole discretion."),
+    ("Termination", "Either party may terminate this Agreement with {n} days written notice."),
+    ("Indemnity", "The Vendor shall indemnify and hold harmless the Company against all losses."),
+    ("Penalty", "A penalty of {pct}% of the contract value shall apply for each week of delay."),
+    ("Confidentiality", "Both parties shall keep confidential information secret by mutual agreement."),
+    ("Non-Compete", "The Vendor shall not engage in any competing business for {n} months."),
+    ("Intellectual Property", "All work product shall be the exclusive property of the Company in perpetuity."),
+    ("Governing Law", "This Agreement is governed by the laws of India and courts at Chennai shall have exclusive jurisdiction."),
+]
+
+
+def generate_contract(seed: int, n_clauses: int) -> Tuple[str, bytes, str]:
+    rng = random.Random(seed)
+    lines = [
+        "SERVICE AGREEMENT",
+        f"This Agreement is made on {rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2026 between "
+        f"Alpha{seed} Technologies Pvt. Ltd. and Beta{seed} Solutions Private Limited.",
+        "",
+    ]
+    for i in range(1, n_clauses + 1):
+        title, template = rng.choice(GENERATED_CLAUSES)
+        body = template.format(
+            n=rng.choice([15, 30, 60, 90]),
+            date=f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2026",
+            amount=f"{rng.randint(1, 99) * 10000:,}",
+            pct=rng.choice([2, 5, 10]),
+        )
+        lines.append(f"{i}. {title}")
+        lines.append(body)
+        lines.append("")
+
+    return f"generated_{seed}_{n_clauses}.txt", "\n".join(lines).encode("utf-8"), "text/plain"
+
+
+def load_contracts(generated: int, max_clauses: int) -> List[Tuple[str, bytes, str]]:
+    contracts = []
+    for name in sorted(os.listdir(SAMPLE_DIR)):
+        ext = os.path.splitext(name)[1].lower()
+        if ext in MIME_TYPES:
+            with open(os.path.join(SAMPLE_DIR, name), "rb") as f:
+                contracts.append((name, f.read(), MIME_TYPES[ext]))
+
+    for seed in range(generated):
+        contracts.append(generate_contract(seed, random.Random(seed).randint(10, max_clauses)))
+
+    return contracts
+
+# -------------------------------------------------
+# MEMORY (Linux /proc; app process + worker pool)
+# -------------------------------------------------
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_mb(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def total_rss_mb() -> float:
+    return rss_mb(os.getpid()) + sum(rss_mb(p.pid) for p in mp.active_children())
+
+
+class MemorySampler(threading.Thread):
+    def __init__(self, interval: float = 0.25):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = 0.0
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.is_set():
+            self.peak = max(self.peak, total_rss_mb())
+            self._done.wait(self.interval)
+
+    def finish(self) -> float:
+        self._done.set()
+        self.join()
+        return self.peak
+
+# -------------------------------------------------
+# ONE SESSION
+# -------------------------------------------------
+
+def run_session(contract: Tuple[str, bytes, str], question: str, timeout: float) -> Dict:
+    """
+    upload -> analysis -> chat -> download. Returns per-step latency
+    (seconds) or an error.
+    """
+    timings = {}
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    try:
+        at.run()
+
+        # The app reruns itself until the analysis is complete
+        started = time.perf_counter()
+        at.file_uploader[0].set_value([contract]).run()
+        timings["analysis"] = time.perf_counter() - started
+
+        if at.exception:
+            return {"error": at.exception[0].message}
+        if at.error:
+            return {"error": at.error[0].value}
+
+        started = time.perf_counter()
+        at.text_input[0].input(question).run()
+        timings["chat"] = time.perf_counter() - started
+
+        # A rerun renders the report download (served from the report store)
+        started = time.perf_counter()
+        at.run()
+        if not at.get("download_button"):
+            return {"error": "report download missing"}
+        timings["download"] = time.perf_counter() - started
+
+    except Exception as e:
+        return {"error": str(e) or e.__class__.__name__}
+
+    return timings
+
+# -------------------------------------------------
+# REPORTING
+# -------------------------------------------------
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_level(
+    concurrency: int,
+    sessions: int,
+    contracts: List[Tuple[str, bytes, str]],
+    timeout: float
+) -> Dict:
+    sampler = MemorySampler()
+    sampler.start()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(
+            lambda i: run_session(
+                contracts[i % len(contracts)],
+                CHAT_QUESTIONS[i % len(CHAT_QUESTIONS)],
+                timeout,
+            ),
+            range(sessions),
+        ))
+    elapsed = time.perf_counter() - started
+
+    ok = [r for r in results if "error" not in r]
+    return {
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "completed": len(ok),
+        "errors": [r["error"] for r in results if "error" in r],
+        "wall": elapsed,
+        "throughput": len(ok) / elapsed,
+        "peak_rss_mb": sampler.finish(),
+        "latency": {step: [r[step] for r in ok] for step in STEPS},
+    }
+
+
+def print_level(level: Dict) -> None:
+    print(
+        f"\nconcurrency {level['concurrency']}: {level['completed']}/{level['sessions']} sessions "
+        f"in {level['wall']:.2f}s  throughput {level['throughput']:.2f} sessions/s  "
+        f"peak RSS {level['peak_rss_mb']:.0f} MB"
+    )
+
+    for step in STEPS:
+        values = level["latency"][step]
+        if values:
+            print(
+                f"  {step:<9} p50={percentile(values, 50):.3f}s "
+                f"p95={percentile(values, 95):.3f}s "
+                f"p99={percentile(values, 99):.3f}s "
+                f"mean={statistics.mean(values):.3f}s"
+            )
+
+    for error in sorted(set(level["errors"])):
+        print(f"  error ({level['errors'].count(error)}x): {error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test app.py with simulated sessions")
+    parser.add_argument("--levels", default="1,2,4", help="Comma-separated session concurrency levels")
+    parser.add_argument("--rounds", type=int, default=2, help="Sessions per level = level × rounds")
+    parser.add_argument("--generated", type=int, default=6, help="Generated contracts added to Sample_files")
+    parser.add_argument("--max-clauses", type=int, default=120)
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-step AppTest timeout (s)")
+    args = parser.parse_args()
+
+    contracts = load_contracts(args.generated, args.max_clauses)
+    print(f"{len(contracts)} contracts, app worker pool: ANALYSIS_MAX_WORKERS="
+          f"{os.environ.get('ANALYSIS_MAX_WORKERS', '2')}")
+
+    for concurrency in (int(level) for level in args.levels.split(",")):
+        print_level(run_level(concurrency, concurrency * args.rounds, contracts, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# tests/conftest.py
+
+import os
+import sys
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+SAMPLE_DIR = os.path.join(BASE_DIR, "Sample_files")
+
+
+@pytest.fixture(autouse=True)
+def no_text_archive(monkeypatch):
+    # Tests must not read texts archived by real runs, nor add to them
+    from backend import text_archive
+    monkeypatch.setattr(text_archive, "ENABLED", False)
+
+
+@pytest.fixture
+def sample_bytes():
+    """sample_bytes("partnership.docx") -> contents of a file in Sample_files"""
+    def read(filename: str) -> bytes:
+        with open(os.path.join(SAMPLE_DIR, filename), "rb") as f:
+            return f.read()
+    return read
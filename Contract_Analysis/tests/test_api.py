@@ -0,0 +1,45 @@
+# tests/test_api.py
+
+import asyncio
+from urllib.parse import quote
+
+from api import AnalysisServer
+
+
+async def post_and_read_to_eof(port: int, filename: str, data: bytes) -> bytes:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        (
+            f"POST /analyze?filename={filename} HTTP/1.1\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode("latin-1") + data
+    )
+    await writer.drain()
+    response = await reader.read()  # until the server side is really closed
+    writer.close()
+    return response
+
+
+def test_first_request_on_a_fresh_server_reaches_eof(monkeypatch, sample_bytes):
+    # Inherited by the spawned analysis workers
+    monkeypatch.setenv("TEXT_ARCHIVE", "off")
+    monkeypatch.setenv("TRANSLATION_SERVICE", "off")
+
+    filename = "VENDOR SERVICE AGREEMENT.txt"
+    data = sample_bytes(filename)
+
+    async def scenario():
+        app = AnalysisServer(max_concurrency=1)
+        server = await asyncio.start_server(app.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await asyncio.wait_for(
+                post_and_read_to_eof(port, quote(filename), data), timeout=60
+            )
+        finally:
+            server.close()
+            app.shutdown()
+
+    response = asyncio.run(scenario())
+    assert response.startswith(b"HTTP/1.1 200 OK")
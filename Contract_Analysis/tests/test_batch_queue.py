@@ -0,0 +1,78 @@
+# tests/test_batch_queue.py
+
+import pytest
+
+from backend import batch_queue
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(batch_queue.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path):
+    path = str(tmp_path / "queue.sqlite3")
+    batch_queue.enqueue(path, ["a.pdf", "b.pdf"])
+    return path
+
+
+def test_leased_item_is_not_claimed_twice(queue, clock):
+    first = batch_queue.claim(queue, "node-1", lease_seconds=60)
+    second = batch_queue.claim(queue, "node-2", lease_seconds=60)
+
+    assert first["path"].endswith("a.pdf")
+    assert second["path"].endswith("b.pdf")
+    assert batch_queue.claim(queue, "node-3", lease_seconds=60) is None
+
+
+def test_expired_lease_is_reclaimed_by_another_node(queue, clock):
+    item = batch_queue.claim(queue, "node-1", lease_seconds=60)
+    batch_queue.claim(queue, "node-2", lease_seconds=600)
+
+    clock.now += 61
+    again = batch_queue.claim(queue, "node-3", lease_seconds=60)
+
+    assert again["item_id"] == item["item_id"]
+    assert again["attempts"] == 2
+
+    # The first node lost its lease and can no longer renew or finish it
+    assert not batch_queue.renew(queue, item["item_id"], "node-1")
+    assert not batch_queue.complete(queue, item["item_id"], "node-1")
+    assert batch_queue.complete(queue, item["item_id"], "node-3")
+
+
+def test_renewed_lease_is_not_reclaimed(queue, clock):
+    item = batch_queue.claim(queue, "node-1", lease_seconds=60)
+    batch_queue.claim(queue, "node-2", lease_seconds=600)
+
+    clock.now += 50
+    assert batch_queue.renew(queue, item["item_id"], "node-1", lease_seconds=60)
+    clock.now += 50
+
+    assert batch_queue.claim(queue, "node-3", lease_seconds=60) is None
+
+
+def test_lease_expiring_after_the_last_attempt_fails_the_item(tmp_path, clock):
+    queue = str(tmp_path / "queue.sqlite3")
+    batch_queue.enqueue(queue, ["a.pdf"])
+
+    for attempt in range(1, 3):
+        item = batch_queue.claim(queue, f"node-{attempt}", lease_seconds=60, max_attempts=2)
+        assert item["attempts"] == attempt
+        clock.now += 61
+
+    assert batch_queue.claim(queue, "node-3", lease_seconds=60, max_attempts=2) is None
+    [failed] = batch_queue.failed_items(queue)
+    assert failed["error"] == "lease expired"
+    assert batch_queue.is_drained(queue)
@@ -0,0 +1,84 @@
+# tests/test_clause_record.py
+
+import pickle
+
+import pytest
+
+from backend.clause_record import to_records
+from backend.explainer import RISK_EXPLANATIONS, explain_contract_clauses
+
+DOCUMENT = "1. Payment\nThe Client shall pay within 30 days.\n2. Termination\nEither party may terminate."
+PAYMENT = "The Client shall pay within 30 days."
+TERMINATION = "Either party may terminate."
+
+
+def span(text):
+    start = DOCUMENT.index(text)
+    return {"start": start, "end": start + len(text)}
+
+
+def records(risk_level=None):
+    clauses = to_records(DOCUMENT, [
+        {"title": "Payment", "clause_type": "Payment Terms", "confidence": 0.8, **span(PAYMENT)},
+        {"title": "Termination", **span(TERMINATION)},
+    ])
+    if risk_level:
+        for clause in clauses:
+            clause.annotate(risk_level=risk_level)
+    return clauses
+
+
+def test_text_is_a_span_of_the_document():
+    payment, termination = records()
+
+    assert payment["text"] == PAYMENT
+    assert termination["text"] == TERMINATION
+    assert termination["clause_type"] == "General"
+
+
+def test_reads_like_a_dict_with_only_the_fields_set_so_far():
+    payment, _ = records()
+
+    assert "risk_level" not in payment
+    assert payment.get("risk_level") is None
+    with pytest.raises(KeyError):
+        payment["risk_level"]
+
+    payment.annotate(risk_level="Medium", rule_hits=["medium:pay"])
+
+    assert payment["risk_level"] == "Medium"
+    assert list(payment) == [
+        "title", "clause_type", "text", "confidence", "start", "end", "risk_level", "rule_hits",
+    ]
+    assert payment.to_dict() == dict(payment)
+
+
+def test_only_stage_fields_can_be_assigned():
+    payment, _ = records()
+
+    with pytest.raises(KeyError):
+        payment["text"] = "changed"
+    with pytest.raises(KeyError):
+        payment.annotate(unknown=1)
+
+
+def test_explanations_reference_the_templates():
+    clauses = records("High")
+    explained = explain_contract_clauses(clauses)
+
+    assert explained[0] is clauses[0]
+    assert explained[1]["plain_english_explanation"].startswith(RISK_EXPLANATIONS["High"])
+    assert explained[1]._explanation_parts[0] is RISK_EXPLANATIONS["High"]
+
+    # Same output as the dict path
+    as_dicts = explain_contract_clauses([dict(c) for c in records("High")])
+    assert [dict(c) for c in explained] == as_dicts
+
+
+def test_records_survive_pickling():
+    payment, _ = records()
+    payment.annotate(risk_level="Low")
+
+    copy = pickle.loads(pickle.dumps(payment))
+
+    assert dict(copy) == dict(payment)
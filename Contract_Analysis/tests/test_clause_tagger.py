@@ -0,0 +1,54 @@
+# tests/test_clause_tagger.py
+
+import copy
+
+from backend.clause_extractor import extract_clauses
+from backend.clause_tagger import GENERAL_TYPE, tag_documents, tag_texts
+from backend.file_reader import extract_text
+from backend.pipeline import as_upload
+
+
+def sample_clauses(sample_bytes, filename):
+    return extract_clauses(extract_text(as_upload(filename, sample_bytes(filename))))
+
+
+def test_vendor_sample_clauses_get_their_types(sample_bytes):
+    clauses = sample_clauses(sample_bytes, "VENDOR SERVICE AGREEMENT.txt")
+
+    assert [c["clause_type"] for c in clauses] == [
+        "Payment Terms",
+        "Term & Renewal",
+        "Termination",
+        "Confidentiality",
+        "Indemnity & Liability",
+        "Intellectual Property",
+        "Non-Compete",
+        "Governing Law & Disputes",
+        "Governing Law & Disputes",
+    ]
+
+
+def test_partnership_sample_dissolution_and_law(sample_bytes):
+    types = {
+        c["text"].split()[0]: c["clause_type"]
+        for c in sample_clauses(sample_bytes, "partnership.docx")
+    }
+
+    assert types["Dissolution"] == "Termination"
+    assert types["Governing"] == "Governing Law & Disputes"
+
+
+def test_batch_tagging_matches_per_document_tagging(sample_bytes):
+    documents = [
+        sample_clauses(sample_bytes, "VENDOR SERVICE AGREEMENT.txt"),
+        sample_clauses(sample_bytes, "partnership.docx"),
+    ]
+    expected = [[c["clause_type"] for c in clauses] for clauses in documents]
+
+    tagged = tag_documents(copy.deepcopy(documents))
+
+    assert [[c["clause_type"] for c in clauses] for clauses in tagged] == expected
+
+
+def test_text_unlike_any_centroid_stays_general():
+    assert tag_texts(["Schedule A lists the colours of the office furniture."]) == [GENERAL_TYPE]
@@ -0,0 +1,38 @@
+# tests/test_file_reader.py
+
+from backend.file_reader import needs_layout
+
+NUMBERED = (
+    "SERVICE AGREEMENT\n"
+    "1. Payment: The Client shall pay within 30 days.\n"
+    "2. Termination: Either party may terminate with notice.\n"
+)
+
+UNNUMBERED_HEADINGS = (
+    "VENDOR SERVICE AGREEMENT\n"
+    "Scope of Services\n"
+    "The Vendor shall provide software development and support services\n"
+    "to the Company as per mutually agreed requirements.\n"
+    "Payment Terms\n"
+    "The Company shall pay the Vendor within 30 days of each invoice,\n"
+    "Madurai, Tamil Nadu, India\n"
+)
+
+PROSE = (
+    "This letter records that the Vendor will provide support services to\n"
+    "the Company from Madurai, Tamil Nadu, India, and that the Company will\n"
+    "pay the agreed fee within 30 days of each invoice.\n"
+    "Signed\n"
+)
+
+
+def test_numbered_headings_keep_the_plain_text():
+    assert not needs_layout(NUMBERED)
+
+
+def test_heading_like_lines_trigger_a_structured_read():
+    assert needs_layout(UNNUMBERED_HEADINGS)
+
+
+def test_prose_without_heading_evidence_is_not_re_read():
+    assert not needs_layout(PROSE)
@@ -0,0 +1,34 @@
+# tests/test_language_handler.py
+
+import pytest
+
+from backend import translation_service
+from backend.language_handler import normalize_language
+
+MIXED = (
+    "1. Payment: The Client shall pay within 30 days.\n"
+    "यह अनुबंध भारत के कानूनों द्वारा शासित होगा।\n"
+)
+
+
+class FailingService:
+    def translate_batch(self, lines):
+        raise RuntimeError("model crashed on this batch")
+
+
+class FailingModel:
+    def translate(self, line):
+        raise ValueError("bad input")
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_failed_translation_keeps_lines_untranslated(monkeypatch, enabled):
+    monkeypatch.setattr(translation_service, "ENABLED", enabled)
+    monkeypatch.setattr(translation_service, "get_service", lambda start=True: FailingService())
+    monkeypatch.setattr(translation_service, "_local_translation", FailingModel())
+
+    result = normalize_language(MIXED)
+
+    assert result["untranslated_lines"] == 1
+    assert result["normalized_english_text"] == MIXED
+    assert "translation failed" in result["note"]
@@ -0,0 +1,27 @@
+# tests/test_ner_extractor.py
+
+from backend.ner_extractor import scan_entities
+
+
+def labelled(text):
+    return [(s["label"], s["text"]) for s in scan_entities(text, use_spacy=False)]
+
+
+def test_jurisdiction_inside_an_organisation_name_is_kept():
+    spans = labelled("Chennai Technologies Pvt Ltd shall perform the services.")
+
+    assert ("Parties", "Chennai Technologies Pvt Ltd") in spans
+    assert ("Jurisdiction", "Chennai") in spans
+
+
+def test_adjectival_jurisdictions_map_to_the_place():
+    spans = labelled("Registered under the Indian Partnership Act, subject to jurisdictional limits.")
+
+    assert ("Jurisdiction", "India") in spans
+    assert ("Jurisdiction", "Jurisdiction") in spans
+
+
+def test_spans_are_sorted_by_offset():
+    spans = scan_entities("Chennai Technologies Pvt Ltd pays ₹2,50,000 by 15/08/2024 in India.", use_spacy=False)
+
+    assert [s["start"] for s in spans] == sorted(s["start"] for s in spans)
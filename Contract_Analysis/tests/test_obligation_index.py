@@ -0,0 +1,74 @@
+# tests/test_obligation_index.py
+
+from datetime import date
+
+import pytest
+
+from backend import obligation_index
+from backend.obligation_index import (
+    extract_obligations,
+    index_contract,
+    parse_dates,
+    parse_notice_days,
+    upcoming_deadlines,
+)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("on 05/04/2026", [date(2026, 4, 5)]),          # day first
+    ("by 31-12-26", [date(2026, 12, 31)]),
+    ("from 1st Jan, 2027", [date(2027, 1, 1)]),
+    ("until 15 August 2026", [date(2026, 8, 15)]),
+    ("before December 31, 2026", [date(2026, 12, 31)]),
+    ("on 31/02/2026", []),                           # not a date
+    ("by 15 March 2027 or 01/01/2027", [date(2027, 1, 1), date(2027, 3, 15)]),
+])
+def test_parse_dates(text, expected):
+    assert parse_dates(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("with 30 days' written notice", 30),
+    ("by giving thirty (30) days prior written notice", 30),
+    ("on two months notice", 60),
+    ("with 2 weeks advance notice", 14),
+    ("without notice", None),
+])
+def test_parse_notice_days(text, expected):
+    assert parse_notice_days(text) == expected
+
+
+def clause(text):
+    return {"title": "Term", "text": text}
+
+
+def test_notice_is_due_before_the_date_it_refers_to():
+    [record] = extract_obligations([clause(
+        "The Tenant shall give 30 days' written notice before the lease expires on 31/12/2026."
+    )])
+
+    assert record["party"] == "The Tenant"
+    assert record["kind"] == "renewal"
+    assert record["notice_days"] == 30
+    assert record["due_date"] == "2026-12-01"
+
+
+def test_sentences_without_a_date_or_duty_are_skipped():
+    assert extract_obligations([
+        clause("This Agreement was signed on 01/01/2026."),
+        clause("The Vendor shall deliver the software."),
+    ]) == []
+
+
+def test_upcoming_deadlines_is_a_date_range(tmp_path, monkeypatch):
+    monkeypatch.setattr(obligation_index, "INDEX_PATH", str(tmp_path / "obligations.sqlite3"))
+    obligations = extract_obligations([
+        clause("The Client shall pay the fee by 10/01/2026."),
+        clause("The Client shall pay the balance by 10/03/2026."),
+    ])
+    index_contract("doc", "doc.txt", "Vendor / Service Agreement", obligations)
+
+    due = upcoming_deadlines(days=30, today=date(2026, 1, 1))
+
+    assert [r["due_date"] for r in due] == ["2026-01-10"]
+    assert due[0]["kind"] == "payment"
@@ -0,0 +1,51 @@
+# tests/test_pipeline.py
+
+import pickle
+
+from backend.pipeline import iter_analysis, run_analysis
+
+CONTRACT = (
+    "SERVICE AGREEMENT\n"
+    "1. Payment: The Client shall pay ₹1,00,000.50 within 30 days of invoice.\n"
+    "2. Interest: Late payments carry interest at 12.5% per annum.\n"
+    "3. Governing Law: This Agreement is governed by the laws of India.\n"
+)
+
+
+def test_entities_keep_decimals_through_the_pipeline():
+    result = run_analysis("contract.txt", CONTRACT.encode("utf-8"))
+
+    assert result["entities"]["Money"] == ["₹1,00,000.50"]
+    assert result["entities"]["Percentages"] == ["12.5%"]
+
+    attached = [e["text"] for c in result["analysis"]["clauses"] for e in c.get("entities") or []]
+    assert "₹1,00,000.50" in attached
+    assert "12.5%" in attached
+
+
+def test_partnership_sample_keeps_its_jurisdiction(sample_bytes):
+    # Only mentioned as "Indian Partnership Act"
+    result = run_analysis("partnership.docx", sample_bytes("partnership.docx"))
+
+    assert result["entities"]["Jurisdiction"] == ["India"]
+
+
+def test_partials_arrive_in_order_and_merge_to_the_full_result(sample_bytes):
+    filename = "VENDOR SERVICE AGREEMENT.txt"
+    data = sample_bytes(filename)
+
+    merged, stages = {}, []
+    for stage, partial in iter_analysis(filename, data):
+        stages.append(stage)
+        # Partials cross process boundaries in the API and the UI
+        merged.update(pickle.loads(pickle.dumps(partial)))
+
+    assert stages == ["overview", "clauses", "entities"]
+
+    full = run_analysis(filename, data)
+    assert merged.keys() == full.keys()
+    for key in ("classification", "language", "summary", "obligations", "entities", "degraded"):
+        assert merged[key] == full[key], key
+    assert merged["analysis"]["contract_risk"] == full["analysis"]["contract_risk"]
+    assert [dict(c) for c in merged["explained"]] == [dict(c) for c in full["explained"]]
+    assert any(c.get("entities") for c in merged["analysis"]["clauses"])
@@ -0,0 +1,57 @@
+# tests/test_portfolio_stats.py
+
+import json
+import multiprocessing as mp
+from datetime import datetime
+
+import pytest
+
+from backend import portfolio_stats
+
+WHEN = datetime(2026, 7, 1)
+RISK = {"overall_risk": "High Risk", "average_score": 2.5}
+
+
+@pytest.fixture(autouse=True)
+def stats_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(portfolio_stats, "STATS_DB", str(tmp_path / "portfolio_stats.sqlite3"))
+    monkeypatch.setattr(portfolio_stats, "LEGACY_STATS_FILE", str(tmp_path / "portfolio_stats.json"))
+    return tmp_path
+
+
+def record_many(db_path, times):
+    portfolio_stats.STATS_DB = db_path
+    for _ in range(times):
+        portfolio_stats.record_analysis("Employment Agreement", RISK, WHEN)
+
+
+def test_concurrent_processes_lose_no_updates():
+    ctx = mp.get_context("spawn")
+    workers = [
+        ctx.Process(target=record_many, args=(portfolio_stats.STATS_DB, 25))
+        for _ in range(4)
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(60)
+
+    stats = portfolio_stats.load_stats()
+    assert stats["total"]["count"] == 100
+    assert stats["cells"]["2026-07|Employment Agreement|High Risk"]["score_sum"] == 250.0
+    assert portfolio_stats.query(["2026-07"], overall_risk="High Risk")["average_score"] == 2.5
+
+
+def test_legacy_json_is_imported_once(stats_db):
+    legacy = stats_db / "portfolio_stats.json"
+    legacy.write_text(json.dumps({
+        "cells": {"2026-06|Lease / Rental Agreement|Low Risk": {"count": 3, "score_sum": 3.3}},
+    }))
+
+    portfolio_stats.record_analysis("Lease / Rental Agreement", RISK, WHEN)
+    portfolio_stats.load_stats()
+
+    stats = portfolio_stats.load_stats()
+    assert stats["by_contract_type"]["Lease / Rental Agreement"]["count"] == 4
+    assert stats["by_month"]["2026-06"]["count"] == 3
+    assert not legacy.exists()
@@ -0,0 +1,100 @@
+# tests/test_report_store.py
+
+import os
+import time
+
+import pytest
+
+from backend import report_store
+
+DAY = 24 * 60 * 60
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_store, "REPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(report_store, "INDEX_FILE", str(tmp_path / "report_index.json"))
+    monkeypatch.setattr(report_store, "RETENTION_DAYS", 30)
+    monkeypatch.setattr(report_store, "QUOTA_MB", 200)
+    return tmp_path
+
+
+def renderer(size, calls):
+    def render(path):
+        calls.append(path)
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+    return render
+
+
+def age(key, days):
+    """Backdates a stored report's creation and last access."""
+    index = report_store._load()
+    entry = index["reports"][key]
+    entry["created"] -= days * DAY
+    entry["last_access"] -= days * DAY
+    report_store._write(index)
+
+
+def test_hit_reuses_the_stored_report():
+    calls = []
+    first = report_store.get_or_create("a", renderer(10, calls))
+    second = report_store.get_or_create("a", renderer(10, calls))
+
+    assert first == second
+    assert len(calls) == 1
+    assert report_store.store_stats()["hits"] == 1
+
+
+def test_expired_report_is_rendered_again():
+    calls = []
+    report_store.get_or_create("a", renderer(10, calls))
+    age("a", 31)
+
+    report_store.get_or_create("a", renderer(10, calls))
+
+    assert len(calls) == 2
+    assert report_store.store_stats()["expired"] == 1
+
+
+def test_sweep_expires_old_reports_only():
+    calls = []
+    report_store.get_or_create("old", renderer(10, calls))
+    report_store.get_or_create("new", renderer(10, calls))
+    age("old", 31)
+
+    report_store.sweep()
+
+    assert not os.path.exists(report_store.report_path("old"))
+    assert os.path.exists(report_store.report_path("new"))
+
+
+def test_quota_evicts_least_recently_used_first(monkeypatch):
+    monkeypatch.setattr(report_store, "QUOTA_MB", 2.5 / 1024)  # room for two 1 KiB reports
+    calls = []
+    for key in ("a", "b"):
+        report_store.get_or_create(key, renderer(1024, calls))
+    age("a", 1)
+    age("b", 2)
+    report_store.get_or_create("a", renderer(1024, calls))  # a is now the most recent
+
+    report_store.get_or_create("c", renderer(1024, calls))
+
+    remaining = sorted(report_store._load()["reports"])
+    assert remaining == ["a", "c"]
+    assert report_store.store_stats()["evictions"] == 1
+
+
+def test_legacy_reports_are_not_expired_by_age(store, monkeypatch):
+    legacy = store / "Contract_Report_20260206_211345.pdf"
+    legacy.write_bytes(b"x" * 1024)
+    old = time.time() - 365 * DAY
+    os.utime(legacy, (old, old))
+
+    report_store.get_or_create("a", renderer(10, []))
+    assert legacy.exists()
+
+    # ... but they count towards the quota, oldest first
+    monkeypatch.setattr(report_store, "QUOTA_MB", 100 / (1024 * 1024))
+    report_store.sweep()
+    assert not legacy.exists()
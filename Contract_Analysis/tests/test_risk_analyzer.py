@@ -0,0 +1,79 @@
+# tests/test_risk_analyzer.py
+
+import re
+
+import pytest
+
+from backend.risk_analyzer import (
+    COMMON_RULES,
+    GAP_RULE,
+    PACK_MIN_CONFIDENCE,
+    RULE_IDS,
+    RULE_PACKS,
+    compile_rule,
+    evaluated_rule_ids,
+    rule_pack_for,
+    rules_for,
+)
+
+LEASE = "Lease / Rental Agreement"
+
+
+def pack_rule_ids(contract_type):
+    return {
+        f"{level}:{p}"
+        for level, patterns in RULE_PACKS[contract_type].items()
+        for p in patterns
+    }
+
+
+def test_uncertain_type_gets_the_common_rules_only():
+    classification = {"contract_type": LEASE, "confidence": PACK_MIN_CONFIDENCE - 0.01}
+
+    pack = rule_pack_for(classification)
+
+    assert pack is None
+    assert rules_for(pack) is COMMON_RULES
+    assert not set(evaluated_rule_ids(pack)) & pack_rule_ids(LEASE)
+
+
+def test_confident_type_adds_exactly_its_own_pack():
+    common = set(evaluated_rule_ids(None))
+
+    for contract_type in RULE_PACKS:
+        pack = rule_pack_for({"contract_type": contract_type, "confidence": 0.9})
+
+        assert pack == contract_type
+        assert set(evaluated_rule_ids(pack)) == common | pack_rule_ids(contract_type)
+
+
+GAPPED_PATTERNS = [
+    rule_id.split(":", 1)[1]
+    for rule_id in RULE_IDS
+    if GAP_RULE.fullmatch(rule_id.split(":", 1)[1])
+]
+
+GAP_TEXTS = [
+    "",
+    "either party may terminate this agreement without notice.",
+    "without notice, either party may terminate this agreement.",
+    "the tenant may terminate with 30 days notice.",
+    "terminate without notice",
+    "terminatewithout notice",
+    "during the lock-in period the deposit shall forfeit.",
+    "the deposit shall forfeit after the lock-in period.",
+    "payment shall be released at the client's sole discretion.",
+    "payment.discretion",
+    "payment terminate payment without notice discretion " * 50,
+]
+
+
+def test_gapped_rules_are_compiled():
+    assert GAPPED_PATTERNS
+
+
+@pytest.mark.parametrize("pattern", GAPPED_PATTERNS)
+def test_compiled_gap_rule_matches_regex_search(pattern):
+    search = compile_rule(pattern)
+    for text in GAP_TEXTS:
+        assert search(text) == (re.search(pattern, text) is not None), text
@@ -0,0 +1,86 @@
+# tests/test_risk_matrix.py
+
+import pytest
+
+from backend import risk_matrix
+from backend.clause_extractor import extract_clauses
+from backend.file_reader import extract_text
+from backend.pipeline import as_upload
+from backend.risk_analyzer import (
+    RULE_IDS,
+    analyze_contract_clauses,
+    compute_contract_risk,
+    evaluated_rule_ids,
+)
+
+LEASE = "Lease / Rental Agreement"
+EMPLOYMENT = "Employment Agreement"
+
+CLAUSES = [
+    {"title": "Term", "text": "The tenant may be subject to eviction if rent is unpaid."},
+    {"title": "Payment", "text": "The landlord may terminate at any time without notice."},
+    {"title": "Notice", "text": "Either party may end this lease with a cure period of 30 days."},
+]
+
+
+@pytest.fixture(autouse=True)
+def matrix_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(risk_matrix, "MATRIX_DIR", str(tmp_path))
+
+
+def save(document_id, rule_pack, clauses=CLAUSES):
+    analysis = analyze_contract_clauses([dict(c) for c in clauses], rule_pack)
+    return risk_matrix.save_hit_matrix(
+        document_id, f"{document_id}.txt", rule_pack or "General",
+        analysis["clauses"], analysis["contract_risk"], analysis["rule_pack"]
+    )
+
+
+def test_matrix_records_the_rules_it_evaluated():
+    loaded = risk_matrix.load_hit_matrix(save("lease", LEASE))
+
+    evaluated = {RULE_IDS[i] for i, ran in enumerate(loaded["evaluated"]) if ran}
+    assert evaluated == set(evaluated_rule_ids(LEASE))
+    assert loaded["meta"]["rule_pack"] == LEASE
+    assert not loaded["stale"]
+
+
+def test_matrix_saved_under_another_pack_is_stale(monkeypatch):
+    # Checked against the employment rules, but recorded as a lease
+    with monkeypatch.context() as m:
+        m.setattr(risk_matrix, "evaluated_rule_ids", lambda _: evaluated_rule_ids(EMPLOYMENT))
+        path = save("lease", LEASE)
+
+    assert risk_matrix.load_hit_matrix(path)["stale"]
+
+
+@pytest.mark.parametrize("settings", [
+    {},
+    {"score_map": {"Low": 1, "Medium": 3, "High": 5}, "medium_average_threshold": 2.0},
+    {"high_clause_threshold": 1, "critical_flag_threshold": 2},
+])
+def test_rescoring_matches_compute_contract_risk(sample_bytes, settings):
+    analyses = {}
+    for filename, rule_pack in [
+        ("VENDOR SERVICE AGREEMENT.txt", "Vendor / Service Agreement"),
+        ("VENDOR SERVICE AGREEMENT.txt", None),
+        ("partnership.docx", None),
+    ]:
+        clauses = extract_clauses(extract_text(as_upload(filename, sample_bytes(filename))))
+        analysis = analyze_contract_clauses(clauses, rule_pack)
+        document_id = f"{filename}-{rule_pack}".replace(" ", "_").replace("/", "_")
+        risk_matrix.save_hit_matrix(
+            document_id, filename, rule_pack or "General",
+            analysis["clauses"], analysis["contract_risk"], rule_pack
+        )
+        analyses[document_id] = analysis["clauses"]
+    analyses["lease"] = analyze_contract_clauses([dict(c) for c in CLAUSES], LEASE)["clauses"]
+    save("lease", LEASE)
+
+    results = risk_matrix.rescore_portfolio(**settings)
+
+    assert len(results) == len(analyses)
+    for result in results:
+        expected = compute_contract_risk(analyses[result["document_id"]], **settings)
+        rescored = {key: result[key] for key in expected}
+        assert rescored == expected, result["document_id"]
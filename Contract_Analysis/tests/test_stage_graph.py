@@ -0,0 +1,58 @@
+# tests/test_stage_graph.py
+
+import copy
+import threading
+
+from backend import stage_graph
+from backend.memory_profiling import StageProfiler
+from backend.stage_graph import run_stages, timed_out
+
+
+def make_stages(release):
+    def scan(text):
+        if text == "slow":
+            release.wait(10)
+        return text.upper()
+
+    return (
+        {"name": "scan", "inputs": ("text",), "output": "scanned", "run": scan,
+         "fallback": lambda text: "FALLBACK"},
+        {"name": "count", "inputs": ("scanned",), "output": "length", "run": len},
+    )
+
+
+def run(stages, text, profiler):
+    values, timings = {"text": text}, {}
+    list(run_stages(stages, values, timings, profiler))
+    return values, timings
+
+
+def test_timed_out_stage_does_not_affect_the_next_document(monkeypatch):
+    monkeypatch.setattr(stage_graph, "STAGE_BUDGETS", {"scan": 0.2})
+    release = threading.Event()
+    stages = make_stages(release)
+
+    first = StageProfiler("doc-1", "slow.txt", 4, enabled=True)
+    values1, timings1 = run(stages, "slow", first)
+    first.close()
+
+    assert values1["scanned"] == "FALLBACK"
+    assert values1["length"] == len("FALLBACK")
+    assert timed_out(timings1) == ["scan"]
+
+    # The abandoned stage is still running while the next document goes through
+    second = StageProfiler("doc-2", "fast.txt", 4, enabled=True)
+    values2, timings2 = run(stages, "fast", second)
+    assert values2["scanned"] == "FAST"
+    assert timed_out(timings2) == []
+
+    seen = copy.deepcopy((values1, timings1, values2, timings2, second.stages))
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == "stage-scan":
+            thread.join(5)
+    second.close()
+
+    # Its late result lands nowhere: not in either document, not in a profile
+    assert (values1, timings1, values2, timings2, second.stages) == seen
+    assert "scan" not in first.stages
@@ -0,0 +1,81 @@
+# tests/test_text_archive.py
+
+import pytest
+
+from backend import text_archive
+
+TEXT = "1. Payment\nThe Client shall pay within 30 days — किराया.\n"
+
+
+@pytest.fixture
+def archive(monkeypatch, tmp_path):
+    monkeypatch.setattr(text_archive, "ENABLED", True)
+    monkeypatch.setattr(text_archive, "ARCHIVE_DIR", str(tmp_path))
+    monkeypatch.setattr(text_archive, "BLOB_FILE", str(tmp_path / "texts.bin"))
+    monkeypatch.setattr(text_archive, "INDEX_FILE", str(tmp_path / "texts.idx"))
+    monkeypatch.setattr(text_archive, "_index", {})
+    monkeypatch.setattr(text_archive, "_index_pos", 0)
+    monkeypatch.setattr(text_archive, "_blob", None)
+    yield tmp_path
+    if text_archive._blob is not None:
+        text_archive._blob.close()
+
+
+def store(document_id, text=TEXT):
+    text_archive.store_text(document_id, text, len(text), "Mixed", "1 line translated", [0])
+
+
+def test_stored_text_is_read_back(archive):
+    store("doc-a")
+    store("doc-b", "Second contract.\n")
+
+    assert text_archive.lookup_text("doc-a") == {
+        "text": TEXT,
+        "text_chars": len(TEXT),
+        "language": "Mixed",
+        "note": "1 line translated",
+        "heading_lines": [0],
+    }
+    assert text_archive.lookup_text("doc-b")["text"] == "Second contract.\n"
+    assert text_archive.lookup_text("doc-c") is None
+
+
+def test_entries_written_by_another_process_are_found(archive, monkeypatch):
+    store("doc-a")
+
+    # A fresh process starts with an empty in-memory index
+    monkeypatch.setattr(text_archive, "_index", {})
+    monkeypatch.setattr(text_archive, "_index_pos", 0)
+
+    assert text_archive.lookup_text("doc-a")["text"] == TEXT
+
+
+def test_crc_mismatch_is_a_miss(archive):
+    store("doc-a")
+    store("doc-b", "Second contract.\n")
+
+    blob = archive / "texts.bin"
+    data = bytearray(blob.read_bytes())
+    data[3:4] = b"X"  # still valid UTF-8, just the wrong text
+    blob.write_bytes(bytes(data))
+
+    assert text_archive.lookup_text("doc-a") is None
+    assert text_archive.lookup_text("doc-b")["text"] == "Second contract.\n"
+
+
+def test_truncated_blob_is_a_miss(archive):
+    store("doc-a")
+
+    blob = archive / "texts.bin"
+    blob.write_bytes(blob.read_bytes()[:-5])
+
+    assert text_archive.lookup_text("doc-a") is None
+
+
+def test_torn_index_line_is_skipped(archive):
+    store("doc-a")
+    with open(archive / "texts.idx", "ab") as f:
+        f.write(b'{"key": "torn"\n')
+    store("doc-b", "Second contract.\n")
+
+    assert text_archive.lookup_text("doc-b")["text"] == "Second contract.\n"